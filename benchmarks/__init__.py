@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks for the straditize digitization pipeline
+
+The benchmarks can be run with `airspeed velocity`_ via::
+
+    asv run
+
+or without asv via::
+
+    python -m benchmarks.run -o results.json
+
+.. _airspeed velocity: https://asv.readthedocs.io
+"""
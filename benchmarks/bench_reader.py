@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks for the :mod:`straditize.binary` module
+
+Each benchmark is parameterized by the size of the diagram (see
+:attr:`benchmarks.common.scales`) and, if applicable, by the reader type (see
+:attr:`benchmarks.common.reader_types`). The `time_` methods measure the
+runtime, the `peakmem_` methods the peak memory usage."""
+import matplotlib.pyplot as plt
+from benchmarks.common import get_sample, scales, reader_types
+
+
+class Binary:
+    """Benchmarks for the conversion of the image into a binary array"""
+
+    params = [scales]
+    param_names = ['megapixels']
+
+    timeout = 600
+
+    def setup(self, megapixels):
+        self.image = get_sample(megapixels, 'area').get_rgba_image()
+
+    def time_to_binary_pil(self, megapixels):
+        from straditize.binary import DataReader
+        DataReader.to_binary_pil(self.image)
+
+    def peakmem_to_binary_pil(self, megapixels):
+        from straditize.binary import DataReader
+        DataReader.to_binary_pil(self.image)
+
+
+class _ReaderBenchmark:
+    """Base class for benchmarks of the data readers
+
+    As some of the benchmarked methods modify the reader, we recreate it for
+    every measurement"""
+
+    params = [scales, reader_types]
+    param_names = ['megapixels', 'reader_type']
+
+    timeout = 1200
+
+    number = 1
+
+    repeat = (1, 5, 60.0)
+
+    warmup_time = 0
+
+    def setup(self, megapixels, reader_type):
+        self.sample = get_sample(megapixels, reader_type)
+        self.reader = self.sample.create_reader()
+
+    def teardown(self, megapixels, reader_type):
+        self.reader.close()
+        plt.close('all')
+
+
+class Reader(_ReaderBenchmark):
+    """Benchmarks for the image cleaning and the digitization"""
+
+    def time_reset_labels(self, megapixels, reader_type):
+        self.reader.reset_labels()
+
+    def peakmem_reset_labels(self, megapixels, reader_type):
+        self.reader.reset_labels()
+
+    def time_estimated_column_starts(self, megapixels, reader_type):
+        self.reader.estimated_column_starts()
+
+    def peakmem_estimated_column_starts(self, megapixels, reader_type):
+        self.reader.estimated_column_starts()
+
+    def time_recognize_xaxes(self, megapixels, reader_type):
+        self.reader.recognize_xaxes(remove=True)
+
+    def peakmem_recognize_xaxes(self, megapixels, reader_type):
+        self.reader.recognize_xaxes(remove=True)
+
+    def time_recognize_yaxes(self, megapixels, reader_type):
+        self.reader.recognize_yaxes(remove=True)
+
+    def peakmem_recognize_yaxes(self, megapixels, reader_type):
+        self.reader.recognize_yaxes(remove=True)
+
+    def time_recognize_hlines(self, megapixels, reader_type):
+        self.reader.recognize_hlines(remove=True)
+
+    def peakmem_recognize_hlines(self, megapixels, reader_type):
+        self.reader.recognize_hlines(remove=True)
+
+    def time_recognize_vlines(self, megapixels, reader_type):
+        self.reader.recognize_vlines(remove=True)
+
+    def peakmem_recognize_vlines(self, megapixels, reader_type):
+        self.reader.recognize_vlines(remove=True)
+
+    def time_get_disconnected_parts(self, megapixels, reader_type):
+        self.reader.get_disconnected_parts()
+
+    def peakmem_get_disconnected_parts(self, megapixels, reader_type):
+        self.reader.get_disconnected_parts()
+
+    def time_digitize(self, megapixels, reader_type):
+        self.reader.digitize()
+
+    def peakmem_digitize(self, megapixels, reader_type):
+        self.reader.digitize()
+
+
+class DigitizedReader(_ReaderBenchmark):
+    """Benchmarks for the methods that require the digitized data"""
+
+    def setup(self, megapixels, reader_type):
+        super().setup(megapixels, reader_type)
+        self.reader.digitize()
+        samples, rough_locs = self.reader.find_samples()
+        self.reader.add_samples(samples, rough_locs)
+        self.ds = self.reader.to_dataset()
+
+    def time_find_samples(self, megapixels, reader_type):
+        self.reader.find_samples()
+
+    def peakmem_find_samples(self, megapixels, reader_type):
+        self.reader.find_samples()
+
+    def time_to_dataset(self, megapixels, reader_type):
+        self.reader.to_dataset()
+
+    def peakmem_to_dataset(self, megapixels, reader_type):
+        self.reader.to_dataset()
+
+    def time_from_dataset(self, megapixels, reader_type):
+        self.reader.from_dataset(self.ds, plot=False)
+
+    def peakmem_from_dataset(self, megapixels, reader_type):
+        self.reader.from_dataset(self.ds, plot=False)
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""Synthetic diagrams for the benchmarks"""
+import numpy as np
+import matplotlib
+
+matplotlib.use('Agg')
+
+from straditize.testing import SyntheticDiagram  # noqa: E402
+
+
+#: The sizes of the benchmarked diagrams in megapixels
+scales = [1, 10, 50]
+
+#: The reader types that are benchmarked
+reader_types = ['area', 'bars', 'rounded bars', 'line']
+
+
+class BenchmarkSample(SyntheticDiagram):
+    """A :class:`~straditize.testing.SyntheticDiagram` of a given size
+
+    See the :meth:`from_megapixels` method to create a new sample"""
+
+    @classmethod
+    def from_megapixels(cls, megapixels, reader_type='area', ncols=20,
+                        nsamples=None, aspect=1.5, seed=42):
+        """Create a random sample with the given size
+
+        Parameters
+        ----------
+        megapixels: float
+            The size of the diagram in megapixels
+        reader_type: str
+            The type of the diagram. One of :attr:`reader_types`
+        ncols: int
+            The number of columns in the diagram
+        nsamples: int
+            The number of samples. If None, we take one sample per 50 pixel
+            rows
+        aspect: float
+            The ratio of width to height of the diagram
+        seed: int
+            The seed for the random number generator
+
+        Returns
+        -------
+        BenchmarkSample
+            The new sample with y-axes at the column starts and an x-axis at
+            the bottom"""
+        height = int(np.sqrt(megapixels * 1e6 / aspect))
+        width = int(height * aspect)
+        nsamples = nsamples or max(height // 50, 3)
+        return cls.from_random(height, width, ncols, nsamples,
+                               kind=reader_type, seed=seed, axes=True)
+
+    def create_reader(self, plot=True):
+        """Create a data reader for the diagram
+
+        Parameters
+        ----------
+        plot: bool
+            Whether to plot the reader (necessary for removing features)
+
+        Returns
+        -------
+        straditize.binary.DataReader
+            The reader of the :attr:`kind` with the column starts of this
+            sample"""
+        from straditize.binary import readers
+        reader = readers[self.kind](self.get_rgba_image(), plot=plot)
+        reader.column_starts = self.col_starts.copy()
+        return reader
+
+
+_samples = {}
+
+
+def get_sample(megapixels, reader_type):
+    """Get a (cached) :class:`BenchmarkSample`"""
+    key = (megapixels, reader_type)
+    if key not in _samples:
+        _samples[key] = BenchmarkSample.from_megapixels(
+            megapixels, reader_type)
+    return _samples[key]
@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+"""Run the benchmarks without airspeed velocity
+
+This script runs the asv-style benchmarks in this directory and stores the
+results as JSON file, e.g.::
+
+    python -m benchmarks.run -p megapixels=1,10 -o results.json
+
+Results of two runs can be compared via::
+
+    python -m benchmarks.run -p megapixels=1 -o new.json -c old.json
+
+which reports all benchmarks that are slower (or use more memory) than in
+``old.json`` by more than the given factor (``-f``) and exits with a non-zero
+exit code in this case.
+
+Note that, different from asv, the `peakmem_` benchmarks here measure the
+peak of the memory that is allocated during the call (via
+:mod:`tracemalloc`) rather than the peak resident memory of the process."""
+import os
+import os.path as osp
+import sys
+import re
+import glob
+import json
+import time
+import platform
+import subprocess as spr
+import tracemalloc
+import importlib
+import argparse
+import warnings
+from itertools import product
+import numpy as np
+
+
+def iter_benchmarks(pattern=None):
+    """Iterate over the benchmarks in this directory
+
+    Parameters
+    ----------
+    pattern: str
+        A regular expression to select the benchmarks. It is matched against
+        the full name of the benchmark (e.g.
+        ``'bench_reader.Reader.time_digitize'``)
+
+    Yields
+    ------
+    str
+        The full name of the benchmark
+    type
+        The benchmark class
+    str
+        The name of the benchmark method"""
+    files = sorted(glob.glob(osp.join(osp.dirname(__file__), 'bench_*.py')))
+    for fname in files:
+        modname = osp.splitext(osp.basename(fname))[0]
+        mod = importlib.import_module('benchmarks.' + modname)
+        for clsname, cls in sorted(vars(mod).items()):
+            if (clsname.startswith('_') or not isinstance(cls, type) or
+                    cls.__module__ != mod.__name__):
+                continue
+            for meth in sorted(dir(cls)):
+                if meth.startswith(('time_', 'peakmem_')):
+                    name = '%s.%s.%s' % (modname, clsname, meth)
+                    if pattern is None or re.search(pattern, name):
+                        yield name, cls, meth
+
+
+def measure(func, args, kind):
+    """Measure the runtime or the memory of one call of `func`"""
+    if kind == 'time':
+        t0 = time.perf_counter()
+        func(*args)
+        return time.perf_counter() - t0
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_benchmark(cls, meth, params=None, repeat=None):
+    """Run one benchmark for all its parameters
+
+    Parameters
+    ----------
+    cls: type
+        The benchmark class
+    meth: str
+        The name of the benchmark method
+    params: dict
+        A mapping from parameter name to the allowed values (as strings)
+    repeat: int
+        The number of repetitions. If None, it is taken from the `repeat`
+        attribute of the class (or 3)
+
+    Returns
+    -------
+    list of dict
+        The results for each combination of the parameters"""
+    params = params or {}
+    kind = meth.split('_')[0]
+    names = getattr(cls, 'param_names', [])
+    if repeat is None:
+        repeat = getattr(cls, 'repeat', 3)
+        if not isinstance(repeat, int):
+            repeat = repeat[1]
+    if kind == 'peakmem':
+        repeat = 1
+    ret = []
+    for combo in product(*getattr(cls, 'params', [])):
+        combo_dict = dict(zip(names, combo))
+        if any(str(combo_dict[key]) not in allowed
+               for key, allowed in params.items() if key in combo_dict):
+            continue
+        values = []
+        for i in range(repeat):
+            obj = cls()
+            if hasattr(obj, 'setup'):
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore')
+                    obj.setup(*combo)
+            try:
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore')
+                    values.append(measure(getattr(obj, meth), combo, kind))
+            finally:
+                if hasattr(obj, 'teardown'):
+                    obj.teardown(*combo)
+        ret.append({'params': combo_dict,
+                    'value': float(np.median(values)),
+                    'unit': 'seconds' if kind == 'time' else 'bytes',
+                    'values': values})
+    return ret
+
+
+def get_versions():
+    """Get the versions of straditize and its main dependencies"""
+    ret = {'python': platform.python_version()}
+    for mod in ['straditize', 'numpy', 'pandas', 'scipy', 'skimage',
+                'xarray', 'matplotlib', 'PIL']:
+        try:
+            ret[mod] = importlib.import_module(mod).__version__
+        except (ImportError, AttributeError):
+            pass
+    try:
+        ret['commit'] = spr.check_output(
+            ['git', 'rev-parse', 'HEAD'], stderr=spr.DEVNULL,
+            cwd=osp.dirname(__file__)).decode('utf-8').strip()
+    except (OSError, spr.CalledProcessError):
+        pass
+    return ret
+
+
+def compare(results, reference, factor=1.2):
+    """Compare the results with the results of a previous run
+
+    Parameters
+    ----------
+    results: dict
+        The results of the current run
+    reference: dict
+        The results of the previous run
+    factor: float
+        The factor by which a benchmark has to be slower (or use more memory)
+        than in the `reference` to be considered as a regression
+
+    Returns
+    -------
+    list of str
+        The description of the regressions"""
+    ret = []
+    for name, entries in results['benchmarks'].items():
+        ref_entries = reference['benchmarks'].get(name, [])
+        for entry in entries:
+            ref = next((r for r in ref_entries
+                        if r['params'] == entry['params']), None)
+            if ref is None or not ref['value']:
+                continue
+            ratio = entry['value'] / ref['value']
+            if ratio > factor:
+                ret.append('%s(%s): %.3g -> %.3g %s (x%.2f)' % (
+                    name, ', '.join('%s=%s' % t
+                                    for t in entry['params'].items()),
+                    ref['value'], entry['value'], entry['unit'], ratio))
+    return ret
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.run', description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '-b', '--bench', help=(
+            'A regular expression to select the benchmarks, e.g. '
+            '"Reader.time_digitize"'))
+    parser.add_argument(
+        '-p', '--param', action='append', default=[], metavar='NAME=VALUES',
+        help=('Restrict a parameter to the given comma-separated values, '
+              'e.g. "megapixels=1,10" or "reader_type=area"'))
+    parser.add_argument('-r', '--repeat', type=int,
+                        help='The number of repetitions for the timings')
+    parser.add_argument('-o', '--output', help='The output JSON file')
+    parser.add_argument(
+        '-c', '--compare', metavar='JSON',
+        help='A JSON file of a previous run to compare the results with')
+    parser.add_argument(
+        '-f', '--factor', type=float, default=1.2,
+        help='The factor to detect regressions. Default: %(default)s')
+    args = parser.parse_args(args)
+
+    params = {}
+    for s in args.param:
+        key, vals = s.split('=', 1)
+        params[key] = vals.split(',')
+
+    results = {'versions': get_versions(),
+               'machine': {'platform': platform.platform(),
+                           'processor': platform.processor(),
+                           'cpu_count': os.cpu_count()},
+               'benchmarks': {}}
+    for name, cls, meth in iter_benchmarks(args.bench):
+        print(name, flush=True)
+        entries = run_benchmark(cls, meth, params, args.repeat)
+        for entry in entries:
+            print('    %s: %.4g %s' % (
+                ', '.join('%s=%s' % t for t in entry['params'].items()),
+                entry['value'], entry['unit']), flush=True)
+        results['benchmarks'][name] = entries
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=1)
+
+    if args.compare:
+        with open(args.compare) as f:
+            reference = json.load(f)
+        regressions = compare(results, reference, args.factor)
+        if regressions:
+            print('Regressions found:')
+            print('\n'.join(regressions))
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -30,7 +30,7 @@ docstrings.delete_params('psyplot_gui.start_app.parameters', 'fnames',
 
 @docstrings.dedent
 def start_app(fname=None, output=None, xlim=None, ylim=None,
-              full=False, reader_type='area', **kwargs):
+              full=False, reader_type='area', max_workers=None, **kwargs):
     """
     Start the psyplot GUI with the straditizer setup
 
@@ -50,10 +50,17 @@ def start_app(fname=None, output=None, xlim=None, ylim=None,
         share of the array
     reader_type: { 'area' | 'bars' | 'rounded bars' | 'stacked area' | 'line' }
         Specify the reader type
+    max_workers: int
+        The number of workers to digitize the columns and to find the samples
+        in parallel. 0 means to use all processors
     %(psyplot_gui.start_app.parameters.no_fnames|output)s
     """
     import numpy as np
 
+    if max_workers is not None:
+        from straditize.binary import DataReader
+        DataReader.max_workers = max_workers
+
     def set_x_and_ylim(stradi):
         if not xlim and stradi.data_xlim is None:
             stradi.data_xlim = [0, np.shape(stradi.image)[1]]
@@ -159,6 +166,8 @@ def get_parser(create=True):
     parser.update_arg('ylim', type=int, nargs=2, metavar='val',
                       group=stradi_grp)
     parser.update_arg('full', group=stradi_grp, short='f')
+    parser.update_arg('max_workers', short='j', type=int, metavar='N',
+                      group=stradi_grp)
 
     parser.update_arg('version', short='V', long='version', action='version',
                       version=straditize.__version__, if_existent=False,
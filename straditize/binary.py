@@ -18,7 +18,6 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program. If not, see <https://www.gnu.org/licenses/>.
 """
-import skimage.morphology as skim
 from warnings import warn
 import numpy as np
 import six
@@ -29,6 +28,8 @@ from collections import defaultdict
 import matplotlib.colors as mcol
 from straditize.common import docstrings
 from straditize.label_selection import LabelSelection
+from straditize.instrumentation import instrumented
+import straditize.labeling as labeling
 import xarray as xr
 from psyplot.data import safe_list
 
@@ -70,6 +71,114 @@ def groupby_arr(arr):
     return keys, bounds
 
 
+def fill_rows(vals, rows, method='linear'):
+    """Fill the given rows of a 2D array from the remaining rows
+
+    All columns are filled at once.
+
+    Parameters
+    ----------
+    vals: np.ndarray of ndim 2
+        The array to fill. It is modified inplace
+    rows: np.ndarray of ints
+        The indices of the rows to fill (e.g. the
+        :attr:`DataReader.hline_locs`)
+    method: {'linear', 'nearest', 'previous'}
+        The method to fill the rows.
+
+        linear
+            Linear interpolation between the closest rows that are not in
+            `rows` and linear extrapolation at the boundaries (as
+            :func:`scipy.interpolate.interp1d` with
+            ``fill_value='extrapolate'``)
+        nearest
+            Take the value of the nearest row that is not in `rows`
+        previous
+            Take the value of the previous row that is not in `rows`, or the
+            next one at the upper boundary
+
+    Returns
+    -------
+    np.ndarray
+        `vals`"""
+    mask = np.zeros(len(vals), dtype=bool)
+    rows = np.asarray(rows, dtype=int)
+    mask[rows[(rows >= 0) & (rows < len(vals))]] = True
+    x_new = np.where(mask)[0]
+    x = np.where(~mask)[0]
+    if not len(x_new) or not len(x):
+        return vals
+    if method == 'linear' and len(x) > 1:
+        hi = np.clip(np.searchsorted(x, x_new), 1, len(x) - 1)
+        lo = hi - 1
+        x_lo = x[lo]
+        y_lo = vals[x_lo]
+        slope = (vals[x[hi]] - y_lo) / (x[hi] - x_lo)[:, np.newaxis]
+        vals[x_new] = slope * (x_new - x_lo)[:, np.newaxis] + y_lo
+    elif method in ['linear', 'nearest']:
+        # nearest valid row, rounding half down
+        idx = np.searchsorted((x[1:] + x[:-1]) / 2., x_new)
+        vals[x_new] = vals[x[idx]]
+    elif method == 'previous':
+        idx = np.clip(np.searchsorted(x, x_new) - 1, 0, None)
+        vals[x_new] = vals[x[idx]]
+    else:
+        raise ValueError(
+            "Unknown fill method %r. Use one of 'linear', 'nearest' or "
+            "'previous'" % (method, ))
+    return vals
+
+
+def map_parallel(func, iterable, max_workers=1, processes=False):
+    """Apply a function to every item, optionally in parallel
+
+    Parameters
+    ----------
+    func: callable
+        The function to apply. If `processes` is True, it must be picklable
+        (i.e. a function on the module level)
+    iterable: iterable
+        The arguments for `func`
+    max_workers: int
+        The number of workers. If 1, the items are processed serially
+    processes: bool
+        If True, use a process pool, otherwise a thread pool. Threads are
+        suitable for numpy-heavy functions that release the GIL, processes
+        for pure-Python functions
+
+    Returns
+    -------
+    list
+        The results of `func` for each item in `iterable` (in the same order)
+    """
+    items = list(iterable)
+    if max_workers == 1 or len(items) < 2:
+        return list(map(func, items))
+    from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+    Executor = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with Executor(min(max_workers, len(items))) as executor:
+        return list(executor.map(func, items))
+
+
+def _get_bars_worker(args):
+    """Call the :meth:`BarDataReader.get_bars` method in a worker process"""
+    cls, settings, arr, do_split = args
+    reader = object.__new__(cls)
+    reader.__dict__.update(settings)
+    return reader.get_bars(arr, do_split)
+
+
+def _potential_samples_worker(args):
+    """Call the :meth:`DataReader.find_potential_samples` method in a worker
+    process"""
+    cls, col, arr, kwargs = args
+    reader = object.__new__(cls)
+    reader.parent = reader
+    reader._full_df = pd.DataFrame({col: arr})
+    reader._columns = [col]
+    return reader.find_potential_samples(col, **kwargs)
+
+
 class DataReader(LabelSelection):
     """A class to read in and digitize the data files of the pollen diagram
 
@@ -142,13 +251,9 @@ class DataReader(LabelSelection):
     def occurences_dict(self):
         """A mapping from column number to an numpy array with the indices of
         an occurence"""
-        def get_col(x):
-            return next(i for i, (s, e) in enumerate(bounds)
-                        if s <= x and e > x)
         ret = defaultdict(list)
-        bounds = self.all_column_bounds
         for x, y in self.occurences:
-            ret[get_col(x)].append(y)
+            ret[self.get_col_for_pixel(x)].append(y)
         return {col: np.unique(indices) for col, indices in ret.items()}
 
     @property
@@ -237,6 +342,7 @@ class DataReader(LabelSelection):
             self.parent._column_starts = value
         else:
             self.parent._column_starts[self.columns] = value
+            self._reset_column_index()
 
     #: the starts for each column
     _column_ends = None
@@ -282,6 +388,7 @@ class DataReader(LabelSelection):
                 "The columns for this reader have not yet been defined!")
         elif len(value) == len(self.columns):
             parent._column_ends[self.columns] = value
+            self._reset_column_index()
         else:
             raise ValueError(
                 "Length of the columns (%i) do not match the number of "
@@ -346,9 +453,25 @@ class DataReader(LabelSelection):
     #: :class:`list` or floats. The indexes of vertical lines
     vline_locs = None
 
+    #: The method to fill the rows at the :attr:`hline_locs` in the
+    #: :meth:`digitize` method. One of ``'linear'``, ``'nearest'`` or
+    #: ``'previous'`` (see :func:`fill_rows`). Use ``'nearest'`` or
+    #: ``'previous'`` to not smear the edges of bars
+    hline_interpolation = 'linear'
+
     #: The matplotlib axes where the :attr:`plot_im` is plotted on
     ax = None
 
+    @property
+    def headless(self):
+        """True if this reader is not plotted
+
+        The readers of a headless :class:`~straditize.straditizer.Straditizer`
+        are created without matplotlib axes (``plot=False``). All methods to
+        clean and digitize the :attr:`binary` data then only work on the
+        arrays and never create a figure"""
+        return self.plot_im is None
+
     #: The number of pixels the columns have been shifted
     shifted = None
 
@@ -385,6 +508,65 @@ class DataReader(LabelSelection):
     #: An alternative function to the class constructor to load the data reader
     _loader = None
 
+    #: A boolean array with one row per pixel row and one column per column in
+    #: :attr:`columns` that is True where the :attr:`binary` data has been
+    #: changed since the last call of :meth:`digitize` (see
+    #: :meth:`register_changes`). If None, the next incremental digitization
+    #: processes the entire image
+    _changed_rows = None
+
+    #: The settings and the raw result (before filling the :attr:`hline_locs`)
+    #: of the last :meth:`digitize` call
+    _digitize_cache = None
+
+    #: The positions of the columns in :attr:`columns` that have been
+    #: recomputed by the last call of :meth:`digitize`
+    _changed_columns = None
+
+    #: A mapping from column to the number of times the column in the
+    #: :attr:`full_df` has been changed. This attribute is only used by the
+    #: parent reader and created on the first change
+    _column_versions = None
+
+    #: The projection profiles of the :attr:`binary` data. A dictionary with
+    #: the ``'binary'`` array they belong to, the sums per row (``'rows'``),
+    #: per pixel column (``'cols'``) and per row and column of the
+    #: ``'bounds'`` (``'col_rows'``) and the ``'pending'`` part of the binary
+    #: data that has been changed (see :meth:`register_changes`)
+    _profiles = None
+
+    #: The cached result of :meth:`merged_binaries`
+    _merged_binaries = None
+
+    #: The geometry index of the columns (see :meth:`_get_column_index`).
+    #: This attribute is only used by the parent reader
+    _column_index = None
+
+    #: The readers and their :attr:`binary` arrays that have been used for the
+    #: cached :attr:`_merged_binaries`
+    _merged_state = None
+
+    #: 1D boolean array that is True for the rows that changed since the
+    #: :attr:`_merged_binaries` have last been updated
+    _merged_changed_rows = None
+
+    #: The number of updates of the :attr:`_merged_binaries`
+    _merged_version = 0
+
+    #: The version of the :attr:`_merged_binaries` and the cached result of
+    #: :meth:`merged_labels`
+    _merged_labels = None
+
+    #: A mapping from ``(col, min_len, max_len)`` to the state of the
+    #: :attr:`full_df` and the results of :meth:`find_potential_samples`
+    _potential_samples_cache = None
+
+    #: The number of workers to process the columns in parallel in the
+    #: :meth:`digitize`, :meth:`unique_bars` and :meth:`find_samples`
+    #: methods. If 1, the columns are processed serially, if 0, the number of
+    #: processors is used
+    max_workers = 1
+
     @property
     def full_df(self):
         """The full :class:`pandas.DataFrame` of the digitized image"""
@@ -405,6 +587,33 @@ class DataReader(LabelSelection):
             parent._full_df = pd.DataFrame(vals, columns=all_columns,
                                            index=index)
         parent._full_df.loc[:, self.columns] = np.asarray(value)
+        self._update_column_versions(self.columns)
+
+    def _update_column_versions(self, columns):
+        """Increase the version of the given `columns` in the :attr:`full_df`
+        """
+        parent = self.parent
+        if parent._column_versions is None:
+            parent._column_versions = {}
+        versions = parent._column_versions
+        for col in columns:
+            versions[col] = versions.get(col, 0) + 1
+
+    def column_version(self, col):
+        """Get the number of changes of a column in the :attr:`full_df`
+
+        Parameters
+        ----------
+        col: int
+            The column in the :attr:`full_df`
+
+        Returns
+        -------
+        int
+            A number that increases whenever the column is changed by the
+            :meth:`digitize` method or by setting the :attr:`full_df`"""
+        versions = self.parent._column_versions
+        return 0 if versions is None else versions.get(col, 0)
 
     @property
     def columns(self):
@@ -423,6 +632,7 @@ class DataReader(LabelSelection):
     def columns(self, value):
         """The indices of the columns that are handled by this reader"""
         self._columns = value
+        self._reset_column_index()
 
     @property
     def extent(self):
@@ -506,18 +716,27 @@ class DataReader(LabelSelection):
         self.hline_locs = np.empty(0, int)
         self.vline_locs = np.empty(0, int)
         self.magni = magni
-        if plot_background:
+        if plot_background and plot:
             self.plot_background()
         if plot:
             self.plot_image()
 
-        self.remove_callbacks = {'labels': [self.update_image]}
+        self.remove_callbacks = {'labels': [self.update_image],
+                                 'binary': [self.register_removal]}
         if np.ndim(image) == 3:
             self.remove_callbacks['image_array'] = [self.update_rgba_image]
         self.children = list(children)
         for child in children:
             child.parent = self
         self.parent = parent or self
+        self._column_versions = {}
+
+    def _instrumentation_info(self):
+        """The input size for the :mod:`straditize.instrumentation`"""
+        ret = {'shape': self.binary.shape}
+        if self.columns is not None:
+            ret['ncols'] = len(self.columns)
+        return ret
 
     def reset_image(self, image, binary=False):
         """Reset the image for this straditizer
@@ -544,11 +763,13 @@ class DataReader(LabelSelection):
             if not binary:
                 self.image = image
             self.binary = self.to_binary_pil(image)
+            self._changed_rows = None
             self.reset_labels()
-            if self.plot_im is not None:
+            if not self.headless:
                 self.update_image(None, None)
                 self.draw_figure()
 
+    @instrumented
     def reset_labels(self):
         """Reset the :attr:`labels` array"""
         self.labels = self.get_labeled_array()
@@ -571,7 +792,7 @@ class DataReader(LabelSelection):
     def get_labeled_array(self):
         """Create a connectivity-based labeled array of the :attr:`binary` data
         """
-        return skim.label(self.binary, 8, return_num=False)
+        return labeling.label(self.binary, return_num=False)
 
     def update_image(self, arr, amask):
         """Update the image after having removed binary data
@@ -582,10 +803,15 @@ class DataReader(LabelSelection):
         plot
         """
         self.reset_labels()
-        arr = self.labels
-        self.plot_im.set_array(arr)
-        if self.magni_plot_im is not None:
-            self.magni_plot_im.set_array(arr)
+        self._set_plot_array(self.labels)
+
+    def _set_plot_array(self, arr):
+        """Display `arr` in the :attr:`plot_im` and :attr:`magni_plot_im`
+
+        Nothing is done if this reader is :attr:`headless`"""
+        for im in [self.plot_im, self.magni_plot_im]:
+            if im is not None:
+                im.set_array(arr)
 
     def update_rgba_image(self, arr, mask):
         """Update the RGBA image from the given 3D-array
@@ -612,10 +838,185 @@ class DataReader(LabelSelection):
         Calls the :meth:`update_image` and :meth:`update_rgba_image` methods
         for all :attr:`children`"""
         for child in self.children:
+            child.register_changes(amask)
             child.binary[amask] = 0
             child.update_image(arr, amask)
             child.update_rgba_image(arr, amask)
 
+    def register_changes(self, mask):
+        """Register a change of the :attr:`binary` data
+
+        This method marks the rows of the columns that are touched by `mask`
+        such that an incremental :meth:`digitize` only recomputes them.
+
+        Every in-place change of the :attr:`binary` data (e.g.
+        ``reader.binary[mask] = 0``) must be registered with this method
+        *before* the data is changed. Otherwise the cached projection
+        profiles (see :attr:`row_profile`), the :meth:`merged_binaries` and
+        the incremental :meth:`digitize` use outdated data.
+
+        Parameters
+        ----------
+        mask: np.ndarray of dtype bool
+            A mask with the same shape as the :attr:`binary` data that is True
+            where the binary data has been changed"""
+        self.parent._register_merged_changes(mask)
+        self._register_profile_changes(mask)
+        changed = self._changed_rows
+        if changed is None:
+            return
+        bounds = self.column_bounds
+        if (bounds is None or np.shape(mask) != self.binary.shape or
+                changed.shape != (self.binary.shape[0], len(bounds))):
+            self._changed_rows = None
+            return
+        for i, (vmin, vmax) in enumerate(bounds):
+            changed[:, i] |= mask[:, vmin:vmax].any(axis=1)
+
+    def _register_merged_changes(self, mask):
+        """Mark the rows in `mask` for the update of the
+        :meth:`merged_binaries`"""
+        changed = self._merged_changed_rows
+        if changed is None:
+            return
+        if np.shape(mask) != self.binary.shape:
+            self._merged_binaries = self._merged_changed_rows = None
+            return
+        changed |= np.asarray(mask).any(axis=1)
+
+    def _register_profile_changes(self, mask):
+        """Mark the part of the binary data in `mask` for the update of the
+        projection profiles (see :attr:`row_profile`)"""
+        profiles = self._profiles
+        if profiles is None or profiles['binary'] is not self.binary:
+            return
+        if np.shape(mask) != self.binary.shape:
+            self._profiles = None
+            return
+        # apply the previous change before we register the new one
+        self._update_profiles()
+        mask = np.asarray(mask)
+        rows = np.where(mask.any(axis=1))[0]
+        if not len(rows):
+            return
+        rows = slice(rows[0], rows[-1] + 1)
+        cols = np.where(mask[rows].any(axis=0))[0]
+        cols = slice(cols[0], cols[-1] + 1)
+        bounds = profiles['bounds']
+        profiles['pending'] = (rows, cols, bounds, self._get_box_profiles(
+            rows, cols, bounds))
+
+    def _get_box_profiles(self, rows, cols, bounds=None):
+        """Compute the profiles of a part of the :attr:`binary` data
+
+        Parameters
+        ----------
+        rows: slice
+            The rows of the box
+        cols: slice
+            The pixel columns of the box
+        bounds: np.ndarray
+            The column bounds for the row profiles per column
+
+        Returns
+        -------
+        list of np.ndarray
+            The sums per row, per pixel column and (if `bounds` is not None)
+            per row and column"""
+        box = self.binary[rows, cols]
+        ret = [box.sum(axis=1), box.sum(axis=0)]
+        if bounds is not None:
+            ret.append(np.zeros((len(box), len(bounds)), dtype=ret[0].dtype))
+            for i, (vmin, vmax) in enumerate(bounds - cols.start):
+                ret[-1][:, i] = box[:, max(vmin, 0):max(vmax, 0)].sum(axis=1)
+        return ret
+
+    def _update_profiles(self):
+        """Update the projection profiles with the pending change of the
+        :attr:`binary` data"""
+        profiles = self._profiles
+        if profiles['pending'] is None:
+            return
+        rows, cols, bounds, old = profiles['pending']
+        new = self._get_box_profiles(rows, cols, bounds)
+        profiles['rows'][rows] += new[0] - old[0]
+        profiles['cols'][cols] += new[1] - old[1]
+        if bounds is not None:
+            profiles['col_rows'][rows] += new[2] - old[2]
+        # keep the box, in case the binary data is changed after reading the
+        # profiles
+        profiles['pending'] = (rows, cols, bounds, new)
+
+    def _get_profiles(self):
+        """Get the up-to-date projection profiles of the :attr:`binary`
+        data"""
+        binary = self.binary
+        profiles = self._profiles
+        if profiles is None or profiles['binary'] is not binary:
+            self._profiles = profiles = {
+                'binary': binary, 'rows': binary.sum(axis=1),
+                'cols': binary.sum(axis=0), 'bounds': None,
+                'col_rows': None, 'pending': None}
+        else:
+            self._update_profiles()
+        return profiles
+
+    @staticmethod
+    def _readonly(arr):
+        """Get a read-only view of `arr`"""
+        arr = arr.view()
+        arr.setflags(write=False)
+        return arr
+
+    @property
+    def row_profile(self):
+        """The sum of the :attr:`binary` data in each row
+
+        The profile is kept up-to-date via the :meth:`register_changes`
+        method. The array is read-only"""
+        return self._readonly(self._get_profiles()['rows'])
+
+    @property
+    def column_profile(self):
+        """The sum of the :attr:`binary` data in each pixel column
+
+        The profile is kept up-to-date via the :meth:`register_changes`
+        method. The array is read-only"""
+        return self._readonly(self._get_profiles()['cols'])
+
+    @property
+    def column_row_profiles(self):
+        """The sum of the :attr:`binary` data in each row for each column
+
+        A 2D array with one row per pixel row and one column for each column
+        in the :attr:`column_bounds`. The profiles are kept up-to-date via
+        the :meth:`register_changes` method. The array is read-only"""
+        profiles = self._get_profiles()
+        bounds = self.column_bounds
+        old = profiles['bounds']
+        if (old is None or old.shape != bounds.shape or
+                (old != bounds).any()):
+            profiles['bounds'] = bounds = bounds.astype(int)
+            profiles['col_rows'] = np.zeros(
+                (len(self.binary), len(bounds)), dtype=profiles['rows'].dtype)
+            for i, (vmin, vmax) in enumerate(bounds):
+                profiles['col_rows'][:, i] = self.binary[:, vmin:vmax].sum(
+                    axis=1)
+            if profiles['pending'] is not None:
+                rows, cols = profiles['pending'][:2]
+                profiles['pending'] = (rows, cols, bounds,
+                                       self._get_box_profiles(
+                                           rows, cols, bounds))
+        return self._readonly(profiles['col_rows'])
+
+    def register_removal(self, arr, amask):
+        """Register the removal of binary data
+
+        This method is in the :attr:`remove_callbacks` mapping for the
+        :attr:`binary` array and calls the :meth:`register_changes` method
+        """
+        self.register_changes(amask)
+
     def disable_label_selection(self, *args, **kwargs):
         super(DataReader, self).disable_label_selection(*args, **kwargs)
         try:
@@ -649,6 +1050,7 @@ class DataReader(LabelSelection):
         ``**kwargs``
             Any other keyword that is given to the
             :func:`matplotlib.pyplot.imshow` function"""
+        import straditize.display as display
         ax = ax or self.ax
         # plot the binary image
         if ax is None:
@@ -665,9 +1067,11 @@ class DataReader(LabelSelection):
         kwargs.setdefault('cmap', cmap)
         norm = mcol.BoundaryNorm([0.1, 0.5, ncolors + 0.5], 2)
         kwargs.setdefault('norm', norm)
-        self.plot_im = ax.imshow(self.labels, **kwargs)
+        self.plot_im = display.imshow(ax, self.labels, **kwargs)
         if self.magni is not None:
-            self.magni_plot_im = self.magni.ax.imshow(self.labels, **kwargs)
+            self.magni_plot_im = display.imshow(
+                self.magni.ax, self.labels,
+                pyramid=getattr(self.plot_im, 'pyramid', None), **kwargs)
         ax.grid(False)
 
     def plot_color_image(self, ax=None, **kwargs):
@@ -700,6 +1104,7 @@ class DataReader(LabelSelection):
         ``**kwargs``
             Any other keyword that is given to the
             :func:`matplotlib.pyplot.imshow` function"""
+        import straditize.display as display
         ax = ax or self.ax
         # plot the binary image
         if ax is None:
@@ -708,11 +1113,12 @@ class DataReader(LabelSelection):
         self.ax = ax
         extent = self.extent
         kwargs.setdefault('extent', extent)
-        self.background = ax.imshow(np.zeros_like(self.binary),
-                                    cmap='binary', **kwargs)
+        self.background = display.imshow(ax, np.zeros_like(self.binary),
+                                         cmap='binary', **kwargs)
         if self.magni is not None:
-            self.magni_background = self.magni.ax.imshow(
-                np.zeros_like(self.binary), cmap='binary', **kwargs)
+            self.magni_background = display.imshow(
+                self.magni.ax, np.zeros_like(self.binary), cmap='binary',
+                pyramid=getattr(self.background, 'pyramid', None), **kwargs)
 
     def __reduce__(self):
         is_parent = self.parent is self
@@ -735,6 +1141,7 @@ class DataReader(LabelSelection):
              '_sample_locs': (self._sample_locs if is_parent else None),
              '_rough_locs': self._rough_locs if is_parent else None,
              'hline_locs': self.hline_locs, 'vline_locs': self.vline_locs,
+             'hline_interpolation': self.hline_interpolation,
              '_column_starts': self.parent._column_starts,
              '_full_df': self._full_df if is_parent else None,
              'shifted': self.shifted if is_parent else None,
@@ -742,6 +1149,7 @@ class DataReader(LabelSelection):
              'is_exaggerated': self.is_exaggerated,
              '_xaxis_px_orig': self._xaxis_px_orig,
              'xaxis_data': self.xaxis_data,
+             'xaxis_scale': self.xaxis_scale,
              '_occurences': self._occurences if is_parent else set(),
              }
             )
@@ -772,6 +1180,12 @@ class DataReader(LabelSelection):
         'xaxis_translation': {
             'dims': ('reader', 'px_data', 'limit'),
             'long_name': 'Pixel to data mapping for x-axis'},
+        'xaxis_scale': {
+            'dims': 'reader',
+            'long_name': 'The scale of the x-axis (linear or log)'},
+        'hline_interpolation': {
+            'dims': 'reader',
+            'long_name': 'The method to fill the rows at horizontal lines'},
         'is_exaggerated': {
             'dims': 'reader',
             'long_name': 'Exaggeration factor'},
@@ -847,7 +1261,8 @@ class DataReader(LabelSelection):
                 nreaders = len(list(self.iter_all_readers))
                 shape = list(np.shape(data))
                 shape.insert(dims.index('reader'), nreaders)
-                if final_vname in ['reader_mod', 'reader_cls']:
+                if final_vname in ['reader_mod', 'reader_cls',
+                                   'xaxis_scale', 'hline_interpolation']:
                     dtype = object
                 else:
                     dtype = np.asarray(data).dtype
@@ -863,6 +1278,7 @@ class DataReader(LabelSelection):
             ds[final_vname] = v
         return final_vname
 
+    @instrumented
     def to_dataset(self, ds=None):
         """All the necessary data as a :class:`xarray.Dataset`
 
@@ -893,6 +1309,9 @@ class DataReader(LabelSelection):
             self.create_variable(
                 ds, 'xaxis_translation',
                 np.vstack([self._xaxis_px_orig, self.xaxis_data]))
+        self.create_variable(ds, 'xaxis_scale', self.xaxis_scale)
+        self.create_variable(ds, 'hline_interpolation',
+                             self.hline_interpolation)
 
         is_parent = self.parent is self
 
@@ -945,6 +1364,7 @@ class DataReader(LabelSelection):
         return ds
 
     @classmethod
+    @instrumented
     def from_dataset(cls, ds, *args, **kwargs):
         """Create a new :class:`DataReader` from a :class:`xarray.Dataset`
 
@@ -976,6 +1396,10 @@ class DataReader(LabelSelection):
                 px_data='pixel').values
             reader.xaxis_data = ds['xaxis_translation'].sel(
                 px_data='data').values
+        if 'xaxis_scale' in ds:
+            reader.xaxis_scale = str(ds['xaxis_scale'].values)
+        if 'hline_interpolation' in ds:
+            reader.hline_interpolation = str(ds['hline_interpolation'].values)
 
         if reader.is_exaggerated and 'exag_col_map' in ds:
             reader.columns = list(np.where(
@@ -1025,8 +1449,11 @@ class DataReader(LabelSelection):
         for c in [self] + self.children:
             c.parent = self
         old.children.clear()
+        old._column_index = None
+        self._reset_column_index()
 
     @only_parent
+    @instrumented
     def new_child_for_cols(self, columns, cls, plot=True):
         """Create a new child reader for specific columns
 
@@ -1076,16 +1503,19 @@ class DataReader(LabelSelection):
         except AttributeError:  # np.ndarray
             self.image[..., -1] = self_alpha
             image[..., -1] = new_alpha
-        ret = cls(new_binary, ax=self.ax, extent=self.extent, plot=plot,
-                  parent=self, magni=self.magni, plot_background=False)
+        ret = cls(new_binary, ax=self.ax, extent=self.extent,
+                  plot=plot and not self.headless, parent=self,
+                  magni=self.magni, plot_background=False)
         self.children.append(ret)
         ret.columns = list(columns)
         self.columns = list(self_columns)
         ret.image = image
         # update plot and binary image
         self.binary = self_binary
+        self._profiles = None
         self.update_image(self.labels, new_alpha)
         ret.hline_locs = self.hline_locs
+        ret.hline_interpolation = self.hline_interpolation
         ret.vline_locs = self.vline_locs
         return ret
 
@@ -1126,8 +1556,8 @@ class DataReader(LabelSelection):
         if cls is None:
             cls = self.__class__
         new_binary = np.zeros_like(self.binary)
-        ret = cls(new_binary, ax=self.ax, extent=self.extent, plot=True,
-                  parent=self)
+        ret = cls(new_binary, ax=self.ax, extent=self.extent,
+                  plot=not self.headless, parent=self)
         ret.is_exaggerated = factor
         self.children.append(ret)
         ret.columns = self.columns
@@ -1140,9 +1570,11 @@ class DataReader(LabelSelection):
             ret.image = Image.fromarray(np.zeros_like(self.image), mode)
         # update plot and binary image
         ret.hline_locs = self.hline_locs
+        ret.hline_interpolation = self.hline_interpolation
         ret.vline_locs = self.vline_locs
         return ret
 
+    @instrumented
     def mark_as_exaggerations(self, mask):
         """Mask the given array as exaggerated
 
@@ -1162,6 +1594,8 @@ class DataReader(LabelSelection):
                         self.columns, ))
             return exaggerated.mark_as_exaggerations(mask)
         non_exaggerated = self.non_exaggerated_reader
+        self.register_changes(mask)
+        non_exaggerated.register_changes(mask)
         self.binary[mask] = non_exaggerated.binary[mask]
         non_exaggerated.binary[mask] = 0
         # update the plots
@@ -1227,13 +1661,15 @@ class DataReader(LabelSelection):
             if x <= xlim[0] or x >= xlim[1] or y <= ylim[0] or y >= ylim[1]:
                 return
             x -= xlim[0]
-            col, (xmin, xmax) = next(
-                (col, l) for col, l in enumerate(bounds)
-                if x >= l[0] and x <= l[1])
+            col = self.get_col_for_pixel(x)
+            if col is None or (not self._use_all_cols and
+                               col not in self.columns):
+                return
+            xmin, xmax = self.all_column_bounds[col]
         else:
             xmin, xmax = bounds[col]
-        if not self._use_all_cols:
-            col = self.columns[col]
+            if not self._use_all_cols:
+                col = self.columns[col]
         if col in self._selected_cols:
             # if it is already selected, deselect it
             self._selected_cols.pop(col).remove()
@@ -1313,6 +1749,7 @@ class DataReader(LabelSelection):
         grey[grey > 0] = 1
         return grey
 
+    @instrumented
     def estimated_column_starts(self, threshold=None):
         """
         The estimated column starts as :class:`numpy.ndarray`.
@@ -1345,8 +1782,8 @@ class DataReader(LabelSelection):
         if threshold is None:
             threshold = 0.1
         binary = self.binary
-        col_mask = binary.any(axis=0)  # True if the column contains a value
-        summed = binary.sum(axis=0)   # The total number of data points per col
+        summed = self.column_profile  # The total number of data points per col
+        col_mask = summed > 0  # True if the column contains a value
         nulls = np.where(col_mask)[0]  # columns with values
         diff = nulls[1:] - nulls[:-1]  # difference to the last col with values
         #: The valid columns that cover more than the threshold
@@ -1408,6 +1845,7 @@ class DataReader(LabelSelection):
                 raise
         return np.asarray(selection, dtype=int)
 
+    @instrumented
     def recognize_xaxes(self, fraction=0.3, min_lw=1, max_lw=None,
                         remove=False, **kwargs):
         """Recognize (and potentially remove) x-axes at bottom and top
@@ -1426,6 +1864,7 @@ class DataReader(LabelSelection):
             If True, they will be removed immediately, otherwise they are
             displayed using the :meth:`enable_label_selection` method and can
             be removed through the :meth:`remove_selected_labels` method"""
+        import skimage.morphology as skim
         binary = self.merged_binaries()
         ys, xs = binary.shape
         ys_5p = max(2, int(np.ceil(ys * 0.05)))
@@ -1447,7 +1886,7 @@ class DataReader(LabelSelection):
             selection = self._filter_lines(rows, min_lw, max_lw)
             mask[selection] = True
         if mask.any():
-            labeled = skim.label(arr, 8)
+            labeled = labeling.label(arr)
             labels = np.unique(labeled[mask])
             labels = labels[labels > 0]
             labeled[mask] = 0
@@ -1461,7 +1900,7 @@ class DataReader(LabelSelection):
 
         # lower 5 percent of the data image
         arr = self.binary[-ys_5p:]
-        row_sums = np.nansum(arr, axis=1)
+        row_sums = self.row_profile[-ys_5p:]
         mask = (row_sums / float(xs) > fraction)
         if mask.any():
             # filter with min_lw and max_lw
@@ -1475,7 +1914,7 @@ class DataReader(LabelSelection):
             selection = self._filter_lines(rows, min_lw, max_lw)
             mask[selection] = True
         if mask.any():
-            labeled = skim.label(arr, 8)
+            labeled = labeling.label(arr)
             labels = np.unique(labeled[mask])
             labels = labels[labels > 0]
             labeled[mask] = 0
@@ -1496,6 +1935,7 @@ class DataReader(LabelSelection):
     docstrings.delete_params('DataReader._filter_lines.parameters', 'locs')
 
     @docstrings.with_indent(8)
+    @instrumented
     def recognize_hlines(self, fraction=0.3, min_lw=1, max_lw=None,
                          remove=False, **kwargs):
         """Recognize horizontal lines in the plot and subtract them
@@ -1526,22 +1966,19 @@ class DataReader(LabelSelection):
         This method has to be called before the :meth:`digitize` method!
         """
         arr = np.zeros_like(self.labels)
-        mask = (np.nansum(self.binary, axis=1) / float(self.binary.shape[1]) >
-                fraction)
+        mask = self.row_profile / float(self.binary.shape[1]) > fraction
         all_rows = np.where(mask)[0]
         selection = self._filter_lines(all_rows, min_lw, max_lw)
         for i, row in enumerate(selection if remove else all_rows, 1):
             arr[row, :] = i
         if remove:
             self.hline_locs = np.unique(np.r_[self.hline_locs, selection])
+            self.register_changes(arr.astype(bool))
             self.binary[arr.astype(bool)] = 0
             self.reset_labels()
-            self.plot_im.set_array(self.labels)
-            if self.magni_plot_im is not None:
-                self.magni_plot_im.set_array(self.labels)
+            self._set_plot_array(self.labels)
         else:
             kwargs['extent'] = self.extent
-            kwargs.setdefault('zorder', self.plot_im.zorder + 0.1)
             mask = np.zeros_like(self.binary, dtype=bool)
             mask[selection, :] = self.binary[selection, :].astype(bool)
             self._show_parts2remove(self.labels, False, select_all=False,
@@ -1555,9 +1992,10 @@ class DataReader(LabelSelection):
         interpolate at these indices."""
         selection = self.selected_part if selection is None else selection
         rows = np.where(
-            selection.sum(axis=1) / self.binary.sum(axis=1) > 0.3)[0]
+            selection.sum(axis=1) / self.row_profile > 0.3)[0]
         self.hline_locs = np.unique(np.r_[self.hline_locs, rows])
 
+    @instrumented
     def recognize_yaxes(self, fraction=0.3, min_lw=0, max_lw=None,
                         remove=False):
         """Find (and potentially remove) y-axes in the image
@@ -1577,29 +2015,34 @@ class DataReader(LabelSelection):
             displayed using the :meth:`enable_label_selection` method and can
             be removed through the :meth:`remove_selected_labels` method"""
 
+        import skimage.morphology as skim
         grey = self.to_grey_pil(self.image)
         binary = self.binary
 
         ys, xs = binary.shape
 
-        mask = (np.nansum(self.binary, axis=0) / ys > fraction)
+        col_sums = self.column_profile
+        mask = col_sums / ys > fraction
         bounds = self.column_bounds
         min_col = bounds.min()
+        # the position of the columns in the bounds
+        positions = {c: icol for icol, c in enumerate(self.columns)}
         yaxes = {}
         col = -1
         nvals = 0
         for i in np.where(mask)[0]:
             if i < min_col:
                 continue
-            icol = next(icol for icol, (s, e) in enumerate(bounds)
-                        if i >= s and i < e)
+            icol = positions.get(self.get_col_for_pixel(i))
+            if icol is None:
+                continue
             if i > max(2, bounds[icol, 0] + binary.shape[1] * 0.05):
                 continue
             dominant_color = np.bincount(grey[:, i]).argmax()
             if icol != col:
                 col = icol
                 yaxes[icol] = [[i]]
-                nvals = np.nansum(binary[:, i])
+                nvals = col_sums[i]
                 line_color = dominant_color
                 found_data = False
             # append when we have about the same number of vertical lines
@@ -1608,15 +2051,15 @@ class DataReader(LabelSelection):
                 # number of data points in the row, we extend the line
                 if ((abs(dominant_color - line_color) < 10 or
                      line_color > 150 or dominant_color > 150) and
-                        np.abs(np.nansum(binary[:, i]) / nvals - 1) < 0.05):
+                        np.abs(col_sums[i] / nvals - 1) < 0.05):
                     line_color = dominant_color
                     yaxes[icol][-1].append(i)
             elif not found_data:
                 # check whether more than 10% of the previous region has been
                 # covered with data
-                sub = binary[:, yaxes[icol][-1][-1]+1:i]
-                ndata = np.nansum(sub)
-                npotential = sub.size
+                sub = col_sums[yaxes[icol][-1][-1]+1:i]
+                ndata = sub.sum()
+                npotential = sub.size * ys
                 if ndata < 0.1 * npotential:
                     yaxes[icol].append([i])
                 else:
@@ -1649,7 +2092,7 @@ class DataReader(LabelSelection):
         small = labeled.astype(bool) & (~skim.remove_small_objects(
             labeled.astype(bool), n))
         thresh = np.ceil(0.02 * len(binary))
-        labeled_small = skim.label(small)
+        labeled_small = labeling.label(small)
         for label in np.unique(labeled_small[labeled_small > 0]):
             lmask = labeled_small == label
             if np.any(np.sum(lmask, axis=0) > thresh):
@@ -1701,6 +2144,7 @@ class DataReader(LabelSelection):
         return mask
 
     @docstrings.with_indent(8)
+    @instrumented
     def recognize_vlines(self, fraction=0.3, min_lw=1, max_lw=None,
                          remove=False, **kwargs):
         """Recognize horizontal lines in the plot and subtract them
@@ -1731,8 +2175,7 @@ class DataReader(LabelSelection):
         This method should be called before the column starts are set
         """
         arr = np.zeros_like(self.labels)
-        mask = (np.nansum(self.binary, axis=0) / float(self.binary.shape[0]) >
-                fraction)
+        mask = self.column_profile / float(self.binary.shape[0]) > fraction
         all_cols = np.where(mask)[0]
         selection = self._filter_lines(all_cols, min_lw, max_lw)
         for i, col in enumerate(selection if remove else all_cols, 1):
@@ -1740,14 +2183,12 @@ class DataReader(LabelSelection):
         if remove:
             self.vline_locs = np.unique(np.r_[self.vline_locs, selection])
             self._shift_column_starts(selection)
+            self.register_changes(arr.astype(bool))
             self.binary[arr.astype(bool)] = 0
             self.reset_labels()
-            self.plot_im.set_array(self.labels)
-            if self.magni_plot_im is not None:
-                self.magni_plot_im.set_array(self.labels)
+            self._set_plot_array(self.labels)
         else:
             kwargs['extent'] = self.extent
-            kwargs.setdefault('zorder', self.plot_im.zorder + 0.1)
             mask = np.zeros_like(self.binary, dtype=bool)
             mask[:, selection] = self.binary[:, selection].astype(bool)
             self._show_parts2remove(self.labels, False, select_all=False,
@@ -1760,7 +2201,7 @@ class DataReader(LabelSelection):
         attribute where at least 30% is selected."""
         selection = self.selected_part if selection is None else selection
         cols = np.where(
-            selection.sum(axis=0) / self.binary.sum(axis=0) > 0.3)[0]
+            selection.sum(axis=0) / self.column_profile > 0.3)[0]
         self.vline_locs = np.unique(np.r_[self.vline_locs, cols])
         self._shift_column_starts(cols)
         self._shift_occurences(cols)
@@ -1805,7 +2246,7 @@ class DataReader(LabelSelection):
             shape = binary.shape
             bins = np.r_[0, np.arange(1, 260 + categorize, categorize)]
             binary = pd.cut(binary.ravel(), bins, labels=False).reshape(shape)
-        return skim.label(binary, 8, return_num=False)
+        return labeling.label(binary, return_num=False)
 
     def image_array(self):
         """The RGBA values of the colored image"""
@@ -1816,6 +2257,7 @@ class DataReader(LabelSelection):
         s, e = self.column_bounds[self.columns.index(col)]
         return self.binary[:, s:e]
 
+    @instrumented
     def shift_vertical(self, pixels, draw=True):
         """Shift the columns vertically.
 
@@ -1831,24 +2273,70 @@ class DataReader(LabelSelection):
         bounds = self.column_bounds
         pixels = np.asarray(pixels)
         npx = len(pixels)
-        for col, ((start, end), pixel) in enumerate(zip_longest(
-                bounds, pixels[[col for col in self.columns if col < npx]],
-                fillvalue=pixels[-1])):
+        shifts = list(zip_longest(
+            bounds, pixels[[col for col in self.columns if col < npx]],
+            fillvalue=pixels[-1]))
+        mask = np.zeros(arr.shape, dtype=bool)
+        for (start, end), pixel in shifts:
+            if pixel:
+                mask[:, start:end] = True
+        self.register_changes(mask)
+        for col, ((start, end), pixel) in enumerate(shifts):
             if pixel:  # shift the column upwards
                 arr[:-pixel, start:end] = arr[pixel:, start:end]
                 arr[-pixel:, start:end] = 0
+                self._profiles = None
                 if df is not None:
                     df.iloc[:-pixel, col] = df.iloc[pixel:, col].values
                     df.iloc[-pixel:, col] = np.nan
+        self._changed_rows = None
+        if df is not None:
+            self._update_column_versions(self.columns)
         self.labels = self.get_labeled_array()
-        self.plot_im.set_array(arr)
-        if self.magni_plot_im is not None:
-            self.magni_plot_im.set_array(arr)
+        self._set_plot_array(arr)
         for child in self.children:
             child.shift_vertical(pixels, draw=False)
-        if draw:
+        if draw and not self.headless:
             self.draw_figure()
 
+    #: The cached number of potential samples per row. See
+    #: :attr:`extrema_per_row`
+    _extrema_per_row = None
+
+    @property
+    def extrema_per_row(self):
+        """1D numpy array with the number of columns that have a potential
+        sample in each pixel row of the :attr:`full_df`
+
+        The array is computed from the :attr:`rough_locs` and cached until
+        they change. See also :meth:`found_extrema_per_row`"""
+        full_df = self.full_df
+        nrows = 0 if full_df is None else len(full_df)
+        rough = self.rough_locs
+        if rough is None or not len(rough) or not nrows:
+            return np.zeros(nrows, dtype=int)
+        cols = list(self.sample_locs.columns)
+        vmins = rough.xs('vmin', axis=1, level=1)[cols].values.ravel()
+        vmaxs = rough.xs('vmax', axis=1, level=1)[cols].values.ravel()
+        key = (nrows, vmins.tobytes(), vmaxs.tobytes())
+        cached = self._extrema_per_row
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        valid = ~(pd.isnull(vmins) | pd.isnull(vmaxs))
+        index = full_df.index
+        # the (inclusive) label based slices index.loc[vmin:vmax]
+        starts = index.searchsorted(vmins[valid].astype(int), 'left')
+        stops = index.searchsorted(vmaxs[valid].astype(int), 'right')
+        mask = stops > starts
+        diff = np.zeros(nrows + 1, dtype=int)
+        np.add.at(diff, starts[mask], 1)
+        np.add.at(diff, stops[mask], -1)
+        ret = diff[:-1].cumsum()
+        ret.setflags(write=False)
+        self._extrema_per_row = (key, ret)
+        return ret
+
+    @instrumented
     def found_extrema_per_row(self):
         """Calculate how many columns have a potential sample in each pixel row
 
@@ -1858,34 +2346,126 @@ class DataReader(LabelSelection):
             A series with one entry per pixel row. The values are the number of
             columns in the diagram that have a potential sample noted in the
             :attr:`rough_locs`
+
+        See Also
+        --------
+        extrema_per_row
         """
-        ret = pd.Series(np.zeros(len(self.full_df)), index=self.full_df.index,
-                        name='Extrema')
-        rough = self.rough_locs
-        if rough is None:
-            return ret
-        for col in self.sample_locs.columns:
-            for key, (imin, imax) in rough.loc[:, col].iterrows():
-                ret.loc[int(imin):int(imax)] += 1
-        return ret
+        return pd.Series(self.extrema_per_row.astype(float),
+                         index=self.full_df.index, name='Extrema')
 
     @property
     def column_bounds(self):
-        """The boundaries for the data columns"""
-        if self.column_starts is None:
-            return
-        return np.vstack([self.column_starts, self.column_ends]).T
+        """The boundaries for the data columns of this reader
+
+        The returned array is read-only and cached in the column index (see
+        :meth:`_get_column_index`)"""
+        if self.parent._column_starts is None:
+            return self.column_starts
+        bounds = self._get_column_index()['bounds']
+        reader, ret = bounds.get(id(self), (None, None))
+        if reader is not self:
+            ret = self._readonly(
+                np.vstack([self.column_starts, self.column_ends]).T)
+            bounds[id(self)] = (self, ret)
+        return ret
 
     @property
     def all_column_bounds(self):
-        """The boundaries for the data columns"""
-        if self.all_column_starts is None:
+        """The boundaries for all the data columns (including child reader)
+
+        The returned array is read-only and cached in the column index (see
+        :meth:`_get_column_index`)"""
+        if self.parent._column_starts is None:
             return
-        return np.vstack([self.all_column_starts,
-                          self.all_column_ends]).T
+        return self._get_column_index()['all_bounds']
+
+    def _reset_column_index(self):
+        """Invalidate the column geometry index of the :attr:`parent`
+
+        This method has to be called when the column starts or ends or the
+        :attr:`columns` of a reader are changed inplace. New arrays and lists
+        are detected automatically by :meth:`_get_column_index`"""
+        self.parent._column_index = None
+
+    def _get_column_index(self):
+        """Get the geometry index of the columns
+
+        The index is stored in the :attr:`parent` reader and rebuilt when the
+        column starts or ends, the readers or their :attr:`columns` changed.
+
+        Returns
+        -------
+        dict
+            A mapping with
+
+            ``'readers'``
+                A mapping from column to the (non-exaggerated) reader that
+                handles it (see :meth:`get_reader_for_col`)
+            ``'all_bounds'``
+                The (read-only) :attr:`all_column_bounds`
+            ``'bounds'``
+                A mapping from the id of a reader to the reader and its
+                (read-only) :attr:`column_bounds`
+            ``'pixel_cols'``
+                An array with the column of each pixel column of the
+                :attr:`binary` data (-1 for pixels outside of a column, see
+                :meth:`get_col_for_pixel`)"""
+        parent = self.parent
+        readers = list(self.iter_all_readers)
+        columns = [reader.columns for reader in readers]
+        key = [parent._column_starts, parent._column_ends]
+        for reader in readers:
+            key.extend([reader, reader._columns, reader.is_exaggerated])
+        index = parent._column_index
+        if index is not None and len(key) == len(index['key']) and all(
+                a is b for a, b in zip(key, index['key'])):
+            return index
+        index = {'key': key, 'readers': {}, 'bounds': {},
+                 'all_bounds': None, 'pixel_cols': None}
+        for reader, cols in zip(readers, columns):
+            if not reader.is_exaggerated and cols is not None:
+                for col in cols:
+                    index['readers'].setdefault(col, reader)
+        if parent._column_starts is not None:
+            bounds = np.vstack([parent.all_column_starts,
+                                parent.all_column_ends]).T
+            index['all_bounds'] = self._readonly(bounds)
+            # the first column that contains the pixel, as in the scans of
+            # the bounds
+            pixel_cols = np.full(self.binary.shape[1], -1, dtype=int)
+            for col, (s, e) in reversed(list(enumerate(np.ceil(
+                    bounds).astype(int)))):
+                pixel_cols[max(s, 0):max(e, 0)] = col
+            index['pixel_cols'] = self._readonly(pixel_cols)
+        parent._column_index = index
+        return index
+
+    def get_col_for_pixel(self, x):
+        """Get the column that contains a pixel column of the binary data
+
+        Parameters
+        ----------
+        x: float
+            The x-coordinate in the :attr:`binary` data
+
+        Returns
+        -------
+        int or None
+            The index of the column in the :attr:`all_column_bounds` or None,
+            if `x` is not within one of the columns"""
+        if self.parent._column_starts is None:
+            return None
+        pixel_cols = self._get_column_index()['pixel_cols']
+        x = int(np.floor(x))
+        if x < 0 or x >= len(pixel_cols) or pixel_cols[x] < 0:
+            return None
+        return int(pixel_cols[x])
 
     @docstrings.get_sectionsf('DataReader.digitize')
-    def digitize(self, use_sum=False, inplace=True):
+    @instrumented
+    def digitize(self, use_sum=False, inplace=True, incremental=False,
+                 max_workers=None):
         """Digitize the binary image to create the full dataframe
 
         Parameters
@@ -1897,45 +2477,169 @@ class DataReader(LabelSelection):
         inplace: bool
             If True (default), the :attr:`full_df` attribute is updated.
             Otherwise a DataFrame is returned
+        incremental: bool
+            If True, only recompute the rows and columns where the
+            :attr:`binary` data changed since the last call of this method
+            (see :meth:`register_changes`). If the column bounds changed or
+            this reader has not been digitized before, the entire image is
+            processed
+        max_workers: int
+            The number of threads to digitize the columns in parallel. If
+            None, the :attr:`max_workers` attribute is used
 
         Returns
         -------
         None or :class:`pandas.DataFrame`
             The digitization result if `inplace` is ``True``, otherwise None
+
+        Notes
+        -----
+        Only an `inplace` digitization consumes the changes of the
+        :attr:`binary` data. Otherwise the next incremental call would not
+        update the :attr:`full_df` for them
         """
+        vals, columns = self._digitize_values(use_sum, incremental,
+                                              max_workers, update=inplace)
+        if inplace:
+            self._set_full_df_columns(vals, columns)
+        else:
+            return pd.DataFrame(vals, columns=self.columns,
+                                index=np.arange(len(self.binary)))
+
+    def _digitize_values(self, use_sum=False, incremental=False,
+                         max_workers=None, update=True):
+        """Digitize the binary image into an array
+
+        Parameters
+        ----------
+        ``use_sum, incremental, max_workers``
+            See :meth:`digitize`
+        update: bool
+            If True, the result is cached for the next incremental
+            digitization and the changes of the :attr:`binary` data are
+            reset (see :meth:`register_changes`)
+
+        Returns
+        -------
+        np.ndarray
+            The digitized values with one column per column in
+            :attr:`columns`
+        np.ndarray
+            The positions of the columns that have been recomputed"""
+        max_workers = self._get_max_workers(max_workers)
         binary = self.binary
         self._get_column_starts()  # estimate the column starts
         bounds = self.column_bounds
-
-        vals = np.zeros((binary.shape[0], len(bounds)), dtype=float)
-
-        for i, (vmin, vmax) in enumerate(bounds):
-            if use_sum:
-                vals[:, i] = np.nansum(binary[:, vmin:vmax], axis=1)
-            else:
-                for row in range(len(vals)):
-                    notnull = np.where(binary[row, vmin:vmax])[0]
-                    if len(notnull):
-                        vals[row, i] = notnull.max() + 1
+        key = (bool(use_sum), binary.shape, bounds.tolist())
+        fill_key = (self.hline_interpolation, np.asarray(self.hline_locs,
+                                                         dtype=int).tolist())
+        cache = self._digitize_cache
+        changed = self._changed_rows
+
+        if (incremental and cache is not None and cache[0] == key and
+                changed is not None):
+            vals = cache[1] if update else cache[1].copy()
+            columns = np.where(changed.any(axis=0))[0]
+
+            def digitize_rows(i):
+                rows = np.where(changed[:, i])[0]
+                vmin, vmax = bounds[i]
+                return rows, self._digitize_column(binary[rows, vmin:vmax],
+                                                   use_sum)
+
+            for i, (rows, col_vals) in zip(columns, map_parallel(
+                    digitize_rows, columns, max_workers)):
+                vals[rows, i] = col_vals
+            if cache[2] != fill_key:
+                columns = np.arange(len(bounds))
+        elif use_sum:
+            vals = self.column_row_profiles.astype(float)
+            columns = np.arange(len(bounds))
+        else:
+            vals = np.zeros((binary.shape[0], len(bounds)), dtype=float)
+            for i, col_vals in enumerate(map_parallel(
+                    lambda b: self._digitize_column(binary[:, b[0]:b[1]],
+                                                    use_sum),
+                    bounds, max_workers)):
+                vals[:, i] = col_vals
+            columns = np.arange(len(bounds))
+        if update:
+            self._digitize_cache = (key, vals, fill_key)
+            self._changed_rows = np.zeros(vals.shape, dtype=bool)
+            self._changed_columns = columns
+        vals = vals.copy()
 
         # interpolate the values at :attr:`hline_locs`
         if len(self.hline_locs):
-            from scipy.interpolate import interp1d
-            y = np.arange(len(vals))
-            indices = sorted(set(range(len(vals))).difference(self.hline_locs))
-            data = vals[np.ix_(indices, list(range(vals.shape[1])))]
-            for i in range(vals.shape[1]):
-                vals[:, i] = interp1d(
-                    y[indices], data[:, i], bounds_error=False,
-                    fill_value='extrapolate')(y)
-        if inplace:
+            fill_rows(vals, self.hline_locs, self.hline_interpolation)
+        return vals, columns
+
+    def _get_max_workers(self, max_workers=None):
+        """Get the number of workers for the parallel processing
+
+        Parameters
+        ----------
+        max_workers: int
+            The requested number of workers. If None, the :attr:`max_workers`
+            attribute is used
+
+        Returns
+        -------
+        int
+            The number of workers"""
+        import os
+        if max_workers is None:
+            max_workers = self.max_workers
+        return int(max_workers or os.cpu_count() or 1)
+
+    def _set_full_df_columns(self, vals, columns):
+        """Update the given columns of the :attr:`full_df`
+
+        Parameters
+        ----------
+        vals: 2D np.ndarray
+            The data for all columns in :attr:`columns`
+        columns: list of int
+            The positions of the columns in :attr:`columns` to update"""
+        if self.full_df is None or len(columns) == len(self.columns):
             self.full_df = vals
-        else:
-            return pd.DataFrame(vals, columns=self.columns,
-                                index=np.arange(len(self.binary)))
+        elif len(columns):
+            changed_cols = np.asarray(self.columns)[columns].tolist()
+            self.parent._full_df.loc[:, changed_cols] = np.asarray(vals)[
+                :, columns]
+            self._update_column_versions(changed_cols)
+
+    @staticmethod
+    def _digitize_column(arr, use_sum=False):
+        """Digitize the binary data of one column
+
+        Parameters
+        ----------
+        arr: 2D np.ndarray
+            The binary data of the column
+        use_sum: bool
+            If True, the sum of cells that are not background are used for
+            each row, otherwise the distance of the last cell that is not
+            background to the column start
 
+        Returns
+        -------
+        np.ndarray
+            The digitized value for each row in `arr`"""
+        if use_sum:
+            return np.nansum(arr, axis=1)
+        ret = np.zeros(len(arr))
+        notnull = arr[:, ::-1].astype(bool)
+        found = notnull.any(axis=1)
+        ret[found] = arr.shape[1] - notnull[found].argmax(axis=1)
+        return ret
+
+    docstrings.keep_params('DataReader.digitize.parameters', 'incremental')
+
+    @docstrings.with_indent(8)
+    @instrumented
     def digitize_exaggerated(self, fraction=0.05, absolute=8, inplace=True,
-                             return_mask=False):
+                             return_mask=False, incremental=False):
         """Merge the exaggerated values into the original digitized result
 
         Parameters
@@ -1952,6 +2656,7 @@ class DataReader(LabelSelection):
         return_mask: bool
             If True, a boolean 2D array is returned indicating where the
             exaggerations have been used
+        %(DataReader.digitize.parameters.incremental)s
 
         Returns
         -------
@@ -1967,12 +2672,13 @@ class DataReader(LabelSelection):
         if not self.is_exaggerated:
             return self.exaggerated_reader.digitize_exaggerated(
                 fraction=fraction, absolute=absolute, inplace=inplace,
-                return_mask=return_mask)
+                return_mask=return_mask, incremental=incremental)
         if inplace:
             non_exag = self.full_df.values
         else:
             non_exag = self.full_df.values.copy()
-        new_vals = self.digitize(inplace=False).values
+        new_vals = self._digitize_values(incremental=incremental,
+                                         update=inplace)[0]
 
         # where we are below 5 percent of the column width, we use the
         # exaggerated value
@@ -2036,6 +2742,78 @@ class DataReader(LabelSelection):
 
     xaxis_data = None
 
+    #: The scale of the x-axis. Either ``'linear'`` or ``'log'`` (i.e. the
+    #: pixel coordinates are linear in the logarithm of the data)
+    xaxis_scale = 'linear'
+
+    def xaxis_transform(self):
+        """The affine transformation from pixel to data coordinates
+
+        Returns
+        -------
+        float
+            The slope of the transformation
+        float
+            The intercept of the transformation
+
+        Notes
+        -----
+        For a logarithmic :attr:`xaxis_scale`, the transformation maps the
+        pixel coordinates to the decadal logarithm of the data"""
+        x_px = self.xaxis_px
+        x_data = np.asarray(self.xaxis_data, dtype=float)
+        if self.xaxis_scale == 'log':
+            x_data = np.log10(x_data)
+        diff_px = np.diff(x_px)[0]
+        diff_data = np.diff(x_data)[0]
+        slope = diff_data / diff_px
+        intercept = x_data[0] - slope * x_px[0]
+        return slope, intercept
+
+    def xaxis_transforms(self, columns=None):
+        """The table of x-axis transformations for multiple columns
+
+        Parameters
+        ----------
+        columns: list of int
+            The columns of interest. If None, the :attr:`columns` of the
+            :attr:`parent` reader are used
+
+        Returns
+        -------
+        np.ndarray of dtype float
+            The slope for each column
+        np.ndarray of dtype float
+            The intercept for each column
+        np.ndarray of dtype bool
+            True for each column with a logarithmic :attr:`xaxis_scale`
+
+        Notes
+        -----
+        The transformation of columns whose reader does not (yet) have an
+        x-axis translation is the identity"""
+        if columns is None:
+            columns = self.parent.columns
+        ncols = len(columns)
+        slopes = np.ones(ncols)
+        intercepts = np.zeros(ncols)
+        log = np.zeros(ncols, dtype=bool)
+        transforms = {}
+        for i, col in enumerate(columns):
+            reader = self.get_reader_for_col(col)
+            if reader is None:
+                continue
+            key = id(reader)
+            if key not in transforms:
+                try:
+                    transforms[key] = reader.xaxis_transform() + (
+                        reader.xaxis_scale == 'log', )
+                except ValueError:
+                    transforms[key] = None
+            if transforms[key] is not None:
+                slopes[i], intercepts[i], log[i] = transforms[key]
+        return slopes, intercepts, log
+
     def px2data_x(self, coord):
         """Transform the pixel coordinates into data coordinates
 
@@ -2053,14 +2831,13 @@ class DataReader(LabelSelection):
         -----
         Since the x-axes for stratographic plots are usually interrupted, the
         return values here are relative and therefore always start from 0"""
-        x_px = self.xaxis_px
-        x_data = self.xaxis_data
-        diff_px = np.diff(x_px)[0]
-        diff_data = np.diff(x_data)[0]
-        slope = diff_data / diff_px
-        intercept = x_data[0] - slope * x_px[0]
+        slope, intercept = self.xaxis_transform()
+        ret = intercept + slope * coord
+        if self.xaxis_scale == 'log':
+            with np.errstate(over='ignore'):
+                ret = 10 ** ret
         return np.where(coord == self.occurences_value, self.occurences_value,
-                        intercept + slope * coord)
+                        ret)
 
     @docstrings.get_sectionsf('DataReader._plot_df')
     def _plot_df(self, df, ax=None, *args, **kwargs):
@@ -2177,6 +2954,7 @@ class DataReader(LabelSelection):
 
     @docstrings.get_sectionsf('DataReader.find_potential_samples',
                               sections=['Parameters', 'Returns'])
+    @instrumented
     def find_potential_samples(self, col, min_len=None,
                                max_len=None, filter_func=None):
         """
@@ -2218,7 +2996,21 @@ class DataReader(LabelSelection):
         See Also
         --------
         find_samples
+
+        Notes
+        -----
+        The results are cached until the column in the :attr:`full_df`
+        changes. The `filter_func` is applied to the cached results
         """
+        if filter_func is not None:
+            included, excluded = self.find_potential_samples(
+                col, min_len, max_len)
+            return (list(filter(filter_func, included)),
+                    list(filter(filter_func, excluded)))
+        cached = self._get_cached_potential_samples(col, min_len, max_len)
+        if cached is not None:
+            return cached
+
         def find_potential_samples():
 
             def do_append(indices):
@@ -2337,7 +3129,47 @@ class DataReader(LabelSelection):
 
         included1, excluded1 = find_potential_samples()
         excluded1.extend(excluded0)
-        return included1, sorted(excluded1)
+        return self._cache_potential_samples(
+            col, (included1, sorted(excluded1)), min_len, max_len)
+
+    def _potential_samples_state(self, col):
+        """Get the state of a column in the :attr:`full_df` for the cache of
+        :meth:`find_potential_samples`"""
+        return id(self.parent._full_df), self.column_version(col)
+
+    def _get_cached_potential_samples(self, col, min_len=None, max_len=None):
+        """Get the cached results of :meth:`find_potential_samples`
+
+        Returns
+        -------
+        tuple or None
+            A copy of the cached results or None, if no valid results are in
+            the cache"""
+        cache = self._potential_samples_cache
+        if not cache:
+            return None
+        try:
+            state, included, excluded = cache[(col, min_len, max_len)]
+        except KeyError:
+            return None
+        if state != self._potential_samples_state(col):
+            return None
+        return list(map(list, included)), list(map(list, excluded))
+
+    def _cache_potential_samples(self, col, results, min_len=None,
+                                 max_len=None):
+        """Cache the results of :meth:`find_potential_samples`
+
+        Returns
+        -------
+        tuple
+            A copy of the given `results`"""
+        if self._potential_samples_cache is None:
+            self._potential_samples_cache = {}
+        included, excluded = results
+        self._potential_samples_cache[(col, min_len, max_len)] = (
+            self._potential_samples_state(col), included, excluded)
+        return list(map(list, included)), list(map(list, excluded))
 
     docstrings.delete_params('DataReader.find_potential_samples.parameters',
                              'col')
@@ -2417,7 +3249,7 @@ class DataReader(LabelSelection):
     def get_occurences(self):
         """Extract the positions of the occurences from the selection"""
         selected = self.selected_part
-        labeled, num = skim.label(selected, 8, return_num=True)
+        labeled, num = labeling.label(selected, return_num=True)
         if self._column_starts is None:
             bounds = []
         else:
@@ -2441,12 +3273,11 @@ class DataReader(LabelSelection):
         -------
         DataReader or None
             Either the reader or None if no reader could be found"""
-        return next((child for child in self.iter_all_readers
-                     if not child.is_exaggerated and col in child.columns),
-                    None)
+        return self._get_column_index()['readers'].get(col)
 
     @docstrings.get_sectionsf('DataReader.unique_bars')
     @docstrings.dedent
+    @instrumented
     def unique_bars(self, min_fract=None, asdict=True, *args, **kwargs):
         """
         Estimate the unique bars
@@ -2461,6 +3292,15 @@ class DataReader(LabelSelection):
             sample. If None, the :attr:`min_fract` attribute is used
         asdict: bool
             If True, dictionaries are returned
+        max_workers: int
+            The number of processes to find the potential samples of the
+            columns in parallel. If None, the :attr:`max_workers` attribute is
+            used
+
+        Other Parameters
+        ----------------
+        ``*args, **kwargs``
+            Any other argument for the :meth:`find_potential_samples` method
 
         Returns
         -------
@@ -2482,13 +3322,15 @@ class DataReader(LabelSelection):
 
         min_fract = min_fract or self.min_fract
         occurences = self.occurences_dict
+        max_workers = self._get_max_workers(kwargs.pop('max_workers', None))
         df = self.parent._full_df
         get_child = self.get_reader_for_col
+        potential_samples = self._find_all_potential_samples(
+            [(col, get_child(col)) for col in df.columns], max_workers,
+            *args, **kwargs)
         bars = list(chain.from_iterable(
-            (_Bar(col, indices) for indices in insert_occs(
-                 col, get_child(col).find_potential_samples(
-                    col, *args, **kwargs)[0]))
-            for col in df.columns))
+            (_Bar(col, indices) for indices in insert_occs(col, found))
+            for col, found in zip(df.columns, potential_samples)))
         for bar in bars:
             bar.get_overlaps(bars, min_fract)
         ret = []
@@ -2499,7 +3341,54 @@ class DataReader(LabelSelection):
         ret = sorted(ret, key=lambda b: b.mean_loc)
         return [b.asdict for b in ret] if asdict else ret
 
-    docstrings.keep_params('DataReader.unique_bars.parameters', 'min_fract')
+    def _find_all_potential_samples(self, readers, max_workers=1, *args,
+                                    **kwargs):
+        """Find the potential samples for multiple columns
+
+        The columns of readers that do not reimplement the
+        :meth:`find_potential_samples` method are processed in a process pool
+        if `max_workers` is not 1.
+
+        Parameters
+        ----------
+        readers: list of tuples
+            The column and the corresponding reader for each column
+        max_workers: int
+            The number of processes
+
+        Other Parameters
+        ----------------
+        ``*args, **kwargs``
+            Any other argument for the :meth:`find_potential_samples` method
+
+        Returns
+        -------
+        list
+            The potential samples for each column (i.e. the first return
+            value of :meth:`find_potential_samples`)"""
+        jobs = []
+        if max_workers != 1 and not args:
+            # find the potential samples of the columns that are not yet in
+            # the cache and apply the filter_func afterwards
+            kws = {key: val for key, val in kwargs.items()
+                   if key != 'filter_func'}
+            jobs = [
+                (col, reader, (type(reader), col,
+                               reader.full_df[col].values, kws))
+                for col, reader in readers
+                if (type(reader).find_potential_samples is
+                    DataReader.find_potential_samples and
+                    reader._get_cached_potential_samples(col, **kws) is None)]
+            results = map_parallel(_potential_samples_worker,
+                                   [job[-1] for job in jobs], max_workers,
+                                   processes=True)
+            for (col, reader, job), res in zip(jobs, results):
+                reader._cache_potential_samples(col, res, **kws)
+        return [reader.find_potential_samples(col, *args, **kwargs)[0]
+                for col, reader in readers]
+
+    docstrings.keep_params('DataReader.unique_bars.parameters', 'min_fract',
+                           'max_workers')
     docstrings.delete_params(
         'DataReader.find_potential_samples.parameters', 'col')
 
@@ -2507,6 +3396,7 @@ class DataReader(LabelSelection):
                               sections=['Parameters', 'Returns'])
     @docstrings.dedent
     @only_parent
+    @instrumented
     def find_samples(self, min_fract=None, pixel_tol=5, *args, **kwargs):
         """
         Find the samples in the diagram
@@ -2518,7 +3408,7 @@ class DataReader(LabelSelection):
 
         Parameters
         ----------
-        %(DataReader.unique_bars.parameters.min_fract)s
+        %(DataReader.unique_bars.parameters.min_fract|max_workers)s
         %(DataReader.find_potential_samples.parameters.no_col)s
 
         Returns
@@ -2594,14 +3484,52 @@ class DataReader(LabelSelection):
         return ret_locs, ret_rough
 
     def merge_occurences(self, locs):
+        """Insert the :attr:`occurences_value` at the closest samples
+
+        Parameters
+        ----------
+        locs: pandas.DataFrame
+            The sample locations (see :attr:`sample_locs`). It is modified
+            inplace"""
         occurences = self.occurences_dict
+        if not occurences or not len(locs):
+            return
+        samples = locs.index.values
+        order = samples.argsort(kind='mergesort')
+        sorted_samples = samples[order]
         for col, occs in occurences.items():
-            closest = np.abs(
-                locs.index.values[np.newaxis] -
-                occs[:, np.newaxis]).argmin(axis=1)
+            occs = np.asarray(occs)
+            if not len(occs):
+                continue
+            # take the closest sample (or the smaller one for ties)
+            right = sorted_samples.searchsorted(occs).clip(
+                0, len(samples) - 1)
+            left = (right - 1).clip(0)
+            use_left = (np.abs(occs - sorted_samples[left]) <=
+                        np.abs(sorted_samples[right] - occs))
+            closest = order[np.where(use_left, left, right)]
             locs.iloc[closest, col] = self.occurences_value
 
+    @instrumented
     def merge_close_samples(self, locs, rough_locs=None, pixel_tol=5):
+        """Merge samples that are closer than `pixel_tol`
+
+        Parameters
+        ----------
+        locs: pandas.DataFrame
+            The sample locations (see :attr:`sample_locs`). The index must be
+            sorted
+        rough_locs: pandas.DataFrame
+            The corresponding rough locations (see :attr:`rough_locs`)
+        pixel_tol: int
+            The minimal distance between two samples
+
+        Returns
+        -------
+        pandas.DataFrame
+            The merged `locs`
+        pandas.DataFrame
+            The merged `rough_locs`"""
         samples = locs.index.values.copy()
         # now we check, that at least 2 pixels lie between the samples.
         # otherwise we merge them together
@@ -2609,38 +3537,69 @@ class DataReader(LabelSelection):
         keys, indices = groupby_arr(mask)
 
         istart = 0 if not keys[0] else 1
-        # take the mean of where we have multiple consecutive minima
-        # we take every second index, because we are interested in the
-        # ``False`` values and the first entry in `keys` is True.
-        for j, k in zip(indices[istart::2], indices[istart+1::2]):
-            # use the extrema with the smallest widths
-            if j - 1 == 0:
-                samples[j-1:k] = samples[k-1]
-                for i in range(j-1, k-1):
-                    locs.iloc[i, :] = locs.iloc[k-1, :].values
-            elif k == len(locs):
-                samples[j-1:k] = samples[j-1]
-            else:
-                widths = (rough_locs.iloc[j-1:k, 1::2] -
-                          rough_locs.iloc[j-1:k, ::2].values)
-                minwidth = np.nanmin(widths[widths > 0].values)
-                mask = (widths.values == minwidth).any(axis=1)
-                new_loc = samples[j-1:k][mask].mean()
-                samples[j-1:k] = new_loc
-                for i, ((col, vals), (_, col_widths)) in enumerate(
-                        zip(locs.items(), widths.items())):
-                    locs.iloc[j-1:k, i] = vals.iloc[
-                        vals.index.get_loc(new_loc, 'nearest')]
-
-                    col_mask = (col_widths > 0).values
-                    if col_mask.sum() > 1:
-                        new_indices = rough_locs.iloc[j-1:k, i*2:i*2+2][
-                            col_mask[:, np.newaxis]].values.ravel().tolist()
-                        warn("Distinct samples merged from %s in "
-                             "column %s!" % (new_indices, col))
-                        new_indices.sort()
-                        rough_locs.iloc[j-1, 2*i:2*i+2] = [new_indices[0],
-                                                           new_indices[-1]]
+        # every group of close samples starts one sample before a sequence
+        # of ``False`` values in the `mask` and ends with it. We take every
+        # second index, because the first entry in `keys` is True.
+        ends = indices[istart+1::2]
+        starts = indices[istart::2][:len(ends)] - 1
+        if len(starts):
+            nsamples = len(samples)
+            sizes = ends - starts
+            # the group for each row in one of the groups
+            group = np.repeat(np.arange(len(starts)), sizes)
+            rows = np.arange(len(group)) + np.repeat(
+                starts - np.r_[0, sizes[:-1].cumsum()], sizes)
+            # the row with the values for each group and the new sample
+            src = starts.copy()
+            new_locs = samples[starts].astype(float)
+            # use the last sample if the group contains the first one
+            if starts[0] == 0:
+                src[0] = ends[0] - 1
+                new_locs[0] = samples[ends[0] - 1]
+            # use the extrema with the smallest widths if the group does not
+            # contain the first or the last sample
+            inner = (starts != 0) & (ends != nsamples)
+            if inner.any():
+                rough = rough_locs.values
+                widths = rough[:, 1::2] - rough[:, ::2]
+                positive = widths > 0
+                row_min = np.where(positive, widths, np.inf).min(axis=1)
+                minwidth = np.full(len(starts), np.inf)
+                np.minimum.at(minwidth, group, row_min[rows])
+                row_mask = (widths[rows] == minwidth[group, np.newaxis]).any(
+                    axis=1)
+                nmin = np.bincount(group, row_mask, len(starts))
+                # use the first sample for groups without any extrema
+                mean_locs = samples[starts].astype(float)
+                found = nmin > 0
+                mean_locs[found] = np.bincount(
+                    group, samples[rows] * row_mask,
+                    len(starts))[found] / nmin[found]
+                # take the sample closest to the new location (or the larger
+                # one for ties)
+                pos = samples.searchsorted(mean_locs[inner]).clip(
+                    1, nsamples - 1)
+                left = (mean_locs[inner] - samples[pos - 1] <
+                        samples[pos] - mean_locs[inner])
+                src[inner] = np.where(left, pos - 1, pos)
+                new_locs[inner] = mean_locs[inner]
+
+                # merge the rough locations of multiple extrema in one column
+                counts = np.zeros((len(starts), widths.shape[1]), dtype=int)
+                np.add.at(counts, group, positive[rows])
+                counts[~inner] = 0
+                for i, j in zip(*np.where(counts > 1)):
+                    sl = slice(starts[i], ends[i])
+                    new_indices = rough[sl, 2*j:2*j+2][
+                        positive[sl, j]].ravel().tolist()
+                    warn("Distinct samples merged from %s in "
+                         "column %s!" % (new_indices, locs.columns[j]))
+                    new_indices.sort()
+                    rough_locs.iloc[starts[i], 2*j:2*j+2] = [
+                        new_indices[0], new_indices[-1]]
+            samples[rows] = new_locs[group]
+            # only the first row of each group is kept
+            locs.iloc[starts, :] = locs.values[src]
         locs.index = samples
         rough_locs.index = samples
         not_duplicated = ~locs.index.duplicated()
@@ -2669,6 +3628,7 @@ class DataReader(LabelSelection):
         return self.sample_locs
 
     @only_parent
+    @instrumented
     def add_samples(self, samples, rough_locs=None):
         """Add samples to the found ones
 
@@ -2747,6 +3707,7 @@ class DataReader(LabelSelection):
         self.sample_locs = new.combine_first(df)
 
     @docstrings.get_sectionsf('DataReader.get_disconnected_parts')
+    @instrumented
     def get_disconnected_parts(self, fromlast=5, from0=10,
                                cross_column=False):
         """Identify parts in the :attr:`binary` data that are not connected
@@ -2872,15 +3833,18 @@ class DataReader(LabelSelection):
         kwargs['extent'] = self.extent
         if remove:
             mask = (arr if selection is None else selection).astype(bool)
+            self.register_changes(mask)
             self.labels[mask] = 0
             self.binary[mask] = 0
             self.reset_labels()
-            self.plot_im.set_array(self.labels)
-            if self.magni_plot_im is not None:
-                self.magni_plot_im.set_array(self.labels)
+            self._set_plot_array(self.labels)
+        elif self.headless:
+            raise ValueError(
+                "The parts to remove can only be selected in a plot! Use "
+                "remove=True for headless readers.")
         else:
             kwargs.setdefault('zorder', self.plot_im.zorder + 0.1)
-            labels, num_labels = skim.label(arr, 8, return_num=True)
+            labels, num_labels = labeling.label(arr, return_num=True)
             self.enable_label_selection(labels, num_labels, **kwargs)
             if select_all:
                 self.select_all_labels()
@@ -2907,33 +3871,74 @@ class DataReader(LabelSelection):
         self._show_parts2remove(arr, remove, **kwargs)
 
     @only_parent
+    @instrumented
     def merged_binaries(self):
         """Get the binary data from all children and merge them into one array
 
+        The merged array is cached on the parent reader and only the rows
+        that have been registered via :meth:`register_changes` are updated.
+        It is recomputed if a reader is added or removed or its :attr:`binary`
+        array is replaced.
+
         Returns
         -------
         np.ndarray of dtype int
-            The binary image with the same shape as the :attr:`binary` data"""
-        binary = self.binary.copy()
-        for child in self.children:
-            mask = child.binary.astype(bool)
-            binary[mask] = child.binary[mask]
+            The binary image with the same shape as the :attr:`binary` data.
+            The array is read-only"""
+        state = [(reader, reader.binary) for reader in self.iter_all_readers]
+        binary = self._merged_binaries
+        old_state = self._merged_state or []
+        if (binary is None or binary.shape != self.binary.shape or
+                len(state) != len(old_state) or
+                any(r0 is not r1 or b0 is not b1
+                    for (r0, b0), (r1, b1) in zip(state, old_state))):
+            binary = self.binary.copy()
+            for child in self.children:
+                mask = child.binary.astype(bool)
+                binary[mask] = child.binary[mask]
+            binary.setflags(write=False)
+            self._merged_binaries = binary
+            self._merged_state = state
+            self._merged_version += 1
+        elif self._merged_changed_rows.any():
+            # update the rows that changed since the last call
+            rows = np.where(self._merged_changed_rows)[0]
+            arr = self.binary[rows]
+            for child in self.children:
+                child_arr = child.binary[rows]
+                mask = child_arr.astype(bool)
+                arr[mask] = child_arr[mask]
+            binary.setflags(write=True)
+            binary[rows] = arr
+            binary.setflags(write=False)
+            self._merged_version += 1
+        self._merged_changed_rows = np.zeros(binary.shape[0], dtype=bool)
         return binary
 
     @only_parent
+    @instrumented
     def merged_labels(self):
         """Get the labeled binary data from all children merged into one array
 
+        The labels are cached until the :meth:`merged_binaries` change.
+
         Returns
         -------
         np.ndarray of dtype int
             The labeled binary image with the same shape as the
-            :attr:`label` data"""
+            :attr:`label` data. The array is read-only"""
         binary = self.merged_binaries()
-        return skim.label(binary, 8, return_num=False)
+        cached = self._merged_labels
+        if cached is not None and cached[0] == self._merged_version:
+            return cached[1]
+        labels = labeling.label(binary, return_num=False)
+        labels.setflags(write=False)
+        self._merged_labels = (self._merged_version, labels)
+        return labels
 
     @only_parent
     @docstrings.get_sectionsf('DataReader.get_cross_column_features')
+    @instrumented
     def get_cross_column_features(self, min_px=50):
         """Get features that are contained in two or more columns
 
@@ -2949,14 +3954,22 @@ class DataReader(LabelSelection):
             that is True if a data pixel is considered as to belong to a
             cross column feature"""
         labels = self.merged_labels()
-        bins = np.arange(0.5, labels.max() + 0.6, 1.)
-        bounds = self.all_column_bounds
-        counts = np.zeros((len(bounds), len(bins) - 1))
-        for col, (start, end) in enumerate(bounds):
-            counts[col] = np.histogram(labels[:, start:end], bins=bins)[0]
-        selection = np.where((counts >= min_px).sum(axis=0) > 1)[0] + 1
+        nlabels = labels.max() + 1
+        # encode the column and the label of every data pixel in one key and
+        # count the pixels of the (column, label) pairs that occur
+        keys = []
+        for col, (start, end) in enumerate(self.all_column_bounds):
+            col_labels = labels[:, start:end]
+            keys.append(
+                col_labels[col_labels > 0].astype(np.int64) + col * nlabels)
+        keys, counts = np.unique(np.concatenate(keys), return_counts=True)
+        # the labels that have at least min_px pixels in two or more columns
+        found, ncols = np.unique(keys[counts >= min_px] % nlabels,
+                                 return_counts=True)
+        selected = np.zeros(nlabels, dtype=bool)
+        selected[found[ncols > 1]] = True
         self.remove_callbacks['labels'].append(self.remove_in_children)
-        return np.where(np.isin(labels, selection), labels, 0)
+        return np.where(selected[labels], labels, 0)
 
     @docstrings.with_indent(8)
     def show_cross_column_features(self, min_px=50, remove=False, **kwargs):
@@ -2982,11 +3995,13 @@ class DataReader(LabelSelection):
         See Also
         --------
         skimage.morphology.remove_small_objects"""
+        import skimage.morphology as skim
         arr = self.merged_binaries().astype(bool)
         mask = arr & (~skim.remove_small_objects(arr, n))
         self._show_parts2remove(mask.astype(int), remove, **kwargs)
 
     @docstrings.get_sectionsf('DataReader.get_parts_at_column_ends')
+    @instrumented
     def get_parts_at_column_ends(self, npixels=2):
         """Identify parts in the :attr:`binary` data that touch the next column
 
@@ -3043,6 +4058,8 @@ class DataReader(LabelSelection):
 
     def draw_figure(self):
         """Draw the matplotlib :attr:`fig` and the :attr:`magni` figure"""
+        if self.headless:
+            return
         self.fig.canvas.draw()
         if self.magni is not None:
             self.magni.ax.figure.canvas.draw()
@@ -3308,6 +4325,10 @@ class BarDataReader(DataReader):
 
     _splitted = None
 
+    #: The settings of the last :meth:`digitize` call and a mapping from
+    #: column to the results of :meth:`get_bars`
+    _bars_cache = None
+
     #: True if the bars are rounded (see the :class:`RoundedBarDataReader` and
     #: the implementation in the :meth:`get_bars` method
     _rounded = False
@@ -3378,6 +4399,7 @@ class BarDataReader(DataReader):
             'units': 'px'}
         })
 
+    @instrumented
     def to_dataset(self, ds=None):
         # reimplemented to include additional variables
         def v(s):
@@ -3416,6 +4438,7 @@ class BarDataReader(DataReader):
     to_dataset.__doc__ = DataReader.to_dataset.__doc__
 
     @classmethod
+    @instrumented
     def from_dataset(cls, ds, *args, **kwargs):
         def v(s):
             return ('bars%i_' % ireader) + s
@@ -3451,7 +4474,145 @@ class BarDataReader(DataReader):
 
         return ret
 
+    def _get_bar_runs(self, arr):
+        """Get the start and end of the bars in an array
+
+        This method runs through the rows of `arr` and closes a bar when
+        the value drops to 0 (or NaN), when the value deviates more than
+        :attr:`tolerance` from the first value of the bar or (for rounded
+        bars) at a local minimum that is not an obstacle (see
+        :meth:`is_obstacle`). The breakpoints that do not depend on the
+        start of the bar are computed at once, the :attr:`tolerance` is
+        then checked for each bar only up to the next breakpoint.
+
+        Parameters
+        ----------
+        arr: np.ndarray
+            The array to find the bars in
+
+        Returns
+        -------
+        np.ndarray of ints
+            The start of each bar
+        np.ndarray of ints
+            The end of each bar (exclusive)"""
+        arr = np.asarray(arr)
+        nrows = len(arr) - 1
+        valid = ~(np.isnan(arr) | (arr == 0))
+        try:
+            first = np.where(valid)[0][0]
+        except IndexError:  # no data in here
+            return np.array([], dtype=int), np.array([], dtype=int)
+        # start of a new run of valid values
+        run_start = np.zeros_like(valid)
+        run_start[1:] = ~valid[:-1] & valid[1:]
+        # valid value preceded by a valid value
+        in_run = np.zeros_like(valid)
+        in_run[1:] = valid[:-1] & valid[1:]
+
+        breaks = np.zeros_like(valid)
+        # end of a run of valid values
+        breaks[1:] = valid[:-1] & ~valid[1:]
+        # the last row closes the bar
+        breaks[-1] |= valid[-1] & ~run_start[-1]
+        if self._rounded:
+            # the state is 1 for increasing and -1 for decreasing values
+            state = np.zeros(len(arr), dtype=int)
+            state[1:][in_run[1:]] = np.sign(np.diff(arr)[in_run[1:]])
+            # the previous non-zero state (defaults to increasing)
+            pos = np.where(state != 0, np.arange(len(arr)), -1)
+            pos = np.maximum.accumulate(pos)
+            last_state = np.ones(len(arr), dtype=int)
+            last_state[1:] = np.where(pos[:-1] >= 0, state[pos[:-1]], 1)
+            for i in np.where((state == 1) & (last_state == -1))[0]:
+                if i > first and not self.is_obstacle([i], arr):
+                    breaks[i] = True
+
+        events = np.where(breaks | run_start)[0]
+        events = events[events > first]
+        nevents = len(events)
+
+        tol = self.tolerance
+        starts = []
+        ends = []
+        start = first
+        start_val = arr[first]
+        k = 0
+        while True:
+            while k < nevents and events[k] <= start:
+                k += 1
+            stop = events[k] if k < nevents else nrows + 1
+            # look for a deviation from the start value before the next
+            # breakpoint, beginning with small windows
+            i = stop
+            lo = start + 1
+            window = 64
+            while lo < stop:
+                hi = min(stop, lo + window)
+                exceeds = in_run[lo:hi] & (
+                    np.abs(arr[lo:hi] - start_val) > tol)
+                if exceeds.any():
+                    i = lo + exceeds.argmax()
+                    break
+                lo = hi
+                window *= 4
+            if i > nrows:
+                break
+            if not run_start[i]:  # close the bar
+                starts.append(start)
+                ends.append(i + 1 if i == nrows else i)
+            start = i
+            start_val = arr[i]
+        return np.array(starts, dtype=int), np.array(ends, dtype=int)
+
+    @staticmethod
+    def _segment_max(arr, starts, ends):
+        """Get the maximum of `arr` within sorted and disjoint segments"""
+        if not len(starts):
+            return arr[:0]
+        indices = np.ravel(np.c_[starts, ends])
+        if indices[-1] >= len(arr):
+            indices = indices[:-1]
+        return np.maximum.reduceat(arr, indices)[::2]
+
+    @staticmethod
+    def _fill_bars(nrows, indices, values):
+        """Fill an array with the heights of the bars
+
+        Parameters
+        ----------
+        nrows: int
+            The length of the array
+        indices: list of list of ints
+            The start and end of each bar as returned by :meth:`get_bars`.
+            The end is included and if multiple bars overlap, the last one
+            wins
+        values: list of floats
+            The height of each bar
+
+        Returns
+        -------
+        np.ndarray
+            The array of length `nrows` with the bar heights and NaN
+            everywhere else"""
+        ret = np.full(nrows, np.nan)
+        if not len(indices):
+            return ret
+        indices = np.asarray(indices, dtype=int)
+        starts = np.minimum(indices[:, 0], nrows)
+        stops = np.minimum(indices[:, 1] + 1, nrows)
+        lengths = np.maximum(stops - starts, 0)
+        rows = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + \
+            np.arange(lengths.sum())
+        owner = np.full(nrows, -1)
+        np.maximum.at(owner, rows, np.repeat(np.arange(len(indices)),
+                                             lengths))
+        filled = owner >= 0
+        ret[filled] = np.asarray(values, dtype=float)[owner[filled]]
+        return ret
+
     @docstrings.get_sectionsf('BarDataReader.get_bars')
+    @instrumented
     def get_bars(self, arr, do_split=False):
         """Find the distinct bars in an array
 
@@ -3475,85 +4636,63 @@ class BarDataReader(DataReader):
             been splitted already
         """
 
-        def isnan_or_0(v):
-            return np.isnan(v) | (v == 0)
-
         def remove_too_short(val=None, fraction=None):
-            lengths = np.array(list(map(np.diff, all_indices)))
+            nonlocal starts, ends, heights
+            if not len(starts):
+                return
+            lengths = ends - starts
             if fraction:
                 val = fraction * np.median(lengths)
-            too_short = lengths < val
-
-            removed = 0
-            for i in np.where(too_short)[0]:
-                del all_indices[i - removed]
-                del heights[i - removed]
-                removed += 1
+            keep = ~(lengths < val)
+            starts, ends, heights = starts[keep], ends[keep], heights[keep]
 
         def split_too_long(val=None, fraction=None):
-            lengths = np.array(list(map(np.diff, all_indices)))
+            nonlocal starts, ends, heights
+            if not len(starts):
+                return
+            lengths = ends - starts
             median = np.median(lengths)
             rounded_median = np.round(median).astype(int)
             if fraction is not None:
                 val = fraction * median
             too_long = lengths > val
-            inserted = 0
-            to_split = np.where(too_long)[0]
-            for i in to_split:
-                indices = all_indices[i + inserted]
-                splitted.append(indices)
-                if not do_split:
-                    continue
-                ni = np.diff(indices)
-                nbars = np.ceil(ni / median).astype(int)
-                not_inserted = 0
-                del all_indices[i + inserted]
-                del heights[i + inserted]
-                for j in range(nbars-1, -1, -1):
-                    sub_indices = [indices[0] + j*rounded_median,
-                                   indices[0] + (j+1)*rounded_median]
-                    if np.diff(sub_indices):
-                        all_indices.insert(i + inserted, sub_indices)
-                        heights.insert(i + inserted,
-                                       arr[slice(*sub_indices)].max())
-                    else:
-                        not_inserted += 1
-                inserted += nbars - 1 - not_inserted
-
-        all_indices = []
-        heights = []
-        try:
-            last_start = np.where(~isnan_or_0(arr))[0][0]
-        except IndexError:  # no data in here
+            splitted.extend(map(list, zip(starts[too_long].tolist(),
+                                          ends[too_long].tolist())))
+            if not do_split or not too_long.any():
+                return
+            # replace every bar that is too long by `nbars` bars with the
+            # length of the median
+            nbars = np.where(too_long, np.ceil(lengths / median), 1).astype(
+                int)
+            if not rounded_median:
+                nbars[too_long] = 0
+            group_starts = np.cumsum(nbars) - nbars
+            offsets = np.arange(nbars.sum()) - np.repeat(group_starts, nbars)
+            new_split = np.repeat(too_long, nbars)
+            new_starts = np.repeat(starts, nbars)
+            new_ends = np.repeat(ends, nbars)
+            new_heights = np.repeat(heights, nbars)
+            nrows = len(arr)
+            new_starts[new_split] = np.minimum(
+                new_starts[new_split] + offsets[new_split] * rounded_median,
+                nrows)
+            new_ends[new_split] = np.minimum(
+                new_starts[new_split] + rounded_median, nrows)
+            # drop the empty pieces at the end of the array
+            keep = ~new_split | (new_ends > new_starts)
+            new_starts, new_ends, new_heights, new_split = (
+                new_starts[keep], new_ends[keep], new_heights[keep],
+                new_split[keep])
+            new_heights[new_split] = [
+                arr[i:j].max() for i, j in zip(new_starts[new_split],
+                                               new_ends[new_split])]
+            starts, ends, heights = new_starts, new_ends, new_heights
+
+        starts, ends = self._get_bar_runs(arr)
+        if not len(starts):
             return [], [], []
-        last_end = last_start
-        last_val = last_start_val = arr[last_end]
-        last_state = state = 1  #: state for increasing (1) or decreasing (-1)
-        nrows = len(arr) - 1
-        for i, value in enumerate(arr[last_start+1:], last_start + 1):
-            if not isnan_or_0(value) and not isnan_or_0(last_val):
-                state = np.sign(value - last_val)
-            else:
-                state = 0
-            if i == nrows:
-                last_end += 1
-            if isnan_or_0(last_val) and not isnan_or_0(value):
-                last_start = i
-                last_start_val = value
-            elif ((isnan_or_0(value) and not isnan_or_0(last_val)) or
-                  (self._rounded and state and state > last_state and
-                   not self.is_obstacle([i], arr)) or
-                  (np.abs(value - last_start_val) > self.tolerance) or
-                  (not isnan_or_0(value) and i == nrows)):
-                indices = [last_start, last_end + 1]
-                all_indices.append(indices)
-                heights.append(arr[slice(*indices)].max())
-                last_start = i
-                last_start_val = value
-            last_end = i
-            last_val = value
-            if state:
-                last_state = state
+        heights = self._segment_max(arr, starts, ends)
+
         # now we remove those indices, where we are way too short
         if self.min_len is not None:
             remove_too_short(self.min_len)
@@ -3565,48 +4704,78 @@ class BarDataReader(DataReader):
         split_too_long(fraction=1.7)
         # now we remove those indices, where we are way too short
         remove_too_short(fraction=0.4)
-        return all_indices, heights, splitted
+        all_indices = list(map(list, zip(starts.tolist(), ends.tolist())))
+        return all_indices, heights.tolist(), splitted
 
     docstrings.keep_params('BarDataReader.get_bars.parameters', 'do_split')
     docstrings.keep_params('DataReader.digitize.parameters', 'inplace')
 
     @docstrings.with_indent(8)
-    def digitize(self, do_split=False, inplace=True):
+    @instrumented
+    def digitize(self, do_split=False, inplace=True, incremental=False,
+                 max_workers=None):
         """Reimplemented to ignore the rows between the bars
 
         Parameters
         ----------
         %(BarDataReader.get_bars.parameters.do_split)s
         %(DataReader.digitize.parameters.inplace)s
+        %(DataReader.digitize.parameters.incremental)s
+        max_workers: int
+            The number of workers to process the columns in parallel. The
+            binary image is processed with threads, the bars with processes.
+            If None, the :attr:`max_workers` attribute is used
         """
-        df = super(BarDataReader, self).digitize(inplace=False)
+        max_workers = self._get_max_workers(max_workers)
+        vals, columns = self._digitize_values(
+            incremental=incremental, max_workers=max_workers, update=inplace)
+        df = pd.DataFrame(vals, columns=self.columns,
+                          index=np.arange(len(self.binary)))
         # now we only keep those values that are the same as their surroundings
         if inplace:
             self._full_df_orig = df.copy(True)
+        key = (bool(do_split), self.tolerance) + tuple(
+            None if val is None else np.ravel(val).tolist()
+            for val in [self.min_len, self.max_len])
+        if self._bars_cache is None or self._bars_cache[0] != key:
+            self._bars_cache = (key, {})
+        bars = self._bars_cache[1]
+        changed = set(df.columns[columns])
+        todo = [col for col in df.columns if col in changed or col not in bars]
+        if max_workers == 1:
+            results = [self.get_bars(df[col].values, do_split) for col in todo]
+        else:
+            settings = {attr: getattr(self, attr) for attr in [
+                'tolerance', 'min_len', 'max_len', '_rounded']}
+            results = map_parallel(
+                _get_bars_worker,
+                [(type(self), settings, df[col].values, do_split)
+                 for col in todo], max_workers, processes=True)
+        bars.update(zip(todo, results))
         self._all_indices = []
         self._splitted = {}
         for col in df.columns:
-            indices, values, splitted = self.get_bars(df[col].values,
-                                                      do_split)
-            self._all_indices.append(indices)
-            self._splitted[col] = splitted
-            df.loc[:, col] = np.nan
-            for (i, j), v in zip(indices, values):
-                df.loc[i:j, col] = v
+            indices, values, splitted = bars[col]
+            self._all_indices.append(list(map(list, indices)))
+            self._splitted[col] = list(map(list, splitted))
+            df[col] = self._fill_bars(len(df), indices, values)
         if inplace:
-            self.full_df = df
+            self._set_full_df_columns(df.values, columns)
         else:
             return df
 
-    def shift_vertical(self, pixels):
+    @instrumented
+    def shift_vertical(self, pixels, draw=True):
         """Shift the columns vertically.
 
         Parameters
         ----------
         pixels: list of floats
             The y-value for each column for which to shift the values. Note
-            that theses values have to be greater than or equal to 0"""
-        super(BarDataReader, self).shift_vertical(pixels)
+            that theses values have to be greater than or equal to 0
+        draw: bool
+            If True, the :attr:`ax` is drawn at the end"""
+        super(BarDataReader, self).shift_vertical(pixels, draw=draw)
         if not self._all_indices:
             return
         pixels = np.asarray(pixels)
@@ -3621,6 +4790,7 @@ class BarDataReader(DataReader):
                         l[j] = max(0, l[j] - pixel)
 
     @docstrings.dedent
+    @instrumented
     def find_potential_samples(self, col, min_len=None,
                                max_len=None, filter_func=None):
         """
@@ -18,6 +18,7 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program. If not, see <https://www.gnu.org/licenses/>.
 """
+import os
 import re
 import xarray as xr
 from PIL import ImageOps, Image
@@ -30,23 +31,334 @@ from psyplot.data import safe_list
 from functools import partial
 
 
-# check tesseract version and import tesserocr. If the tesseract version
-# is 4.0.*, then we have to locale.setlocale(locale.LC_ALL, 'C')
-# (see https://github.com/sirfz/tesserocr/issues/137)
-try:
-    tesseract_version = spr.check_output('tesseract --version'.split())
-except FileNotFoundError:
-    tesseract_version = tesserocr = None
-else:
-    tesseract_version = re.findall(
-        '\d+\.\d+\.*', tesseract_version.decode('utf-8'))[0]
-    if tesseract_version.startswith('4.0.'):
+#: The :mod:`tesserocr` module. This is None if it is not installed or if it
+#: has not yet been loaded via :func:`_load_tesserocr`
+tesserocr = None
+
+#: The version of tesseract. This is None if it is not installed or if it
+#: has not yet been loaded via :func:`_load_tesserocr`
+tesseract_version = None
+
+#: True, if the :func:`_load_tesserocr` function has been called
+_tesserocr_loaded = False
+
+
+def _load_tesserocr():
+    """Check the tesseract version and import tesserocr
+
+    This function sets the :attr:`tesserocr` and :attr:`tesseract_version`
+    attributes of this module on its first call, such that the tesseract
+    executable is only called when the column names are recognized. If the
+    tesseract version is 4.0.*, then we have to
+    ``locale.setlocale(locale.LC_ALL, 'C')``
+    (see https://github.com/sirfz/tesserocr/issues/137)
+
+    Returns
+    -------
+    module or None
+        The tesserocr module or None, if it is not installed"""
+    global tesseract_version, tesserocr, _tesserocr_loaded
+    if _tesserocr_loaded:
+        return tesserocr
+    _tesserocr_loaded = True
+    try:
+        version = spr.check_output('tesseract --version'.split())
+    except FileNotFoundError:
+        return None
+    version = re.findall('\d+\.\d+\.*', version.decode('utf-8'))[0]
+    if version.startswith('4.0.'):
         import locale
         locale.setlocale(locale.LC_ALL, 'C')
     try:
-        import tesserocr
+        import tesserocr as module
     except ImportError:
-        tesserocr = None
+        module = None
+    tesseract_version, tesserocr = version, module
+    return module
+
+
+#: The number of threads for the text recognition. If 0, the number of
+#: processors is used
+max_workers = 0
+
+#: The maximal number of recognized texts in the :class:`OCRCache`
+OCR_CACHE_SIZE = 1024
+
+
+def ocr_key(image, **config):
+    """Compute the key of an image for the :class:`OCRCache`
+
+    Parameters
+    ----------
+    image: PIL.Image.Image
+        The (preprocessed) image that is passed to tesseract
+    ``**config``
+        The configuration of the tesseract API (e.g. the `lang`)
+
+    Returns
+    -------
+    str
+        The hexadecimal SHA1 hash of the pixels of the `image`, the tesseract
+        version and the `config`"""
+    import hashlib
+    h = hashlib.sha1()
+    _load_tesserocr()
+    config['version'] = tesseract_version
+    h.update(repr((image.mode, image.size, sorted(config.items()))).encode())
+    h.update(image.tobytes())
+    return h.hexdigest()
+
+
+class OCRCache(object):
+    """A least-recently-used cache for the texts recognized by tesseract
+
+    The cache maps the :func:`ocr_key` of an image to the raw text that has
+    been recognized by tesseract. It keeps at most :attr:`maxsize` texts in
+    memory and optionally stores them as text files in the :attr:`cache_dir`
+    such that they are available in later sessions. Texts that are not found
+    in this cache are looked up in the :attr:`parent` cache."""
+
+    #: The maximal number of texts in memory
+    maxsize = OCR_CACHE_SIZE
+
+    #: The directory where to store the texts on disk. If None, they are only
+    #: kept in memory
+    cache_dir = None
+
+    #: Another :class:`OCRCache` that is used if a text is not found in this
+    #: one
+    parent = None
+
+    def __init__(self, maxsize=None, cache_dir=None, parent=None):
+        """
+        Parameters
+        ----------
+        maxsize: int
+            The maximal number of texts in memory. If None, the
+            :attr:`OCR_CACHE_SIZE` is used
+        cache_dir: str
+            The directory where to store the texts on disk
+        parent: OCRCache
+            Another cache that is used if a text is not found in this one and
+            that is updated with new texts"""
+        from collections import OrderedDict
+        self.maxsize = OCR_CACHE_SIZE if maxsize is None else maxsize
+        self.cache_dir = cache_dir
+        self.parent = parent
+        self._texts = OrderedDict()
+
+    def __len__(self):
+        return len(self._texts)
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def _fname(self, key):
+        return os.path.join(self.cache_dir, key + '.txt')
+
+    def get(self, key, default=None):
+        """Get the text of the image with the given `key`
+
+        Parameters
+        ----------
+        key: str
+            The :func:`ocr_key` of the image
+        default: object
+            The value to return if the text is not in the cache
+
+        Returns
+        -------
+        str
+            The recognized text or `default`"""
+        texts = self._texts
+        if key in texts:
+            texts.move_to_end(key)
+            return texts[key]
+        text = None
+        if self.cache_dir is not None and os.path.exists(self._fname(key)):
+            with open(self._fname(key), encoding='utf-8') as f:
+                text = f.read()
+        elif self.parent is not None:
+            text = self.parent.get(key)
+        if text is None:
+            return default
+        self._add(key, text)
+        return text
+
+    def _add(self, key, text):
+        texts = self._texts
+        texts[key] = text
+        texts.move_to_end(key)
+        while len(texts) > self.maxsize:
+            texts.popitem(last=False)
+
+    def __setitem__(self, key, text):
+        self._add(key, text)
+        if self.cache_dir is not None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(self._fname(key), 'w', encoding='utf-8') as f:
+                f.write(text)
+        if self.parent is not None:
+            self.parent[key] = text
+
+    def items(self):
+        """The keys and texts in memory (from the least recently used)"""
+        return list(self._texts.items())
+
+    def update(self, items):
+        """Insert multiple texts into the memory of the cache
+
+        Parameters
+        ----------
+        items: list of tuples ``(key, text)``
+            The keys and texts to insert"""
+        for key, text in items:
+            self._add(key, text)
+
+    def clear(self):
+        """Remove all texts from memory (but not from the :attr:`cache_dir`)
+        """
+        self._texts.clear()
+
+
+#: The :class:`OCRCache` that is shared by all :class:`ColNamesReader`
+#: instances. Set its :attr:`~OCRCache.cache_dir` to keep the texts in
+#: between sessions
+ocr_cache = OCRCache()
+
+
+class OCRPool(object):
+    """A pool of tesseract APIs to recognize the text in many images
+
+    Creating a :class:`tesserocr.PyTessBaseAPI` initializes tesseract which
+    takes much longer than the recognition of a small image. This class
+    therefore keeps a fixed number of initialized APIs that are shared by the
+    threads of a :class:`concurrent.futures.ThreadPoolExecutor` (tesserocr
+    releases the GIL during the recognition).
+
+    The pool can be used as a context manager that closes the APIs at exit::
+
+        with OCRPool() as pool:
+            texts = pool.map(images)
+
+    If a :attr:`cache` is given, tesseract is only called for images that
+    are not already in the cache."""
+
+    #: The number of threads and APIs
+    workers = 1
+
+    #: The :class:`OCRCache` for the recognized texts
+    cache = None
+
+    def __init__(self, workers=None, cache=None, **kwargs):
+        """
+        Parameters
+        ----------
+        workers: int
+            The number of threads and tesseract APIs. If None, the
+            :attr:`max_workers` are used
+        cache: OCRCache
+            The cache for the recognized texts
+        ``**kwargs``
+            Any other keyword argument for the
+            :class:`tesserocr.PyTessBaseAPI`, e.g. the `lang`"""
+        from queue import Queue
+        from threading import Lock
+        if workers is None:
+            workers = max_workers
+        self.workers = int(workers or os.cpu_count() or 1)
+        self.cache = cache
+        self.api_kws = kwargs
+        self._apis = []
+        self._queue = Queue()
+        self._lock = Lock()
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _get_api(self):
+        """Get an API from the queue or create a new one"""
+        # the lock makes sure that we never create more than `workers` APIs
+        with self._lock:
+            if self._queue.empty() and len(self._apis) < self.workers:
+                tesserocr = _load_tesserocr()
+                if tesserocr is None:
+                    raise ImportError("tesserocr module not found!")
+                api = tesserocr.PyTessBaseAPI(**self.api_kws)
+                self._apis.append(api)
+                return api
+        return self._queue.get()
+
+    def recognize(self, image):
+        """Recognize the text in one image with one of the APIs
+
+        Parameters
+        ----------
+        image: PIL.Image.Image
+            The image to read in
+
+        Returns
+        -------
+        str
+            The recognized text"""
+        if image.mode == 'RGBA':
+            image = rgba2rgb(image)
+        api = self._get_api()
+        try:
+            api.SetImage(image)
+            return api.GetUTF8Text()
+        finally:
+            api.Clear()
+            self._queue.put(api)
+
+    def map(self, images):
+        """Recognize the text in multiple images in parallel
+
+        Parameters
+        ----------
+        images: list of PIL.Image.Image
+            The images to read in
+
+        Returns
+        -------
+        list of str
+            The recognized texts in the same order as `images`"""
+        images = [rgba2rgb(image) if image.mode == 'RGBA' else image
+                  for image in images]
+        cache = self.cache
+        if cache is None:
+            return self._recognize_all(images)
+        keys = [ocr_key(image, **self.api_kws) for image in images]
+        texts = [cache.get(key) for key in keys]
+        missing = [i for i, text in enumerate(texts) if text is None]
+        new = self._recognize_all([images[i] for i in missing])
+        for i, text in zip(missing, new):
+            texts[i] = cache[keys[i]] = text
+        return texts
+
+    def _recognize_all(self, images):
+        """Recognize the text in the given images in the threads"""
+        if self.workers == 1 or len(images) < 2:
+            return list(map(self.recognize, images))
+        if self._executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._executor = ThreadPoolExecutor(self.workers)
+        return list(self._executor.map(self.recognize, images))
+
+    def close(self):
+        """Shut down the threads and end the tesseract APIs"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        for api in self._apis:
+            api.End()
+        self._apis.clear()
+        while not self._queue.empty():
+            self._queue.get()
 
 
 _Bbox = namedtuple('_Bbox', tuple('xywh'))
@@ -136,6 +448,146 @@ class Bbox(_Bbox):
         return cls(**d)
 
 
+def column_overlaps(bounds, xranges):
+    """Compute the horizontal overlap of ranges with the columns
+
+    The columns that intersect with each range are looked up in the sorted
+    column boundaries, such that only their overlap is computed.
+
+    Parameters
+    ----------
+    bounds: np.ndarray of shape ``(C, 2)``
+        The start and end of each column
+    xranges: np.ndarray of shape ``(N, 2)``
+        The minimal and maximal x-coordinate of each range
+
+    Returns
+    -------
+    np.ndarray of shape ``(N, C)``
+        The length of the overlap of every range with every column"""
+    bounds = np.asarray(bounds, dtype=float).reshape((-1, 2))
+    xranges = np.asarray(xranges, dtype=float).reshape((-1, 2))
+    ret = np.zeros((len(xranges), len(bounds)))
+    if not len(bounds):
+        return ret
+    order = np.argsort(bounds[:, 0], kind='stable')
+    starts = bounds[order, 0]
+    # the maximal end up to each column is sorted, too
+    ends = np.maximum.accumulate(bounds[order, 1])
+    first = np.searchsorted(ends, xranges[:, 0], 'right')
+    last = np.searchsorted(starts, xranges[:, 1], 'left')
+    for i, (xmin, xmax) in enumerate(xranges):
+        cols = order[first[i]:last[i]]
+        if len(cols):
+            s, e = bounds[cols].T
+            ret[i, cols] = np.maximum(
+                np.minimum(e, xmax) - np.maximum(s, xmin), 0)
+    return ret
+
+
+def close_box_pairs(boxes, max_distance):
+    """Find the boxes that overlap horizontally and are vertically close
+
+    Two boxes are close, if the top of one box is less than `max_distance`
+    away from the bottom of the other. The candidates are looked up in the
+    sorted top and bottom edges of the boxes.
+
+    Parameters
+    ----------
+    boxes: list of Bbox
+        The boxes
+    max_distance: float
+        The maximal vertical distance
+
+    Returns
+    -------
+    np.ndarray of shape ``(2, M)``
+        The indices of the pairs of close boxes"""
+    arr = np.asarray(boxes, dtype=float).reshape((-1, 4))
+    left, top = arr[:, 0], arr[:, 1]
+    right, bottom = left + arr[:, 2], top + arr[:, 3]
+    ret = [np.zeros((2, 0), dtype=int)]
+    for edge, other in [(top, bottom), (bottom, top)]:
+        order = np.argsort(other, kind='stable')
+        other = other[order]
+        first = np.searchsorted(other, edge - max_distance, 'left')
+        last = np.searchsorted(other, edge + max_distance, 'right')
+        for i in range(len(arr)):
+            js = order[first[i]:last[i]]
+            js = js[(js != i) & (left[i] <= right[js]) &
+                    (right[i] >= left[js])]
+            ret.append(np.vstack([np.full_like(js, i), js]))
+    return np.concatenate(ret, axis=1)
+
+
+def merge_text_boxes(boxes, texts, bounds, get_xranges, max_distance):
+    """Merge the text boxes that belong to the same column name
+
+    Two boxes are merged if they overlap horizontally, are vertically closer
+    than `max_distance` (see :func:`close_box_pairs`) and if one of them
+    overlaps with the column that has the largest overlap with the other one.
+    Connected boxes are merged with a union-find and the merging is repeated
+    with the merged boxes until no more boxes can be merged.
+
+    Parameters
+    ----------
+    boxes: list of Bbox
+        The boxes of the text lines
+    texts: list of str
+        The text in each box
+    bounds: np.ndarray of shape ``(C, 2)``
+        The start and end of each column
+    get_xranges: callable
+        A function that takes a list of boxes and returns an array of shape
+        ``(N, 2)`` with the horizontal range of each box in the coordinate
+        system of the `bounds`
+    max_distance: float
+        The maximal vertical distance between two boxes
+
+    Returns
+    -------
+    list of Bbox
+        The merged boxes. Boxes that have not been merged come first
+    list of str
+        The texts of the merged boxes, concatenated in the order of the
+        original boxes
+    np.ndarray of shape ``(N, C)``
+        The overlap of the merged boxes with the columns (see
+        :func:`column_overlaps`)"""
+    from straditize.labeling import union_find
+    boxes = list(boxes)
+    texts = list(texts)
+    while True:
+        overlaps = column_overlaps(bounds, get_xranges(boxes))
+        cols = overlaps.argmax(axis=1)
+        pairs = close_box_pairs(boxes, max_distance)
+        i, j = pairs
+        pairs = pairs[:, (overlaps[j, cols[i]] > 0) |
+                      (overlaps[i, cols[j]] > 0)]
+        if not pairs.size:
+            return boxes, texts, overlaps
+        groups = {}
+        for i, root in enumerate(union_find(len(boxes), pairs)):
+            groups.setdefault(root, []).append(i)
+        new_boxes, new_texts = [], []
+        merged_boxes, merged_texts = [], []
+        for members in groups.values():
+            if len(members) == 1:
+                new_boxes.append(boxes[members[0]])
+                new_texts.append(texts[members[0]])
+                continue
+            text = texts[members[0]]
+            for i in members[1:]:
+                text += ('' if text.endswith('-') else ' ') + texts[i]
+            arr = np.array([boxes[i] for i in members])
+            x0, y0 = arr[:, :2].min(axis=0).tolist()
+            x1, y1 = (arr[:, :2] + arr[:, 2:]).max(axis=0).tolist()
+            merged_boxes.append(Bbox(x0, y0, x1 - x0, y1 - y0))
+            merged_texts.append(text)
+        boxes = new_boxes + merged_boxes
+        texts = new_texts + merged_texts
+
+
 class ColNamesReader(object):
     """A class to recognize the text in an image
 
@@ -160,6 +612,11 @@ class ColNamesReader(object):
     #: :attr:`highres_image` if the :attr:`ignore_data_part` is True
     data_ylim = None
 
+    #: The :class:`OCRCache` for the texts recognized by this reader. It uses
+    #: the module-level :attr:`ocr_cache` as parent and is saved in the
+    #: project file
+    ocr_cache = None
+
     @property
     def highres_image(self):
         """The :attr:`image` attribute with higher resolution and with masked
@@ -169,11 +626,17 @@ class ColNamesReader(object):
         ret = (self.image if self._highres_image is None else
                self._highres_image)
         if self.data_ylim is not None and self.ignore_data_part:
-            arr = np.array(ret)
-            ylim = self.data_ylim * ret.size[1] / self.image.size[1]
-            arr[slice(*ylim.astype(int)), :, :-1] = 255
-            arr[slice(*ylim.astype(int)), :, -1] = 0
-            ret = Image.fromarray(arr)
+            ylim = np.asarray(self.data_ylim) * ret.size[1] / \
+                self.image.size[1]
+            ylim = tuple(ylim.astype(int).tolist())
+
+            def mask_data_part():
+                arr = np.array(ret)
+                arr[slice(*ylim), :, :-1] = 255
+                arr[slice(*ylim), :, -1] = 0
+                return Image.fromarray(arr)
+
+            ret = self._cached('highres', (ret, ylim), mask_data_part)
         return ret
 
     @highres_image.setter
@@ -186,6 +649,50 @@ class ColNamesReader(object):
 
     _highres_image = None
 
+    #: A mapping from name to the key, the sources and the value of the
+    #: transformed images that are cached by the :meth:`_cached` method
+    _image_cache = None
+
+    def _cached(self, name, sources, func):
+        """Get a transformed image from the cache or compute it
+
+        The cached value is reused as long as the `sources` did not change.
+        Images in the `sources` are compared by identity, all other objects
+        by equality.
+
+        Parameters
+        ----------
+        name: str
+            The name of the cached value
+        sources: tuple
+            The images and parameters that `func` depends on
+        func: callable
+            The function (without arguments) to compute the value
+
+        Returns
+        -------
+        object
+            The value returned by `func`. It must not be modified inplace"""
+        key = tuple(id(obj) if isinstance(obj, Image.Image) else obj
+                    for obj in sources)
+        if self._image_cache is None:
+            self._image_cache = {}
+        try:
+            old_key, old_sources, ret = self._image_cache[name]
+        except KeyError:
+            pass
+        else:
+            if old_key == key:
+                return ret
+        ret = func()
+        # we keep the sources to make sure that their ids are not reused
+        self._image_cache[name] = (key, sources, ret)
+        return ret
+
+    def _transform_params(self):
+        """The parameters for the :meth:`rotate_image` method"""
+        return float(self.rotate), bool(self.mirror), bool(self.flip)
+
     @property
     def column_names(self):
         """The names of the columns"""
@@ -218,7 +725,56 @@ class ColNamesReader(object):
     def rotated_image(self):
         """The rotated :attr:`image` based on the :meth:`rotate_image` method
         """
-        return self.rotate_image(self.image)
+        image = self.image
+        return self._cached(
+            'rotated', (image, ) + self._transform_params(),
+            partial(self.rotate_image, image))
+
+    @property
+    def rotated_highres_image(self):
+        """The rotated :attr:`highres_image` based on the :meth:`rotate_image`
+        method"""
+        image = self.highres_image
+        return self._cached(
+            'rotated_highres', (image, ) + self._transform_params(),
+            partial(self.rotate_image, image))
+
+    def rotated_preview(self, max_size=None):
+        """Get a downsampled version of the :attr:`rotated_image`
+
+        The preview is rotated from a level of the
+        :class:`~straditize.image_io.ImagePyramid` of the :attr:`image`, such
+        that changing the :attr:`rotate`, :attr:`mirror` and :attr:`flip`
+        attributes is fast for large images.
+
+        Parameters
+        ----------
+        max_size: float
+            The maximal number of pixels of the preview. If None, the
+            :attr:`straditize.image_io.MAX_DISPLAY_SIZE` is used
+
+        Returns
+        -------
+        PIL.Image.Image
+            The rotated preview. If the :attr:`image` is smaller than
+            `max_size`, this is the :attr:`rotated_image`
+        float
+            The factor to multiply the size of the preview with to get the
+            size of the :attr:`rotated_image`"""
+        import straditize.image_io as image_io
+        image = self.image
+        if max_size is None:
+            max_size = image_io.MAX_DISPLAY_SIZE
+        if image.size[0] * image.size[1] <= max_size:
+            return self.rotated_image, 1
+        pyramid = self._cached(
+            'pyramid', (image, ),
+            lambda: image_io.ImagePyramid(np.asarray(image), min_size=256))
+        level = pyramid.level_for_size(max_size)
+        preview = self._cached(
+            'rotated_preview', (image, level) + self._transform_params(),
+            lambda: self.rotate_image(Image.fromarray(pyramid[level])))
+        return preview, 2 ** level
 
     def __init__(self, image, bounds, rotate=45, mirror=False, flip=False,
                  highres_image=None, data_ylim=None):
@@ -272,6 +828,7 @@ class ColNamesReader(object):
         self.data_ylim = None if data_ylim is None else np.asarray(data_ylim)
         self._column_names = []
         self._colpics = []
+        self.ocr_cache = OCRCache(parent=ocr_cache)
 
     def __reduce__(self):
         return (
@@ -287,6 +844,7 @@ class ColNamesReader(object):
         """Close the column names reader"""
         self._colpics.clear()
         self._column_names.clear()
+        self._image_cache = None
         self.image.close()
         del self.image
         if self._highres_image is not None:
@@ -323,6 +881,12 @@ class ColNamesReader(object):
         'flip_colnames': {
             'dims': (),
             'long_name': "Flip the column names picture (vertically)"},
+        'ocr_key': {
+            'dims': 'ocr_entry',
+            'long_name': 'The hashes of the images in the OCR cache'},
+        'ocr_text': {
+            'dims': 'ocr_entry',
+            'long_name': 'The texts in the OCR cache'},
         }
 
     def create_variable(self, ds, vname, data, **kwargs):
@@ -356,7 +920,7 @@ class ColNamesReader(object):
             The part of the rotated :attr:`highres_image` cropped out from the
             given parameters"""
         hr = self.highres_image
-        image = self.rotate_image(hr)
+        image = self.rotated_highres_image
         xs_hr, ys_hr = hr.size
         xs, ys = self.image.size
         x01, y01 = self.transform_point(x0, y0, invert=True)
@@ -401,6 +965,10 @@ class ColNamesReader(object):
             for i, (pic, (ys, xs)) in enumerate(zip(self.colpics, extents)):
                 colpics[i, :ys, :xs, :] = np.asarray(pic)
             self.create_variable(ds, 'colpic', colpics)
+        if len(self.ocr_cache):
+            keys, texts = zip(*self.ocr_cache.items())
+            self.create_variable(ds, 'ocr_key', list(keys))
+            self.create_variable(ds, 'ocr_text', list(texts))
         return ds
 
     @classmethod
@@ -428,6 +996,9 @@ class ColNamesReader(object):
                                          ds['colpic_extents'].values)]
         if 'data_lims' in ds:
             ret.data_ylim = ds['data_lims'].sel(axis='y').values
+        if 'ocr_key' in ds:
+            ret.ocr_cache.update(zip(ds['ocr_key'].values.tolist(),
+                                     ds['ocr_text'].values.tolist()))
         return ret
 
     def transform_point(self, x, y, invert=False, image=None):
@@ -456,22 +1027,47 @@ class ColNamesReader(object):
         float
             The transformed `y`-coordinate
         """
+        return tuple(self.transform_points([[x, y]], invert, image)[0])
+
+    def transform_points(self, points, invert=False, image=None):
+        """Transform multiple points between un-rotated and rotated coordinates
+
+        Parameters
+        ----------
+        points: np.ndarray of shape ``(N, 2)``
+            The x- and y-coordinates of the points in the source coordinate
+            system
+        invert: bool
+            If True, the source coordinate system is the rotated one (see
+            :meth:`transform_point`)
+        image: PIL.Image.Image
+            The unrotated source image. If None, the :attr:`image` is used
+
+        Returns
+        -------
+        np.ndarray of shape ``(N, 2)``
+            The transformed points
+
+        See Also
+        --------
+        transform_point: To transform one point"""
         import matplotlib.transforms as mt
         angle = np.deg2rad(self.rotate)
         if image is None:
             image = self.image
         xs, ys = image.size
         trans = mt.Affine2D().rotate(angle).translate(ys*np.sin(angle), 0)
+        points = np.array(points, dtype=float).reshape((-1, 2))
         if invert:
-            x, y = trans.inverted().transform_point([x, y])
+            points = trans.inverted().transform(points)
         if self.mirror:
-            x = xs - x
+            points[:, 0] = xs - points[:, 0]
         if self.flip:
-            y = ys - y
+            points[:, 1] = ys - points[:, 1]
         if invert:
-            return x, y
+            return points
         else:
-            return trans.transform_point([x, y])
+            return trans.transform(points)
 
     def navigate_to_col(self, col, ax):
         """Navigate to the specified column
@@ -557,7 +1153,7 @@ class ColNamesReader(object):
         """Recognize the text in an image using tesserocr
 
         This method uses the :func:`tesserocr.image_to_text` to read in the
-        text in a given `image`
+        text in a given `image`. The result is stored in the :attr:`ocr_cache`
 
         Parameters
         ----------
@@ -567,14 +1163,49 @@ class ColNamesReader(object):
         Returns
         -------
         str
-            The text found in it without newline characters"""
+            The text found in it without newline characters
+
+        See Also
+        --------
+        recognize_texts: To read in many images at once"""
+        tesserocr = _load_tesserocr()
         if tesserocr is None:
             raise ImportError("tesserocr module not found!")
 
         if image.mode == 'RGBA':
             image = rgba2rgb(image)
 
-        return tesserocr.image_to_text(image).strip().replace('\n', ' ')
+        key = ocr_key(image)
+        text = self.ocr_cache.get(key)
+        if text is None:
+            text = self.ocr_cache[key] = tesserocr.image_to_text(image)
+        return text.strip().replace('\n', ' ')
+
+    def recognize_texts(self, images, pool=None):
+        """Recognize the text in multiple images in parallel
+
+        Parameters
+        ----------
+        images: list of PIL.Image.Image
+            The images to read in
+        pool: OCRPool
+            The pool of tesseract APIs to use. If None, a new
+            :class:`OCRPool` with the :attr:`ocr_cache` is created and closed
+            afterwards
+
+        Returns
+        -------
+        list of str
+            The texts found in the `images` (in the same order) without
+            newline characters
+
+        See Also
+        --------
+        recognize_text: To read in a single image"""
+        if pool is None:
+            with OCRPool(cache=self.ocr_cache) as pool:
+                return self.recognize_texts(images, pool)
+        return [text.strip().replace('\n', ' ') for text in pool.map(images)]
 
     def find_colnames(self, extents=None):
         """Find the names for the columns using tesserocr
@@ -596,29 +1227,24 @@ class ColNamesReader(object):
             A mapping from column number to a :class:`Bbox` (the bounding box
             of the corresponding column name)"""
 
-        def get_overlap(col, box):
-            s, e = bounds[col]
-            x0, y0 = extents[:2]
-            xmin = self.transform_point(
-                box.x0 + x0, box.y0 + y0, invert=True, image=hr)[0]
-            xmax = self.transform_point(
-                box.x0 + x0, box.y1 + y0, invert=True, image=hr)[0]
-            xmin, xmax = sorted([xmin, xmax])
-            return max(min(e, xmax) - max(s, xmin), 0)
-
-        def vbox_distance(b1, b2):
-            if b1.left > b2.right or b1.right < b2.left:
-                return np.inf  # no overlap
-            return min(abs(b1.top - b2.bottom), abs(b2.top - b1.bottom))
-
+        def get_xranges(boxes):
+            # the horizontal range of the left edge of the boxes in the
+            # unrotated image
+            arr = np.asarray(boxes, dtype=float).reshape((-1, 4))
+            x = arr[:, 0] + x0
+            points = np.r_[np.c_[x, arr[:, 1] + arr[:, 3] + y0],
+                           np.c_[x, arr[:, 1] + y0]]
+            xs = self.transform_points(points, invert=True, image=hr)[:, 0]
+            return np.sort(xs.reshape((2, -1)).T, axis=1)
+
+        tesserocr = _load_tesserocr()
         if tesserocr is None:
             raise ImportError("tesserocr module not found!")
 
         bounds = self.column_bounds
-        cols = list(range(len(bounds)))
         rotated = self.rotated_image
         hr = self.highres_image
-        rotated_hr = self.rotate_image(hr)
+        rotated_hr = self.rotated_highres_image
         fx, fy = np.round(
             np.array(rotated_hr.size) / rotated.size).astype(int)
         bounds = bounds * fx
@@ -631,10 +1257,7 @@ class ColNamesReader(object):
             extents[::2] *= fx
             extents[1::2] *= fy
             image = rotated_hr.crop(extents)
-
-            x0, y0 = self.transform_point(
-                *extents[:2], image=hr,
-                invert=True)
+            x0, y0 = extents[:2]
 
         if tesseract_version.startswith('4.0.'):
             # LC_ALL might have been changed by some other module, so we set
@@ -645,56 +1268,51 @@ class ColNamesReader(object):
         with tesserocr.PyTessBaseAPI() as api:
             api.SetImage(rgba2rgb(image))
             im_boxes = api.GetComponentImages(tesserocr.RIL.TEXTLINE, True)
-            texts = {}
-            images = {}
-            for i, (im, d, _, _) in enumerate(im_boxes):
-                box = Bbox(**d)
-                if not any(get_overlap(col, box) for col in cols):
-                    continue
-                # expand the image to improve text recognition
-                im = ImageOps.expand(rgba2rgb(image.crop(box.crop_extents)),
-                                     int(im.size[1] / 2.), (255, 255, 255))
-                text = tesserocr.image_to_text(im).strip()
-                if len(text) >= 3:
-                    texts[box] = text
-                    images[box] = im.convert('RGBA')
+        line_boxes = [Bbox(**d) for im, d, _, _ in im_boxes]
+        overlaps = column_overlaps(bounds, get_xranges(line_boxes))
+        boxes = []
+        crops = []
+        for (im, d, _, _), box, valid in zip(
+                im_boxes, line_boxes, overlaps.any(axis=1)):
+            if not valid:
+                continue
+            # expand the image to improve text recognition
+            boxes.append(box)
+            crops.append(ImageOps.expand(
+                rgba2rgb(image.crop(box.crop_extents)),
+                int(im.size[1] / 2.), (255, 255, 255)))
+        with OCRPool(cache=self.ocr_cache) as pool:
+            ocr_texts = pool.map(crops)
+        texts = []
+        images = {}
+        found = []
+        for box, im, text in zip(boxes, crops, ocr_texts):
+            text = text.strip()
+            if len(text) >= 3:
+                found.append(box)
+                texts.append(text)
+                images[box] = im.convert('RGBA')
+        boxes = found
 
         if not texts:
             return {}, {}, {}
 
         # merge boxes that are closer than one 1em
-        em = min(b.h for b in texts)
-        merged = {None}
-        while merged:
-            merged = set()
-            for b1, t in list(texts.items()):
-                if b1 in merged:
-                    continue
-                col = max(cols, key=partial(get_overlap, box=b1))
-                for b2, t in list(texts.items()):
-                    if (b1 is b2 or b2 in merged or not get_overlap(col, b2) or
-                            vbox_distance(b1, b2) > 0.5*em):
-                        continue
-                    merged.update([b1, b2])
-                    box = Bbox(min(b1.x, b2.x), min(b1.y, b2.y),
-                               max(b1.x1, b2.x1) - min(b1.x0, b2.x0),
-                               max(b1.y0, b2.y0) - min(b1.y1, b2.y1))
-                    texts[box] = texts[b1] + (
-                        ' ' if not texts[b1].endswith('-') else '') + texts[b2]
-                    images[box] = image.crop(box.crop_extents)
-                    b1 = box
-            for b in merged:
-                del texts[b], images[b]
-
-        # get a mapping from box to column from the overlap
-        boxes = dict(filter(
-            lambda t: get_overlap(*t),
-            ((col, max(texts, key=partial(get_overlap, col)))
-             for col in range(len(bounds)))))
-        x0, y0 = extents[:2]
+        em = min(b.h for b in boxes)
+        boxes, texts, overlaps = merge_text_boxes(
+            boxes, texts, bounds, get_xranges, 0.5 * em)
+
+        # get a mapping from column to box from the overlap
+        best = overlaps.argmax(axis=0)
+        cols = [col for col, i in enumerate(best) if overlaps[i, col]]
+
+        def get_image(box):
+            if box not in images:
+                images[box] = image.crop(box.crop_extents)
+            return images[box]
 
         return (
-            {col: texts[box] for col, box in boxes.items()},
-            {col: images[box] for col, box in boxes.items()},
+            {col: texts[best[col]] for col in cols},
+            {col: get_image(boxes[best[col]]) for col in cols},
             {col: Bbox((x0 + b.x0) / fx, (y0 + b.y) / fy, b.w / fx, b.h / fy)
-             for col, b in boxes.items()})
+             for col, b in ((col, boxes[best[col]]) for col in cols)})
@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+"""Level-of-detail display of large images
+
+This module defines the :class:`PyramidImage`, a matplotlib image that keeps
+an :class:`~straditize.image_io.ImagePyramid` of its data. At every draw, it
+only resamples the visible part of the pyramid level that matches the
+resolution of the screen. Changes of the data via :meth:`PyramidImage.set_data`
+(or ``set_array``) only update the tiles of the pyramid that changed.
+
+Use the :func:`imshow` function to plot an image that is displayed with a
+:class:`PyramidImage` if it is large enough.
+
+**Disclaimer**
+
+Copyright (C) 2018-2019  Philipp S. Sommer
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+import numpy as np
+import matplotlib as mpl
+from matplotlib.image import AxesImage
+from matplotlib.transforms import Bbox, TransformedBbox
+import straditize.image_io as image_io
+
+
+#: The size of the tiles (in pixels of the full resolution image) that are
+#: compared to find the changed parts of the image in
+#: :meth:`PyramidImage.set_data`
+TILE_SIZE = 256
+
+
+def changed_tiles(old, new, tile_size=None):
+    """Find the tiles that differ between two arrays
+
+    Parameters
+    ----------
+    old: np.ndarray
+        The old array
+    new: np.ndarray
+        The new array with the same shape as `old`
+    tile_size: int
+        The size of the tiles. If None, the :attr:`TILE_SIZE` is used
+
+    Returns
+    -------
+    np.ndarray of dtype bool
+        A 2D array that is True for every tile that changed"""
+    tile_size = tile_size or TILE_SIZE
+    changed = old != new
+    if changed.ndim == 3:
+        changed = changed.any(axis=-1)
+    nrows, ncols = changed.shape
+    ny = -(-nrows // tile_size)
+    nx = -(-ncols // tile_size)
+    changed = np.pad(changed, [(0, ny * tile_size - nrows),
+                               (0, nx * tile_size - ncols)])
+    return changed.reshape((ny, tile_size, nx, tile_size)).any(axis=(1, 3))
+
+
+class PyramidImage(AxesImage):
+    """An image that displays the suitable level of an image pyramid
+
+    This class is a :class:`matplotlib.image.AxesImage` that keeps an
+    :class:`~straditize.image_io.ImagePyramid` of its data. When drawing the
+    image, only the visible part of the pyramid level with about one pixel per
+    screen pixel is resampled."""
+
+    #: The :class:`straditize.image_io.ImagePyramid` of the data
+    pyramid = None
+
+    #: The pyramid level that has been used for the last draw
+    level = 0
+
+    #: The minimal size of the pyramid levels
+    min_size = 512
+
+    def __init__(self, ax, *args, **kwargs):
+        """
+        Parameters
+        ----------
+        ax: matplotlib.axes.Axes
+            The axes to plot on
+        pyramid: straditize.image_io.ImagePyramid
+            The pyramid of the data. If given, the first level of the pyramid
+            is used as the data without copying it
+        min_size: int
+            The minimal size of the pyramid levels (see the
+            :class:`~straditize.image_io.ImagePyramid`)
+        ``*args, **kwargs``
+            Any other parameter for the :class:`matplotlib.image.AxesImage`
+        """
+        self.pyramid = kwargs.pop('pyramid', None)
+        self.min_size = kwargs.pop('min_size', self.min_size)
+        super(PyramidImage, self).__init__(ax, *args, **kwargs)
+
+    def set_data(self, A):
+        """Set the image array and update the :attr:`pyramid`
+
+        If `A` is the first level of the :attr:`pyramid`, it is not copied.
+        Otherwise only the tiles of the :attr:`pyramid` are updated that
+        changed compared to the previous data"""
+        pyramid = self.pyramid
+        if pyramid is not None and A is pyramid[0]:
+            # validate the smallest level and use the first level directly
+            super(PyramidImage, self).set_data(pyramid[-1])
+            self._A = A
+            return
+        old = getattr(self, '_A', None)
+        if old is not None:
+            old = np.ma.getdata(old)
+        super(PyramidImage, self).set_data(A)
+        A = self._A
+        mask = np.ma.getmask(A)
+        if mask is not np.ma.nomask and mask.any():
+            # masked values are not supported by the pyramid
+            self.pyramid = None
+            return
+        A = np.ma.getdata(A)
+        if (pyramid is None or old is None or old.shape != A.shape or
+                old.dtype != A.dtype):
+            self.pyramid = image_io.ImagePyramid(
+                A, self.min_size, method='mean' if A.ndim == 3 else 'max')
+        else:
+            pyramid.levels[0] = A
+            tile_size = TILE_SIZE
+            for i, j in zip(*np.where(changed_tiles(old, A, tile_size))):
+                pyramid.update(slice(i * tile_size, (i + 1) * tile_size),
+                               slice(j * tile_size, (j + 1) * tile_size))
+
+    def _get_visible_region(self, clip):
+        """Get the rows and columns of the data that are visible in `clip`
+
+        Returns
+        -------
+        tuple or None
+            The first and last (+1) row and column or None, if no part of the
+            image is visible"""
+        nrows, ncols = self._A.shape[:2]
+        x0, x1, y0, y1 = self.get_extent()
+        # transform from display coordinates to fractional pixel indices
+        corners = self.get_transform().inverted().transform(
+            clip.corners()[[0, 3]])
+        cols = np.sort((corners[:, 0] - x0) / (x1 - x0) * ncols)
+        if self.origin == 'upper':
+            rows = np.sort((corners[:, 1] - y1) / (y0 - y1) * nrows)
+        else:
+            rows = np.sort((corners[:, 1] - y0) / (y1 - y0) * nrows)
+        c0 = max(0, int(np.floor(cols[0])))
+        c1 = min(ncols, int(np.ceil(cols[1])))
+        r0 = max(0, int(np.floor(rows[0])))
+        r1 = min(nrows, int(np.ceil(rows[1])))
+        if c0 >= c1 or r0 >= r1:
+            return None
+        return r0, r1, c0, c1
+
+    def make_image(self, renderer, magnification=1.0, unsampled=False):
+        """Make the image from the visible part of the suitable pyramid level
+
+        See :meth:`matplotlib.image.AxesImage.make_image`"""
+        pyramid = self.pyramid
+        clip = ((self.get_clip_box() or self.axes.bbox) if self.get_clip_on()
+                else self.figure.bbox)
+        region = None
+        if pyramid is not None and not unsampled and \
+                self.origin in ['upper', 'lower']:
+            region = self._get_visible_region(clip)
+        if region is None:
+            self.level = 0
+            return super(PyramidImage, self).make_image(
+                renderer, magnification, unsampled)
+        r0, r1, c0, c1 = region
+        nrows, ncols = self._A.shape[:2]
+        # the number of pixels per screen pixel
+        x0, x1, y0, y1 = self.get_extent()
+        bbox = Bbox([[x0, y0], [x1, y1]])
+        size = TransformedBbox(bbox, self.get_transform()).size * \
+            magnification
+        scale = min(ncols / max(size[0], 1), nrows / max(size[1], 1))
+        self.level = level = pyramid.level_for_scale(scale)
+        factor = 2 ** level
+        lr0, lc0 = r0 // factor, c0 // factor
+        lr1, lc1 = -(-r1 // factor), -(-c1 // factor)
+        arr = pyramid[level][lr0:lr1, lc0:lc1]
+        if arr.ndim == 2:
+            # scalar data is expected as masked array by matplotlib
+            arr = np.ma.asarray(arr)
+        # the extent of the visible part
+        xs = x0 + (x1 - x0) * np.array(
+            [lc0 * factor, min(ncols, lc1 * factor)]) / ncols
+        rows = np.array([lr0 * factor, min(nrows, lr1 * factor)]) / nrows
+        if self.origin == 'upper':
+            ys = y1 + (y0 - y1) * rows[::-1]
+        else:
+            ys = y0 + (y1 - y0) * rows
+        bbox = Bbox([[xs[0], ys[0]], [xs[1], ys[1]]])
+        return self._make_image(
+            arr, bbox, TransformedBbox(bbox, self.get_transform()), clip,
+            magnification, unsampled=unsampled)
+
+
+def imshow(ax, X, *, pyramid=None, min_size=None, aspect=None, alpha=None,
+           vmin=None, vmax=None, **kwargs):
+    """Plot an image and use a :class:`PyramidImage` for large images
+
+    Parameters
+    ----------
+    ax: matplotlib.axes.Axes
+        The axes to plot on
+    X: np.ndarray or PIL.Image.Image
+        The image to plot
+    pyramid: bool or straditize.image_io.ImagePyramid
+        If True, a :class:`PyramidImage` is used. If None, it is used if the
+        image has more than :attr:`straditize.image_io.MAX_DISPLAY_SIZE`
+        pixels. If an :class:`~straditize.image_io.ImagePyramid`, it is used
+        for the :class:`PyramidImage`
+    min_size: int
+        The minimal size of the pyramid levels
+    ``aspect, alpha, vmin, vmax, **kwargs``
+        Any other parameter for the :meth:`matplotlib.axes.Axes.imshow`
+        method
+
+    Returns
+    -------
+    matplotlib.image.AxesImage
+        The plotted image"""
+    if pyramid is None:
+        shape = np.shape(X)
+        if not shape:  # PIL.Image.Image
+            shape = X.size[::-1]
+        pyramid = shape[0] * shape[1] > image_io.MAX_DISPLAY_SIZE
+    if pyramid is False:
+        return ax.imshow(X, aspect=aspect, alpha=alpha, vmin=vmin, vmax=vmax,
+                         **kwargs)
+    if pyramid is not True:
+        kwargs['pyramid'] = pyramid
+        X = pyramid[0]
+    if min_size is not None:
+        kwargs['min_size'] = min_size
+    im = PyramidImage(ax, **kwargs)
+    if aspect is None:
+        aspect = mpl.rcParams['image.aspect']
+    ax.set_aspect(aspect)
+    im.set_data(X)
+    im.set_alpha(alpha)
+    if im.get_clip_path() is None:
+        im.set_clip_path(ax.patch)
+    if vmin is not None or vmax is not None:
+        im.set_clim(vmin, vmax)
+    im.autoscale_None()
+    im.set_extent(im.get_extent())
+    ax.add_image(im)
+    return im
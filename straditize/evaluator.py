@@ -2,7 +2,9 @@
 import os.path as osp
 import shutil
 import multiprocessing as mp
+from multiprocessing import shared_memory
 import warnings
+from io import BytesIO
 from PIL import Image
 from functools import partial
 import pandas as pd
@@ -63,6 +65,118 @@ def print_progressbar(iteration, total, prefix='', suffix='', length=100,
         print()
 
 
+class SharedFrame:
+    """A read-only :class:`pandas.DataFrame` in shared memory
+
+    Numeric columns are copied into :class:`multiprocessing.shared_memory`
+    blocks, all other columns are factorized and only their integer codes
+    are shared. Pickling this object only transfers the names of the memory
+    blocks (and the categories of the factorized columns), such that worker
+    processes can reconstruct the frame without copying the data.
+
+    Parameters
+    ----------
+    df: pandas.DataFrame
+        The data to share. The index is not preserved"""
+
+    def __init__(self, df):
+        self._blocks = []
+        self._specs = []
+        for col in df.columns:
+            values = df[col].values
+            categories = None
+            if values.dtype.kind not in 'biuf':
+                values, categories = pd.factorize(values)
+            shm = shared_memory.SharedMemory(create=True,
+                                             size=max(values.nbytes, 1))
+            arr = np.ndarray(values.shape, values.dtype, buffer=shm.buf)
+            arr[:] = values
+            self._blocks.append(shm)
+            self._specs.append((col, shm.name, values.dtype.str, len(values),
+                                categories))
+        self._owner = True
+
+    def __reduce__(self):
+        return (self.__class__._attach, (self._specs, ))
+
+    @classmethod
+    def _attach(cls, specs):
+        obj = cls.__new__(cls)
+        obj._specs = specs
+        obj._blocks = [shared_memory.SharedMemory(name)
+                       for _, name, _, _, _ in specs]
+        obj._owner = False
+        return obj
+
+    def to_frame(self):
+        """Reconstruct the :class:`pandas.DataFrame`
+
+        Numeric columns are views on the shared memory and must not be
+        modified"""
+        data = OrderedDict()
+        for (col, _, dtype, n, categories), shm in zip(self._specs,
+                                                      self._blocks):
+            arr = np.ndarray((n, ), np.dtype(dtype), buffer=shm.buf)
+            if categories is not None:
+                # missing values have the code -1
+                arr = np.asarray(pd.Categorical.from_codes(arr, categories))
+            else:
+                arr.flags.writeable = False
+            data[col] = arr
+        return pd.DataFrame(data, copy=False)
+
+    def close(self):
+        """Close the shared memory and release it if we created it"""
+        for shm in self._blocks:
+            shm.close()
+            if self._owner:
+                shm.unlink()
+        self._blocks = []
+
+
+#: The state of an evaluation worker process, see :func:`_init_worker`
+_worker_state = {}
+
+
+def _init_worker(scenario, shared):
+    """Initialize a worker process for :meth:`BaselineScenario.run`
+
+    This function keeps the `scenario` and the shared POLNET data in the
+    process and warms up the plotting machinery (backend, font cache and
+    psyplot) once instead of for every dataset
+
+    Parameters
+    ----------
+    scenario: BaselineScenario
+        The scenario to run
+    shared: SharedFrame
+        The POLNET data, sorted by the ``'e_'`` column"""
+    import matplotlib.pyplot as plt
+    import psyplot.project  # noqa: F401
+    plt.switch_backend('agg')
+    # render some text to load the fonts
+    fig = plt.figure()
+    fig.text(0.5, 0.5, 'straditize')
+    fig.canvas.draw()
+    plt.close(fig)
+    _worker_state['scenario'] = scenario
+    _worker_state['shared'] = shared
+    _worker_state['data'] = shared.to_frame()
+
+
+def _run_shared_task(task):
+    """Evaluate one dataset of the shared data in a worker process
+
+    Parameters
+    ----------
+    task: tuple
+        The name of the dataset and the start and end of its rows in the
+        shared data"""
+    key, start, stop = task
+    group = _worker_state['data'].iloc[start:stop]
+    return _worker_state['scenario']((key, group))
+
+
 axislinestyle = {'left': '-', 'right': '-', 'bottom': '-', 'top': '-'}
 
 
@@ -104,17 +218,67 @@ class StraditizeEvaluator:
         return cls(df, *args, calculate_percentages=False, percentages=True,
                    **kwargs)
 
-    def export(self, filepath, dpi=300, labels={}):
+    def export(self, filepath, dpi=300, labels={}, in_memory=False):
+        """Export the diagram with and without axes
+
+        Parameters
+        ----------
+        filepath: str
+            The path where to save the images (without the ``'.png'``
+            ending)
+        dpi: int
+            The resolution of the images
+        labels: dict
+            Additional labels for the :attr:`results_column`
+        in_memory: bool
+            If True, the images are rendered into in-memory buffers (see
+            :attr:`buffers`) instead of writing them to `filepath`"""
         self.dpi = dpi
         self.filepath = filepath
         for key, val in sorted(labels.items()):
             self.labels[key] = val
-        self.sp.export(filepath + '.png', dpi=dpi)
+        self.buffers = {} if in_memory else None
+        self._export_image('', dpi)
         # now hide the axes
         self.sp.update(axiscolor={'left': 'w', 'right': 'w'})
-        self.sp.export(filepath + '-no-axes.png', dpi=dpi)
+        self._export_image('-no-axes', dpi)
         self.sp.update(axiscolor={'left': 'k', 'right': 'k'})
 
+    def _export_image(self, suffix, dpi):
+        """Save the figure to disk or into the :attr:`buffers`"""
+        if self.buffers is None:
+            self.sp.export(self.filepath + suffix + '.png', dpi=dpi)
+        else:
+            buf = BytesIO()
+            for fig in self.sp.figs:
+                fig.savefig(buf, dpi=dpi, format='png')
+            self.buffers[suffix] = buf.getvalue()
+
+    def open_image(self, axes=False):
+        """Open the exported image
+
+        Parameters
+        ----------
+        axes: bool
+            If True, open the image with the y-axes, otherwise the one
+            without
+
+        Returns
+        -------
+        PIL.Image.Image
+            The exported image, either from disk or from the :attr:`buffers`
+        """
+        suffix = '' if axes else '-no-axes'
+        if self.buffers is None:
+            return Image.open(self.filepath + suffix + '.png')
+        return Image.open(BytesIO(self.buffers[suffix]))
+
+    #: The in-memory PNG images if :meth:`export` has been called with
+    #: ``in_memory=True``. Keys are the suffixes of the image files,
+    #: i.e. ``''`` for the image with y-axes and ``'-no-axes'`` for the one
+    #: without
+    buffers = None
+
     _results = None
 
     _dpi = None
@@ -258,10 +422,7 @@ class StraditizeEvaluator:
 
     def init_stradi(self, datalim=True, columns=True, names=True,
                     digitize=True, samples=True, axes=False):
-        path = self.filepath
-        if not axes:
-            path += '-no-axes'
-        image = Image.open(path + '.png')
+        image = self.open_image(axes)
         stradi = Straditizer(image)
         if datalim:
             stradi.data_xlim = self.data_xlim
@@ -287,6 +448,8 @@ class StraditizeEvaluator:
             stradi.data_reader.digitize()
             stradi.data_reader._full_df.loc[:] = np.where(
                 stradi.data_reader.full_df.values, self.full_df.values, 0)
+            stradi.data_reader._update_column_versions(
+                stradi.data_reader._full_df.columns)
 
         else:
             return stradi
@@ -437,7 +600,11 @@ class NoVerticalsEvaluator(StraditizeEvaluator):
 
     def export(self, *args, **kwargs):
         super().export(*args, **kwargs)
-        shutil.copyfile(self.filepath + '-no-axes.png', self.filepath + '.png')
+        if self.buffers is None:
+            shutil.copyfile(self.filepath + '-no-axes.png',
+                            self.filepath + '.png')
+        else:
+            self.buffers[''] = self.buffers['-no-axes']
 
     def evaluate_column_starts(self, close=True, base='starts_'):
         stradi = self.init_stradi(columns=False, axes=True)
@@ -486,6 +653,10 @@ class BaselineScenario:
     This class uses the default settings of the :class:`StraditizeEvaluator`
     and runs the analysis for a given dataset from POLNET."""
 
+    #: If True, the images are rendered into in-memory buffers instead of
+    #: writing them to the :attr:`output_dir`. See :meth:`run`
+    in_memory = False
+
     def __init__(self, output_dir='.'):
         self.output_dir = output_dir
         self.failed = []
@@ -497,15 +668,56 @@ class BaselineScenario:
                 (self.output_dir, ),
                 {'failed': self.failed,
                  'results': self.results,
+                 'in_memory': self.in_memory,
                  '_all_results': []
                  }
                 )  # do not distribute all results
 
-    def run(self, data, processes=None):
+    def run(self, data, processes=None, in_memory=False, chunksize=None):
+        """Run the scenario for all datasets in the POLNET `data`
+
+        Parameters
+        ----------
+        data: pandas.DataFrame
+            The POLNET data with the ``'e_'``, ``'age'``,
+            ``'original_varname'`` and ``'percentage'`` columns
+        processes: int
+            The number of worker processes. If None, the number of cpus is
+            used
+        in_memory: bool
+            If True, the diagrams are rendered into in-memory buffers instead
+            of exporting them to the :attr:`output_dir`. Furthermore,
+            the `data` is shared with the workers via
+            :mod:`multiprocessing.shared_memory`, the datasets are sent in
+            chunks and each worker process is only initialized once
+            (see :func:`_init_worker`)
+        chunksize: int
+            The number of datasets that are sent at once to a worker in the
+            `in_memory` mode. If None, it is chosen such that each worker
+            gets about four chunks"""
         self.failed.extend(data.e_.unique())
         all_results = self._all_results
-        grouped = data.groupby('e_')
-        progress_args = (grouped.ngroups, 'Progress', 'Complete', 50)
+        shared = None
+        self.in_memory = in_memory
+        if in_memory:
+            data = data.sort_values('e_', kind='mergesort')
+            keys, starts = np.unique(data.e_.values, return_index=True)
+            stops = np.r_[starts[1:], len(data)]
+            tasks = list(zip(keys, starts, stops))
+            shared = SharedFrame(data)
+            ntasks = len(tasks)
+            nprocs = processes or mp.cpu_count()
+            if chunksize is None:
+                chunksize = max(1, ntasks // (4 * nprocs))
+            pool = mp.Pool(processes, _init_worker, (self, shared))
+            iterator = pool.imap_unordered(_run_shared_task, tasks,
+                                           chunksize)
+        else:
+            grouped = data.groupby('e_')
+            ntasks = grouped.ngroups
+            pool = mp.Pool(processes)
+            iterator = pool.imap_unordered(self, grouped)
+        progress_args = (ntasks, 'Progress', 'Complete', 50)
 
         print_progressbar(0, *progress_args)
         with warnings.catch_warnings():
@@ -513,15 +725,18 @@ class BaselineScenario:
                                     UserWarning)
             warnings.filterwarnings('ignore', 'divide by zero encountered',
                                     RuntimeWarning)
-            pool = mp.Pool(processes)
-            for i, results in enumerate(pool.imap_unordered(self, grouped), 1):
-                if np.ndim(results):
-                    all_results.append(results)
-                    self.failed.remove(int(results.name[0]))
-                print_progressbar(i, *progress_args)
-            pool.close()
-            pool.join()
-            pool.terminate()
+            try:
+                for i, results in enumerate(iterator, 1):
+                    if np.ndim(results):
+                        all_results.append(results)
+                        self.failed.remove(int(results.name[0]))
+                    print_progressbar(i, *progress_args)
+                pool.close()
+                pool.join()
+            finally:
+                pool.terminate()
+                if shared is not None:
+                    shared.close()
         self.results = pd.concat(all_results, axis=1, sort=False).T
         self.results.index.names = self.index_names
 
@@ -536,6 +751,7 @@ class BaselineScenario:
             data, *args, name=str(name), **kwargs)
 
     def export_evaluator(self, evaluator, *args, **kwargs):
+        kwargs.setdefault('in_memory', self.in_memory)
         evaluator.export(osp.join(self.output_dir, evaluator.name),
                          *args, **kwargs)
 
@@ -0,0 +1,394 @@
+# -*- coding: utf-8 -*-
+"""Input of (very large) images
+
+This module defines the :func:`read_image` function that decodes an image
+file strip by strip into a (memory-mapped) RGBA array and the
+:class:`ImagePyramid` that holds downsampled versions of an image for the
+display.
+
+Large scans (see :attr:`LARGE_IMAGE_SIZE`) are by default decoded into a
+memory-mapped temporary file such that they can be digitized at full
+resolution without having the entire RGBA image in memory. TIFF files are
+decoded with the :mod:`tifffile` package (if installed), all other images
+with the :mod:`PIL` package.
+
+**Disclaimer**
+
+Copyright (C) 2018-2019  Philipp S. Sommer
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+import os.path as osp
+import tempfile
+import numpy as np
+
+
+#: The number of pixels above which an image is considered to be large. Large
+#: images are read into memory-mapped arrays and displayed with an
+#: :class:`ImagePyramid`
+LARGE_IMAGE_SIZE = 20e6
+
+#: The maximal number of pixels of the pyramid level that is displayed for the
+#: full image
+MAX_DISPLAY_SIZE = 4e6
+
+#: The number of rows that are decoded and converted at once
+STRIP_HEIGHT = 512
+
+
+def is_large(shape):
+    """Check whether an image is larger than :attr:`LARGE_IMAGE_SIZE`
+
+    Parameters
+    ----------
+    shape: tuple
+        The shape of the image array (the first two entries are the number of
+        rows and columns)
+
+    Returns
+    -------
+    bool
+        True, if the number of pixels exceeds the :attr:`LARGE_IMAGE_SIZE`"""
+    return shape[0] * shape[1] > LARGE_IMAGE_SIZE
+
+
+def empty_array(shape, dtype=np.uint8, memmap=False, dirname=None):
+    """Create an uninitialized array
+
+    Parameters
+    ----------
+    shape: tuple
+        The shape of the array
+    dtype: np.dtype
+        The data type of the array
+    memmap: bool
+        If True, the array is mapped to an anonymous temporary file that is
+        removed when the array is deleted
+    dirname: str
+        The directory for the temporary file. If None, the default of the
+        :mod:`tempfile` module is used
+
+    Returns
+    -------
+    np.ndarray or np.memmap
+        The new array"""
+    if not memmap:
+        return np.empty(shape, dtype)
+    return np.memmap(tempfile.TemporaryFile(dir=dirname), dtype=dtype,
+                     mode='w+', shape=tuple(shape))
+
+
+def iter_strips(nrows, strip_height=None):
+    """Iterate over the strips of an image
+
+    Parameters
+    ----------
+    nrows: int
+        The number of rows of the image
+    strip_height: int
+        The number of rows per strip. If None, the :attr:`STRIP_HEIGHT` is
+        used
+
+    Yields
+    ------
+    slice
+        The rows of the strip"""
+    strip_height = strip_height or STRIP_HEIGHT
+    for i in range(0, nrows, strip_height):
+        yield slice(i, min(i + strip_height, nrows))
+
+
+def to_rgba(arr):
+    """Convert an array of dtype uint8 into an RGBA array
+
+    Parameters
+    ----------
+    arr: np.ndarray of dtype uint8
+        A grey scale (2D), grey scale with alpha, RGB or RGBA (3D) array
+
+    Returns
+    -------
+    np.ndarray of shape ``arr.shape[:2] + (4, )``
+        The RGBA array"""
+    if arr.ndim == 2:
+        arr = arr[..., np.newaxis]
+    nbands = arr.shape[-1]
+    ret = np.empty(arr.shape[:2] + (4, ), dtype=np.uint8)
+    if nbands in [1, 2]:
+        ret[..., :3] = arr[..., :1]
+    else:
+        ret[..., :3] = arr[..., :3]
+    if nbands in [2, 4]:
+        ret[..., -1] = arr[..., -1]
+    else:
+        ret[..., -1] = 255
+    return ret
+
+
+def read_image(fname, memmap=None, dirname=None, strip_height=None):
+    """Read an image file into an RGBA array
+
+    The image is decoded and converted strip by strip, such that we never
+    have more than one decoded copy of the image in memory.
+
+    Parameters
+    ----------
+    fname: str
+        The path to the image file
+    memmap: bool
+        If True, the returned array is memory-mapped to a temporary file. If
+        None, this is the case if the image is larger than the
+        :attr:`LARGE_IMAGE_SIZE`
+    dirname: str
+        The directory for the temporary file of the memory-mapped array
+    strip_height: int
+        The number of rows that are converted at once. If None, the
+        :attr:`STRIP_HEIGHT` is used
+
+    Returns
+    -------
+    np.ndarray of shape ``(Y, X, 4)`` and dtype uint8
+        The RGBA image"""
+    if osp.splitext(fname)[1].lower() in ['.tif', '.tiff']:
+        try:
+            return _read_tiff(fname, memmap, dirname, strip_height)
+        except (ImportError, ValueError):
+            pass
+    return _read_pil(fname, memmap, dirname, strip_height)
+
+
+def _read_tiff(fname, memmap=None, dirname=None, strip_height=None):
+    """Read a TIFF file via the :mod:`tifffile` package
+
+    The tiles or strips of compressed files are decoded and converted one by
+    one into the RGBA array, uncompressed files are mapped into memory and
+    converted strip by strip. See :func:`read_image` for the parameters. A
+    :class:`ValueError` is raised if the image cannot be converted to RGBA
+    by this function"""
+    import tifffile
+    with tifffile.TiffFile(fname) as tif:
+        page = tif.pages[0]
+        shape = page.shape
+        if (page.dtype != np.uint8 or
+                page.photometric not in [tifffile.PHOTOMETRIC.MINISBLACK,
+                                         tifffile.PHOTOMETRIC.RGB] or
+                shape[:2] != (page.imagelength, page.imagewidth) or
+                (len(shape) == 3 and shape[-1] not in [2, 3, 4]) or
+                len(shape) not in [2, 3]):
+            raise ValueError("Cannot convert %s to RGBA" % (fname, ))
+        if memmap is None:
+            memmap = is_large(shape)
+        nrows, ncols = shape[:2]
+        ret = empty_array((nrows, ncols, 4), np.uint8, memmap, dirname)
+        contiguous = bool(page.is_contiguous)
+
+        def convert(segment):
+            data, (_, _, row, col, _), seg_shape = segment
+            if data is None:  # empty segment
+                data = np.zeros(seg_shape, np.uint8)
+            # tiles at the edges are padded
+            data = data[0, :nrows - row, :ncols - col]
+            ret[row:row + len(data), col:col + data.shape[1]] = to_rgba(data)
+
+        if not contiguous:
+            for _ in page.segments(func=convert, maxworkers=1,
+                                   buffersize=2 ** 22):
+                pass
+    if contiguous:
+        decoded = tifffile.memmap(fname, page=0, mode='r')
+        for sl in iter_strips(nrows, strip_height):
+            ret[sl] = to_rgba(decoded[sl])
+        del decoded
+    return ret
+
+
+def _read_pil(fname, memmap=None, dirname=None, strip_height=None):
+    """Read an image via the :mod:`PIL` package
+
+    See :func:`read_image` for the parameters"""
+    from PIL import Image
+    with Image.open(fname) as image:
+        w, h = image.size
+        if memmap is None:
+            memmap = is_large((h, w))
+        # decode the image in its native mode and convert it strip by strip
+        image.load()
+        ret = empty_array((h, w, 4), np.uint8, memmap, dirname)
+        for sl in iter_strips(h, strip_height):
+            ret[sl] = np.asarray(
+                image.crop((0, sl.start, w, sl.stop)).convert('RGBA'))
+    return ret
+
+
+def _downsample_block(block, method='mean'):
+    """Halve the size of a block of an image
+
+    See :func:`downsample` for the parameters"""
+    pad = [(0, 0)] * block.ndim
+    pad[0] = (0, len(block) % 2)
+    pad[1] = (0, block.shape[1] % 2)
+    if pad[0][1] or pad[1][1]:
+        block = np.pad(block, pad, mode='edge')
+    nrows, ncols = block.shape[:2]
+    block = block.reshape(
+        (nrows // 2, 2, ncols // 2, 2) + block.shape[2:])
+    if method == 'max':
+        return block.max(axis=(1, 3))
+    elif block.dtype == np.uint8:
+        return (block.sum(axis=(1, 3), dtype=np.uint16) + 2) // 4
+    return block.mean(axis=(1, 3)).astype(block.dtype)
+
+
+def downsample(arr, memmap=False, dirname=None, strip_height=None,
+               method='mean'):
+    """Halve the size of an image by aggregating blocks of 2x2 pixels
+
+    Parameters
+    ----------
+    arr: np.ndarray
+        The 2D or 3D image array. If the number of rows or columns is odd,
+        the last row or column is repeated
+    memmap: bool
+        If True, the returned array is memory-mapped to a temporary file
+    dirname: str
+        The directory for the temporary file of the memory-mapped array
+    strip_height: int
+        The number of rows of `arr` that are processed at once
+    method: {'mean', 'max'}
+        How to aggregate the pixels. ``'mean'`` is suited for images, ``'max'``
+        for labeled arrays
+
+    Returns
+    -------
+    np.ndarray
+        The downsampled array with ``ceil(nrows / 2)`` rows and
+        ``ceil(ncols / 2)`` columns"""
+    nrows, ncols = arr.shape[:2]
+    shape = ((nrows + 1) // 2, (ncols + 1) // 2) + arr.shape[2:]
+    ret = empty_array(shape, arr.dtype, memmap, dirname)
+    # strips must have an even number of rows
+    strip_height = strip_height or STRIP_HEIGHT
+    strip_height += strip_height % 2
+    for sl in iter_strips(nrows, strip_height):
+        ret[sl.start // 2:(sl.stop + 1) // 2] = _downsample_block(
+            arr[sl], method)
+    return ret
+
+
+class ImagePyramid(object):
+    """A multi-resolution pyramid of an image
+
+    The first level is the full resolution image, every following level
+    halves the size of the previous one (see :func:`downsample`)."""
+
+    #: The list of levels of the pyramid
+    levels = None
+
+    #: The aggregation method for the :func:`downsample` function
+    method = 'mean'
+
+    def __init__(self, arr, min_size=512, memmap=None, dirname=None,
+                 method='mean'):
+        """
+        Parameters
+        ----------
+        arr: np.ndarray of dtype uint8
+            The full resolution image array
+        min_size: int
+            The size (in pixels) of the longer side of the smallest level
+        memmap: bool
+            If True, the levels are memory-mapped to temporary files. If None,
+            only the levels that are larger than the
+            :attr:`LARGE_IMAGE_SIZE` are memory-mapped
+        dirname: str
+            The directory for the temporary files of memory-mapped levels
+        method: {'mean', 'max'}
+            The aggregation method for the :func:`downsample` function"""
+        self.method = method
+        self.levels = [arr]
+        while max(arr.shape[:2]) > min_size:
+            shape = ((arr.shape[0] + 1) // 2, (arr.shape[1] + 1) // 2)
+            arr = downsample(
+                arr, is_large(shape) if memmap is None else memmap, dirname,
+                method=method)
+            self.levels.append(arr)
+
+    def __len__(self):
+        return len(self.levels)
+
+    def __getitem__(self, level):
+        return self.levels[level]
+
+    @property
+    def shape(self):
+        """The shape of the full resolution image"""
+        return self.levels[0].shape
+
+    def update(self, rows, cols, arr=None):
+        """Update the levels after a change of the full resolution image
+
+        Parameters
+        ----------
+        rows: slice
+            The rows of the full resolution image that changed
+        cols: slice
+            The columns of the full resolution image that changed
+        arr: np.ndarray
+            The new full resolution image. If None, the first level has been
+            changed inplace"""
+        if arr is not None:
+            self.levels[0] = arr
+        r0, r1 = rows.start or 0, rows.stop
+        c0, c1 = cols.start or 0, cols.stop
+        for prev, level in zip(self.levels[:-1], self.levels[1:]):
+            r0, c0 = r0 // 2, c0 // 2
+            r1, c1 = (r1 + 1) // 2, (c1 + 1) // 2
+            level[r0:r1, c0:c1] = _downsample_block(
+                prev[2 * r0:2 * r1, 2 * c0:2 * c1], self.method)
+
+    def level_for_size(self, max_size=None):
+        """Get the finest level with at most the given number of pixels
+
+        Parameters
+        ----------
+        max_size: float
+            The maximal number of pixels. If None, the
+            :attr:`MAX_DISPLAY_SIZE` is used
+
+        Returns
+        -------
+        int
+            The index of the level in the :attr:`levels`"""
+        if max_size is None:
+            max_size = MAX_DISPLAY_SIZE
+        for i, arr in enumerate(self.levels):
+            if arr.shape[0] * arr.shape[1] <= max_size:
+                return i
+        return len(self.levels) - 1
+
+    def level_for_scale(self, scale):
+        """Get the coarsest level that has at least one pixel per screen pixel
+
+        Parameters
+        ----------
+        scale: float
+            The number of full resolution pixels per screen pixel
+
+        Returns
+        -------
+        int
+            The index of the level in the :attr:`levels`"""
+        if scale < 2:
+            return 0
+        return min(int(np.log2(scale)), len(self.levels) - 1)
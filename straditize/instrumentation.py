@@ -0,0 +1,331 @@
+# -*- coding: utf-8 -*-
+"""Timing and memory instrumentation of the straditize operations
+
+This module defines the :class:`Recorder` that records the wall time, CPU time,
+peak memory and the size of the input for the public operations of the
+:class:`~straditize.straditizer.Straditizer` and the
+:class:`~straditize.binary.DataReader` (e.g. ``digitize``, ``find_samples``,
+``recognize_hlines``, ``to_dataset``, etc.).
+
+The instrumentation is disabled by default and has to be enabled explicitly,
+e.g. via::
+
+    >>> from straditize.instrumentation import recorder
+    >>> with recorder.recording():
+    ...     reader.digitize()
+    ...     reader.find_samples()
+    >>> recorder.to_dataframe()
+
+The records can be exported to JSON (:meth:`Recorder.to_json`) or to the
+Chrome trace format (:meth:`Recorder.to_chrome_trace`) that can be displayed
+with ``chrome://tracing`` or https://ui.perfetto.dev.
+
+**Disclaimer**
+
+Copyright (C) 2018-2019  Philipp S. Sommer
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+import os
+import json
+import time
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from functools import wraps
+
+
+class Recorder(object):
+    """A recorder for the instrumented straditize operations
+
+    Use the global :attr:`recorder` instance of this class to record the
+    operations"""
+
+    #: Whether the recorder is enabled or not
+    enabled = False
+
+    #: Whether to measure the peak memory with :mod:`tracemalloc`. Note that
+    #: this slows down the operations significantly
+    trace_memory = True
+
+    def __init__(self):
+        #: The list of records. Each record is a dictionary, see the
+        #: :meth:`to_dataframe` method for the keys
+        self.records = []
+        self._local = threading.local()
+        self._t0 = time.perf_counter()
+        self._started_tracemalloc = False
+
+    @property
+    def _stack(self):
+        try:
+            return self._local.stack
+        except AttributeError:
+            self._local.stack = []
+            return self._local.stack
+
+    def enable(self, trace_memory=None):
+        """Start recording
+
+        Parameters
+        ----------
+        trace_memory: bool
+            Whether to measure the peak memory. If None, the current value of
+            :attr:`trace_memory` is used"""
+        if trace_memory is not None:
+            self.trace_memory = trace_memory
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self.enabled = True
+
+    def disable(self):
+        """Stop recording"""
+        self.enabled = False
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    @contextmanager
+    def recording(self, trace_memory=None):
+        """Context manager to record the operations within a block
+
+        Parameters
+        ----------
+        trace_memory: bool
+            Whether to measure the peak memory. If None, the current value of
+            :attr:`trace_memory` is used"""
+        was_enabled = self.enabled
+        self.enable(trace_memory)
+        try:
+            yield self
+        finally:
+            if not was_enabled:
+                self.disable()
+
+    def clear(self):
+        """Remove all records"""
+        self.records.clear()
+
+    def _memory(self):
+        if self.trace_memory and tracemalloc.is_tracing():
+            return tracemalloc.get_traced_memory()
+        return None, None
+
+    def _enter(self):
+        """Register the start of an operation"""
+        stack = self._stack
+        current, peak = self._memory()
+        if current is not None:
+            if stack:
+                stack[-1]['peak'] = max(stack[-1]['peak'], peak)
+            if hasattr(tracemalloc, 'reset_peak'):
+                tracemalloc.reset_peak()
+        frame = {'mem0': current, 'peak': current,
+                 'wall0': time.perf_counter(), 'cpu0': time.process_time()}
+        stack.append(frame)
+        return frame
+
+    def _exit(self, name, obj, info):
+        """Register the end of an operation and create the record"""
+        wall1 = time.perf_counter()
+        cpu1 = time.process_time()
+        stack = self._stack
+        frame = stack.pop()
+        current, peak = self._memory()
+        if current is not None and frame['mem0'] is not None:
+            frame_peak = max(frame['peak'], peak)
+            peak_memory = frame_peak - frame['mem0']
+            if stack:
+                stack[-1]['peak'] = max(stack[-1]['peak'], frame_peak)
+        else:
+            peak_memory = None
+        record = {
+            'name': name,
+            'class': obj.__class__.__name__ if obj is not None else None,
+            'start': frame['wall0'] - self._t0,
+            'wall_time': wall1 - frame['wall0'],
+            'cpu_time': cpu1 - frame['cpu0'],
+            'peak_memory': peak_memory,
+            'depth': len(stack),
+            'thread': threading.get_ident(),
+            'input': info,
+            }
+        self.records.append(record)
+        return record
+
+    def to_dataframe(self):
+        """Get the records as a :class:`pandas.DataFrame`
+
+        Returns
+        -------
+        pandas.DataFrame
+            A dataframe with one row per recorded operation and the columns
+
+            name
+                The name of the operation (e.g. ``'DataReader.digitize'``)
+            class
+                The name of the class of the instance that has been used
+            start
+                The start of the operation in seconds (relative to the
+                creation of the recorder)
+            wall_time
+                The wall time of the operation in seconds
+            cpu_time
+                The CPU time of the (entire) process in seconds
+            peak_memory
+                The peak of the memory allocated during the operation in
+                bytes (or NaN if memory tracing is disabled)
+            depth
+                The number of instrumented operations that called this
+                operation
+            thread
+                The identifier of the thread
+            input
+                A dictionary with information on the size of the input (e.g.
+                the shape of the binary image)"""
+        import pandas as pd
+        columns = ['name', 'class', 'start', 'wall_time', 'cpu_time',
+                   'peak_memory', 'depth', 'thread', 'input']
+        return pd.DataFrame(self.records, columns=columns)
+
+    def summary(self):
+        """Get the summed statistics for each operation
+
+        Returns
+        -------
+        pandas.DataFrame
+            A dataframe with the number of calls, the summed wall time and CPU
+            time and the maximal peak memory for each operation name"""
+        df = self.to_dataframe()
+        ret = df.groupby('name').agg(
+            calls=('wall_time', 'size'), wall_time=('wall_time', 'sum'),
+            cpu_time=('cpu_time', 'sum'), peak_memory=('peak_memory', 'max'))
+        return ret.sort_values('wall_time', ascending=False)
+
+    def to_json(self, fname=None):
+        """Export the records to JSON
+
+        Parameters
+        ----------
+        fname: str
+            The path of the output file. If None, the JSON string is returned
+
+        Returns
+        -------
+        str or None
+            The JSON string, if `fname` is None"""
+        s = json.dumps(self.records, default=_json_default, indent=1)
+        if fname is None:
+            return s
+        with open(fname, 'w') as f:
+            f.write(s)
+
+    def to_chrome_trace(self, fname=None):
+        """Export the records to the Chrome trace event format
+
+        The resulting file can be displayed with ``chrome://tracing`` or
+        https://ui.perfetto.dev
+
+        Parameters
+        ----------
+        fname: str
+            The path of the output file. If None, the trace is returned as
+            dictionary
+
+        Returns
+        -------
+        dict or None
+            The trace, if `fname` is None"""
+        pid = os.getpid()
+        events = []
+        for rec in self.records:
+            args = {'cpu_time': rec['cpu_time'], 'class': rec['class']}
+            if rec['peak_memory'] is not None:
+                args['peak_memory'] = rec['peak_memory']
+            args.update(rec['input'] or {})
+            events.append({
+                'name': rec['name'], 'cat': 'straditize', 'ph': 'X',
+                'ts': rec['start'] * 1e6, 'dur': rec['wall_time'] * 1e6,
+                'pid': pid, 'tid': rec['thread'], 'args': args})
+        trace = {'traceEvents': events, 'displayTimeUnit': 'ms'}
+        if fname is None:
+            return trace
+        with open(fname, 'w') as f:
+            json.dump(trace, f, default=_json_default)
+
+
+def _json_default(o):
+    """Convert numpy objects for the JSON export"""
+    try:
+        return o.tolist()
+    except AttributeError:
+        return str(o)
+
+
+#: The :class:`Recorder` that is used by the :func:`instrumented` operations
+recorder = Recorder()
+
+
+def get_input_info(obj, args):
+    """Get information on the input size of an operation
+
+    Parameters
+    ----------
+    obj: object
+        The instance of the method. If it has an ``_instrumentation_info``
+        method, it is used to get the info
+    args: tuple
+        The arguments of the call. The shapes of all arrays are included in
+        the returned info
+
+    Returns
+    -------
+    dict
+        The information on the input"""
+    ret = {}
+    get_info = getattr(obj, '_instrumentation_info', None)
+    if get_info is not None:
+        try:
+            ret.update(get_info())
+        except Exception:
+            pass
+    for i, arg in enumerate(args):
+        shape = getattr(arg, 'shape', None)
+        if shape is not None and not callable(shape):
+            ret['arg%i_shape' % i] = tuple(shape)
+    return ret
+
+
+def instrumented(func):
+    """Decorator to record a method with the global :attr:`recorder`
+
+    The decorated method is only instrumented if the :attr:`recorder` is
+    enabled. The name of the record is the qualified name of `func` (e.g.
+    ``'DataReader.digitize'``)"""
+    name = getattr(func, '__qualname__', func.__name__)
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if not recorder.enabled:
+            return func(self, *args, **kwargs)
+        obj = None if isinstance(self, type) else self
+        info = get_input_info(obj, args)
+        recorder._enter()
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            recorder._exit(name, obj, info)
+
+    return wrapper
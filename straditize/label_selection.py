@@ -27,6 +27,8 @@ along with this program. If not, see <https://www.gnu.org/licenses/>."""
 import numpy as np
 import matplotlib.colors as mcol
 from straditize.common import docstrings
+from straditize.instrumentation import instrumented
+import straditize.labeling as labeling
 
 
 class LabelSelection(object):
@@ -203,7 +205,7 @@ class LabelSelection(object):
         arr &= ~skim.remove_small_objects(arr, n)
         if not arr.any():
             return
-        labeled, num_labels = skim.label(arr, 8, return_num=True)
+        labeled, num_labels = labeling.label(arr, return_num=True)
         min_height = np.ceil(0.05 * arr.shape[0])
         min_width = np.ceil(0.05 * arr.shape[1])
         self._ellipses = artists = []
@@ -302,14 +304,17 @@ class LabelSelection(object):
         disable_label_selection
         remove_selected_labels"""
         if img is None:
+            import straditize.display as display
             cmap = self.get_default_cmap(2)
             cmap.set_under('none')
             kwargs.setdefault('cmap', cmap)
             norm = mcol.BoundaryNorm([0.1, 0.5, ncolors+0.5], 2)
             kwargs.setdefault('norm', norm)
-            img = self.ax.imshow(arr, **kwargs)
+            img = display.imshow(self.ax, arr, **kwargs)
             if getattr(self, 'magni', None) is not None:
-                magni_img = self.magni.ax.imshow(arr, **kwargs)
+                magni_img = display.imshow(
+                    self.magni.ax, arr,
+                    pyramid=getattr(img, 'pyramid', None), **kwargs)
             else:
                 magni_img = None
             self._remove = True
@@ -372,6 +377,7 @@ class LabelSelection(object):
         self._select_img.set_cmap(self.copy_cmap(cmap, colors))
         self._update_magni_img()
 
+    @instrumented
     def remove_selected_labels(self, disable=False):
         """Remove the selected parts of the diagram
 
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""Connected-component labeling of (large) images
+
+This module defines the :func:`label` function that is used instead of
+:func:`skimage.morphology.label` throughout straditize. Images that are larger
+than :attr:`PARALLEL_SIZE` are split into horizontal tiles that are labeled
+concurrently in a thread pool. The labels of features that cross the seams
+between the tiles are then merged with a union-find pass.
+
+**Disclaimer**
+
+Copyright (C) 2018-2019  Philipp S. Sommer
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+import os
+import numpy as np
+
+
+#: The number of pixels above which the image is labeled in parallel tiles
+PARALLEL_SIZE = 4e6
+
+#: The minimal number of rows of one tile
+MIN_TILE_HEIGHT = 256
+
+#: The number of threads for the parallel labeling. If 0, the number of
+#: processors is used
+max_workers = 0
+
+
+def label(arr, connectivity=2, return_num=False, background=0,
+          tile_height=None, workers=None):
+    """Label the connected regions of an integer array
+
+    This function is equivalent to::
+
+        skimage.morphology.label(arr, connectivity=connectivity,
+                                 background=background, return_num=return_num)
+
+    but labels large arrays in horizontal tiles in parallel. The labels are in
+    the same order as for :func:`skimage.morphology.label`, i.e. in the order
+    of the first pixel of each feature (row by row).
+
+    Parameters
+    ----------
+    arr: 2D np.ndarray of dtype int or bool
+        The image to label. Neighbouring pixels with the same value belong to
+        the same feature
+    connectivity: {1, 2}
+        1 to consider only the horizontal and vertical neighbours, 2 to
+        consider the diagonal neighbours, too
+    return_num: bool
+        If True, return the number of labels as well
+    background: int
+        The value of the pixels that are not labeled
+    tile_height: int
+        The number of rows of one tile. If None, the image is split into one
+        tile per worker, if it is larger than :attr:`PARALLEL_SIZE`, otherwise
+        it is labeled at once
+    workers: int
+        The number of threads. If None, the :attr:`max_workers` are used
+
+    Returns
+    -------
+    np.ndarray of dtype int
+        The labeled array
+    int
+        The number of labels (only if `return_num` is True)"""
+    import skimage.morphology as skim
+    arr = np.asarray(arr)
+    if workers is None:
+        workers = max_workers
+    workers = int(workers or os.cpu_count() or 1)
+    nrows = len(arr)
+    if tile_height is None:
+        if arr.ndim != 2 or arr.size <= PARALLEL_SIZE or workers == 1:
+            tile_height = nrows
+        else:
+            tile_height = max(-(-nrows // workers), MIN_TILE_HEIGHT)
+    if tile_height >= nrows:
+        return skim.label(arr, background=background, return_num=return_num,
+                          connectivity=connectivity)
+    starts = np.arange(0, nrows, tile_height)
+    slices = [slice(i, i + tile_height) for i in starts]
+
+    def label_tile(sl):
+        return skim.label(arr[sl], background=background, return_num=True,
+                          connectivity=connectivity)
+
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(min(workers, len(slices))) as executor:
+        tiles = list(executor.map(label_tile, slices))
+        # the labels of the tiles are made unique by adding these offsets
+        offsets = np.cumsum([0] + [num for tile, num in tiles])
+
+        def offset_row(i, row):
+            ret = tiles[i][0][row]
+            return np.where(ret > 0, ret + offsets[i], 0)
+
+        # find the labels that touch each other at the seams of the tiles
+        pairs = [seam_pairs(arr[sl.start - 1], arr[sl.start],
+                            offset_row(i, -1), offset_row(i + 1, 0),
+                            connectivity)
+                 for i, sl in enumerate(slices[1:])]
+        roots = union_find(offsets[-1] + 1, np.concatenate(pairs, axis=1))
+        # number the merged labels consecutively
+        is_root = roots == np.arange(len(roots))
+        is_root[0] = False
+        num = is_root.sum()
+        lut = np.zeros(len(roots), dtype=tiles[0][0].dtype)
+        lut[is_root] = np.arange(1, num + 1)
+        lut = lut[roots]
+        ret = np.empty(arr.shape, dtype=tiles[0][0].dtype)
+
+        def relabel(i):
+            tile, n = tiles[i]
+            offset = offsets[i]
+            np.take(np.r_[0, lut[offset + 1:offset + n + 1]], tile,
+                    out=ret[slices[i]])
+
+        list(executor.map(relabel, range(len(slices))))
+    if return_num:
+        return ret, num
+    return ret
+
+
+def seam_pairs(top_vals, bottom_vals, top, bottom, connectivity=2):
+    """Find the labels that touch each other at the seam of two tiles
+
+    Parameters
+    ----------
+    top_vals: 1D np.ndarray
+        The values of the image in the last row of the upper tile
+    bottom_vals: 1D np.ndarray
+        The values of the image in the first row of the lower tile
+    top: 1D np.ndarray
+        The labels in the last row of the upper tile
+    bottom: 1D np.ndarray
+        The labels in the first row of the lower tile
+    connectivity: {1, 2}
+        The connectivity of the features (see :func:`label`)
+
+    Returns
+    -------
+    np.ndarray of shape ``(2, N)``
+        The pairs of labels (upper and lower) that belong to the same
+        feature"""
+    n = len(top)
+    ret = []
+    for shift in ([0] if connectivity == 1 else [-1, 0, 1]):
+        upper = slice(max(0, -shift), n - max(0, shift))
+        lower = slice(max(0, shift), n - max(0, -shift))
+        a = top[upper]
+        b = bottom[lower]
+        mask = (a > 0) & (b > 0) & (top_vals[upper] == bottom_vals[lower])
+        ret.append([a[mask], b[mask]])
+    return np.unique(np.concatenate(ret, axis=1), axis=1)
+
+
+def union_find(n, pairs):
+    """Merge connected labels
+
+    Parameters
+    ----------
+    n: int
+        The number of labels (including the background 0)
+    pairs: np.ndarray of shape ``(2, N)``
+        The pairs of labels that are connected
+
+    Returns
+    -------
+    np.ndarray of length `n`
+        The root of every label, i.e. the smallest label of all labels that
+        are (indirectly) connected to it"""
+    parent = np.arange(n)
+    a, b = pairs
+    while True:
+        # compress the paths such that every label points to its root
+        while True:
+            grandparent = parent[parent]
+            if (grandparent == parent).all():
+                break
+            parent = grandparent
+        ra, rb = parent[a], parent[b]
+        differ = ra != rb
+        if not differ.any():
+            return parent
+        ra, rb = ra[differ], rb[differ]
+        # link the larger root to the smaller one
+        np.minimum.at(parent, np.maximum(ra, rb), np.minimum(ra, rb))
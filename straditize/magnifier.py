@@ -18,9 +18,6 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program. If not, see <https://www.gnu.org/licenses/>."""
 import numpy as np
-from matplotlib.widgets import Slider
-import matplotlib.colorbar as mcbar
-from matplotlib.axes import SubplotBase
 
 
 class Magnifier(object):
@@ -48,6 +45,9 @@ class Magnifier(object):
     ax = None
 
     def __init__(self, ax_src, ax=None, *args, **kwargs):
+        from matplotlib.widgets import Slider
+        import matplotlib.colorbar as mcbar
+        from matplotlib.axes import SubplotBase
         self.ax_src = ax_src
         if ax is None:
             import matplotlib.pyplot as plt
@@ -84,7 +84,8 @@ class Magnifier(object):
         self.ax.figure.canvas.draw()
 
     def make_plot(self, image, *args, **kwargs):
-        self.plot_image = self.ax.imshow(image, *args, **kwargs)
+        import straditize.display as display
+        self.plot_image = display.imshow(self.ax, image, *args, **kwargs)
 
     def onmotion(self, event):
         if event.inaxes != self.ax_src or self.ax is None:
@@ -31,11 +31,13 @@ import pickle
 from importlib import import_module
 import straditize.cross_mark as cm
 import straditize.binary as binary
+import straditize.image_io as image_io
+import straditize.labeling as labeling
 from straditize.label_selection import LabelSelection
+from straditize.instrumentation import instrumented
 from psyplot.data import Signal, safe_list
 from straditize.magnifier import Magnifier
 from psyplot.utils import _temp_bool_prop
-import skimage.morphology as skim
 import xarray as xr
 
 
@@ -181,6 +183,10 @@ class Straditizer(LabelSelection):
     #: The :class:`straditize.magnifier.Magnifier` for the diagram image
     magni = None
 
+    #: The :class:`straditize.image_io.ImagePyramid` of a large :attr:`image`
+    #: that is used for the display of the full image
+    image_pyramid = None
+
     @property
     def valid_attrs(self):
         attrs = self.attrs
@@ -293,6 +299,13 @@ class Straditizer(LabelSelection):
 
     yaxis_data = None
 
+    #: The scale of the y-axis. Either ``'linear'`` or ``'log'`` (i.e. the
+    #: pixel coordinates are linear in the logarithm of the data)
+    yaxis_scale = 'linear'
+
+    #: The key and the data frame of the last :attr:`final_df`
+    _final_df_cache = None
+
     mark_cids = set()
 
     _indexes = None
@@ -300,6 +313,19 @@ class Straditizer(LabelSelection):
     #: The matplotlib axes
     ax = None
 
+    #: The matplotlib image of the :attr:`image`
+    plot_im = None
+
+    @property
+    def headless(self):
+        """True if the straditizer is not plotted
+
+        A straditizer that is created with ``plot=False`` works without
+        matplotlib figures. Its :attr:`data_reader` is created without plot,
+        too, and all the methods to clean and digitize the diagram only work
+        on the arrays. Use the :meth:`plot_image` method to plot it later"""
+        return self.plot_im is None
+
     @property
     def full_df(self):
         if self.data_reader is None or self.data_reader._full_df is None:
@@ -307,13 +333,40 @@ class Straditizer(LabelSelection):
         return self._finalize_df(self.data_reader._full_df.copy(True))
 
     @property
+    @instrumented
     def final_df(self):
+        """The samples in data coordinates
+
+        The data frame is cached until the samples or the axis translations
+        change. Each access returns a copy of the cached data frame"""
         if (self.data_reader is None or self.data_reader.full_df is None or
                 self.data_reader.sample_locs is None):
             return None
-        ret = self._finalize_df(self.data_reader.sample_locs.copy(True))
-        ret.fillna(0.0, inplace=True)
-        return ret
+        key = self._final_df_key()
+        if self._final_df_cache is None or self._final_df_cache[0] != key:
+            ret = self._finalize_df(self.data_reader.sample_locs.copy(True))
+            ret.fillna(0.0, inplace=True)
+            self._final_df_cache = (key, ret)
+        return self._final_df_cache[1].copy(True)
+
+    def _final_df_key(self):
+        """The key for the cache of the :attr:`final_df`
+
+        The key consists of a hash of the samples and the axis
+        transformations"""
+        reader = self.data_reader
+        locs = reader.sample_locs
+        try:
+            yaxis = self.yaxis_transform() + (self.yaxis_scale, )
+        except ValueError:
+            yaxis = None
+        return (pd.util.hash_pandas_object(locs).values.tobytes(),
+                tuple(locs.columns), locs.index.dtype.str,
+                tuple(arr.tobytes()
+                      for arr in reader.xaxis_transforms(locs.columns)),
+                reader.occurences_value, yaxis,
+                self.get_attr('Y-axis name'),
+                tuple(self.colnames_reader.column_names))
 
     def get_labels(self, categorize=1):
         arr = binary.DataReader.to_grey_pil(self.image)
@@ -322,7 +375,7 @@ class Straditizer(LabelSelection):
             shape = arr.shape
             bins = np.r_[0, np.arange(1, 260 + categorize, categorize)]
             arr = pd.cut(arr.ravel(), bins, labels=False).reshape(shape)
-        return skim.label(arr, 8, return_num=False)
+        return labeling.label(arr, return_num=False)
 
     def image_array(self):
         return np.asarray(self.image)
@@ -333,13 +386,17 @@ class Straditizer(LabelSelection):
         """
         Parameters
         ----------
-        image: PIL.Image.Image or np.ndarray
+        image: str, PIL.Image.Image or np.ndarray
             The image file to process. A numpy array should be 3D with shape
             ``(Y, X, 4)``, where the last channel [..., -1] should represent
             the alpha channel. A PIL.Image.Image will be converted to a
-            RGBA image (if not already)
+            RGBA image (if not already). A path is read with the
+            :func:`straditize.image_io.read_image` function
         ax: matplotlib.axes.Axes
             The matplotlib axes. If None, a new one will be created
+        plot: bool
+            If False, the image is not plotted and the straditizer is
+            :attr:`headless`
         attrs: dict or :class:`pandas.DataFrame`
             The attributes for this straditizer
         """
@@ -352,16 +409,17 @@ class Straditizer(LabelSelection):
             self.attrs = attrs
         if isinstance(image, six.string_types):
             self.set_attr('image_file', image)
-            with Image.open(image) as _image:
-                image = Image.fromarray(np.array(_image.convert('RGBA')),
-                                        'RGBA')
-        try:
-            mode = image.mode
-        except AttributeError:
+            image = image_io.read_image(image)
+        # np.memmap arrays have a mode attribute, too
+        mode = None if isinstance(image, np.ndarray) else getattr(
+            image, 'mode', None)
+        if mode is None:
+            if image_io.is_large(np.shape(image)):
+                self.image_pyramid = image_io.ImagePyramid(image)
+            # for a contiguous uint8 array, the image shares the memory
             image = Image.fromarray(image, mode='RGBA')
-        else:
-            if mode != 'RGBA':
-                image = image.convert('RGBA')
+        elif mode != 'RGBA':
+            image = image.convert('RGBA')
         self.image = image
         self.ax = ax
         if plot:
@@ -372,6 +430,11 @@ class Straditizer(LabelSelection):
         self.remove_callbacks = {'image_array': [self.update_image]}
         self._done_tasks = set()
 
+    def _instrumentation_info(self):
+        """The input size for the :mod:`straditize.instrumentation`"""
+        return {'image_size': self.image.size}
+
+    @instrumented
     def reset_image(self, image, reader=False):
         """Reset the straditizer image
 
@@ -392,6 +455,7 @@ class Straditizer(LabelSelection):
                 image = image.convert('RGBA')
 
         self.image = image
+        self.image_pyramid = None
         if self.plot_im is not None:
             self.plot_im.set_array(image)
             if self.magni is not None:
@@ -421,9 +485,14 @@ class Straditizer(LabelSelection):
         self.ax = ax
         extent = [0] + list(np.shape(self.image)[:2][::-1]) + [0]
         kwargs.setdefault('extent', extent)
-        self.plot_im = ax.imshow(self.image, **kwargs)
+        # large images are displayed with the levels of an image pyramid
+        import straditize.display as display
+        self.plot_im = display.imshow(ax, self.image,
+                                      pyramid=self.image_pyramid, **kwargs)
         ax.grid(False)
-        self.magni = Magnifier(ax, image=self.image, **kwargs)
+        self.magni = Magnifier(ax, image=self.image,
+                               pyramid=getattr(self.plot_im, 'pyramid', None),
+                               **kwargs)
         if self._orig_format_coord is None:
             self._orig_format_coord = ax.format_coord
             ax.format_coord = format_coord_func(ax, weakref.ref(self))
@@ -511,6 +580,7 @@ class Straditizer(LabelSelection):
              '_data_xlim': self._data_xlim, '_data_ylim': self._data_ylim,
              '_yaxis_px_orig': self._yaxis_px_orig,
              'yaxis_data': self.yaxis_data,
+             'yaxis_scale': self.yaxis_scale,
              '_colnames_reader': self._colnames_reader,
              '_done_tasks': self._done_tasks,
              }
@@ -536,6 +606,7 @@ class Straditizer(LabelSelection):
             'long_name': 'Tasks that are marked as done by the user'},
         }
 
+    @instrumented
     def to_dataset(self, ds=None):
         """All the necessary data as a :class:`xarray.Dataset`
 
@@ -569,6 +640,7 @@ class Straditizer(LabelSelection):
             self.create_variable(
                 ds, 'yaxis_translation',
                 np.vstack([self._yaxis_px_orig, self.yaxis_data]))
+            ds['yaxis_translation'].attrs['scale'] = self.yaxis_scale
         if self.data_reader is not None:
             self.data_reader.to_dataset(ds)
         if self.colnames_reader is not None:
@@ -588,6 +660,7 @@ class Straditizer(LabelSelection):
         return vname
 
     @classmethod
+    @instrumented
     def from_dataset(cls, ds, ax=None, plot=True):
         """Create a new :class:`Straditizer` from a dataset
 
@@ -605,6 +678,8 @@ class Straditizer(LabelSelection):
                 px_data='pixel').values
             stradi.yaxis_data = ds['yaxis_translation'].sel(
                 px_data='data').values
+            stradi.yaxis_scale = ds['yaxis_translation'].attrs.get(
+                'scale', 'linear')
         if 'reader_image' in ds:
             parent = None
             x0, x1 = map(int, stradi.data_xlim)
@@ -633,6 +708,7 @@ class Straditizer(LabelSelection):
         if self.magni is not None and self.magni.ax is not None:
             self.magni.ax.figure.canvas.draw()
 
+    @instrumented
     def guess_data_lims(self, fraction=0.7):
         """Guess the limits of the diagram part
 
@@ -681,7 +757,7 @@ class Straditizer(LabelSelection):
         # now check the right corner, whether the object extents further to the
         # right
         if mask[ymax, xmax]:
-            labeled = skim.label(arr, 8, return_num=False)
+            labeled = labeling.label(arr, return_num=False)
             label = labeled[ymax, xmax]
             xmax = np.where(labeled[ymin:ymax+1] == label)[1].max()
 
@@ -903,6 +979,7 @@ class Straditizer(LabelSelection):
             for x0, x1 in bounds]
         self.create_magni_marks(self.marks)
 
+    @instrumented
     def align_columns(self):
         """Shift the columns after the marks have been moved
 
@@ -914,6 +991,39 @@ class Straditizer(LabelSelection):
         self.data_reader.shift_vertical(shifts)
         self.remove_marks()
 
+    def yaxis_transform(self, inverse=False):
+        """The affine transformation between pixel and data coordinates
+
+        Parameters
+        ----------
+        inverse: bool
+            If True, get the transformation from data to pixel coordinates
+
+        Returns
+        -------
+        float
+            The slope of the transformation
+        float
+            The intercept of the transformation
+
+        Notes
+        -----
+        For a logarithmic :attr:`yaxis_scale`, the data coordinates are the
+        decadal logarithm of the data"""
+        y_px = self.yaxis_px
+        y_data = np.asarray(self.yaxis_data, dtype=float)
+        if self.yaxis_scale == 'log':
+            y_data = np.log10(y_data)
+        diff_px = np.diff(y_px)[0]
+        diff_data = np.diff(y_data)[0]
+        if inverse:
+            slope = diff_px / diff_data
+            intercept = y_px[0] - slope * y_data[0]
+        else:
+            slope = diff_data / diff_px
+            intercept = y_data[0] - slope * y_px[0]
+        return slope, intercept
+
     def px2data_y(self, coord):
         """Transform the pixel coordinates into data coordinates
 
@@ -926,13 +1036,11 @@ class Straditizer(LabelSelection):
         -------
         np.ndarray
             The numpy array with transformed coordinates"""
-        y_px = self.yaxis_px
-        y_data = self.yaxis_data
-        diff_px = np.diff(y_px)[0]
-        diff_data = np.diff(y_data)[0]
-        slope = diff_data / diff_px
-        intercept = y_data[0] - slope * y_px[0]
-        return intercept + slope * coord
+        slope, intercept = self.yaxis_transform()
+        ret = intercept + slope * coord
+        if self.yaxis_scale == 'log':
+            ret = 10 ** ret
+        return ret
 
     def data2px_y(self, coord):
         """Transform the data coordinates into pixel coordinates
@@ -946,12 +1054,9 @@ class Straditizer(LabelSelection):
         -------
         np.ndarray
             The numpy array with transformed coordinates"""
-        y_px = self.yaxis_px
-        y_data = self.yaxis_data
-        diff_px = np.diff(y_px)[0]
-        diff_data = np.diff(y_data)[0]
-        slope = diff_px / diff_data
-        intercept = y_px[0] - slope * y_data[0]
+        slope, intercept = self.yaxis_transform(inverse=True)
+        if self.yaxis_scale == 'log':
+            coord = np.log10(coord)
         return intercept + slope * coord
 
     def remove_marks(self):
@@ -960,7 +1065,7 @@ class Straditizer(LabelSelection):
             for m in self.marks:
                 m.remove()
             self.marks = None
-        for l in self.ax.lines[:]:
+        for l in getattr(self.ax, 'lines', [])[:]:
             if (l.get_label() or '').startswith('cross_mark'):
                 l.remove()
         if self.magni is not None:
@@ -982,6 +1087,7 @@ class Straditizer(LabelSelection):
         if hasattr(self, '_new_mark'):
             del self._new_mark
 
+    @instrumented
     def init_reader(self, reader_type='area', ax=None, **kwargs):
         x0, x1 = map(int, self.data_xlim)
         y0, y1 = map(int, self.data_ylim)
@@ -993,6 +1099,8 @@ class Straditizer(LabelSelection):
 
         kwargs.setdefault('plot_background', True)
         ax = ax or self.ax
+        # do not create a figure for the reader of a headless straditizer
+        kwargs.setdefault('plot', ax is not None)
         self.data_reader = binary.readers[reader_type](
             self.image.crop([x0, y0, x1, y1]), ax=ax, extent=[x0, x1, y1, y0],
             magni=self.magni, **kwargs)
@@ -1003,12 +1111,18 @@ class Straditizer(LabelSelection):
             df.index = self.px2data_y(df.index.values)
         except ValueError:
             pass
-        try:
-            for i, col in enumerate(df.columns):
-                df.loc[:, col] = self.get_reader_for_column(col).px2data_x(
-                    df[col].values)
-        except ValueError:
-            pass
+        # transform all columns at once with the table of the x-axes
+        slopes, intercepts, log = self.data_reader.xaxis_transforms(
+            df.columns)
+        if (slopes != 1).any() or intercepts.any() or log.any():
+            vals = df.values.astype(float)
+            ret = intercepts + slopes * vals
+            if log.any():
+                with np.errstate(over='ignore'):
+                    ret[:, log] = 10 ** ret[:, log]
+            occurences_value = self.data_reader.occurences_value
+            ret[vals == occurences_value] = occurences_value
+            df = pd.DataFrame(ret, index=df.index, columns=df.columns)
         df.index.name = self.get_attr('Y-axis name') or None
         df.columns = self.colnames_reader.column_names
         return df
@@ -1023,9 +1137,7 @@ class Straditizer(LabelSelection):
         self.ax.set_ylim(*self.data_ylim[::-1])
 
     def get_reader_for_column(self, col):
-            return next(
-                child for child in self.data_reader.iter_all_readers
-                if not child.is_exaggerated and col in child.columns)
+            return self.data_reader.get_reader_for_col(col)
 
     def marks_for_column_starts(self, threshold=None):
         def new_mark(pos):
@@ -1147,9 +1259,11 @@ class Straditizer(LabelSelection):
         if remove:
             self.remove_marks()
 
+    @instrumented
     def digitize_diagram(self):
         self.data_reader.digitize()
-        self.data_reader.plot_full_df()
+        if not self.data_reader.headless:
+            self.data_reader.plot_full_df()
 
     def _get_mark_from_event(self, event, buttons=[3]):
         """Get a mark from a mouse event"""
@@ -1212,6 +1326,7 @@ class Straditizer(LabelSelection):
             self.magni, self.magni_marks)
         return ret
 
+    @instrumented
     def marks_for_samples(self):
         def _new_mark(pos, artists=[]):
             ret = cm.CrossMarks(
@@ -1300,6 +1415,7 @@ class Straditizer(LabelSelection):
             except AttributeError:
                 pass
 
+    @instrumented
     def marks_for_samples_sep(self, nrows=3):
         def _new_mark(pos, ax, artists=[]):
             idx_h = all_idx_h[ax]
@@ -1422,6 +1538,7 @@ class Straditizer(LabelSelection):
                 pass
 
     @classmethod
+    @instrumented
     def load(cls, fname, ax=None, plot=True):
         if isinstance(fname, six.string_types):
             with open(fname, 'rb') as f:
@@ -1444,14 +1561,15 @@ class Straditizer(LabelSelection):
         return obj
 
     def close(self):
-        import matplotlib.pyplot as plt
         self.remove_marks()
         self.remove_data_box()
         try:
             self.plot_im.remove()
         except (AttributeError, ValueError):
             pass
-        plt.close(self.ax.figure)
+        if self.ax is not None:
+            import matplotlib.pyplot as plt
+            plt.close(self.ax.figure)
         if self.magni is not None:
             self.magni.close()
         self.image.close()
@@ -1478,6 +1596,7 @@ class Straditizer(LabelSelection):
                 except AttributeError:
                     pass
 
+    @instrumented
     def save(self, fname):
         """Dump the :class:`Straditizer` instance to a file
 
@@ -1505,6 +1624,7 @@ class Straditizer(LabelSelection):
         arr = arr.copy()
         arr[mask] = 0
         self.image = Image.fromarray(arr, self.image.mode)
-        self.plot_im.set_array(arr)
+        if self.plot_im is not None:
+            self.plot_im.set_array(arr)
         if self.magni is not None:
             self.magni.plot_image.set_array(arr)
@@ -0,0 +1,641 @@
+# -*- coding: utf-8 -*-
+"""Synthetic stratigraphic diagrams for testing and benchmarking
+
+This module defines the :class:`SyntheticDiagram` class that generates
+artificial diagrams together with the data that has been used to draw them.
+Area, bar, rounded bar, line and stacked area diagrams are supported, with
+optional axes, ticks, hatching, exaggerations and noise.
+
+The images are computed with numpy broadcasting and can be created either at
+once (see :meth:`SyntheticDiagram.get_binary` and
+:meth:`SyntheticDiagram.get_rgba`) or streamed tile by tile (see
+:meth:`SyntheticDiagram.iter_tiles`) to create very large diagrams.
+
+**Disclaimer**
+
+Copyright (C) 2018-2019  Philipp S. Sommer
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+import os.path as osp
+import numpy as np
+import pandas as pd
+from straditize.common import docstrings
+
+
+#: The diagram types that can be generated by the :class:`SyntheticDiagram`
+kinds = ['area', 'bars', 'rounded bars', 'line', 'stacked']
+
+# the codes for the different features in the diagram
+_BACKGROUND = 0
+_AXES = 1
+_EXAGGERATIONS = 2
+_NOISE = 3
+_DATA = 4
+
+
+def get_numbers(n, summed=100):
+    """Get `n` random integers that sum up to `summed`
+
+    Parameters
+    ----------
+    n: int
+        The number of integers
+    summed: int
+        The sum of the integers
+
+    Returns
+    -------
+    np.ndarray
+        The integer array of length `n`"""
+    a = np.random.random(n)
+    a *= summed / a.sum()
+    ret = np.round(a).astype(int)
+    dev = ret.sum() - summed
+    if dev < 0:
+        for i in range(-dev):
+            ret[np.random.randint(0, n - 1)] += 1
+    elif dev > 0:
+        for i in range(dev):
+            ret[np.random.randint(0, n - 1)] -= 1
+    return ret
+
+
+def _pixel_hash(rows, cols, seed):
+    """Pseudo-random numbers in [0, 1) for each pixel
+
+    Other than a random number generator, the result only depends on the
+    position of the pixel (and the `seed`), not on the part of the image that
+    is generated."""
+    h = ((rows.astype(np.uint64)[:, np.newaxis] * np.uint64(73856093)) ^
+         (cols.astype(np.uint64)[np.newaxis] * np.uint64(19349663)) ^
+         np.uint64((seed * 83492791) & 0xffffffff))
+    h &= np.uint64(0xffffffff)
+    for _ in range(2):
+        h = ((h >> np.uint64(16)) ^ h) * np.uint64(0x45d9f3b)
+        h &= np.uint64(0xffffffff)
+    h = (h >> np.uint64(16)) ^ h
+    return h.astype(float) / 2.0 ** 32
+
+
+class SyntheticDiagram(object):
+    """A synthetic stratigraphic diagram
+
+    See the :meth:`from_random` method for a random generation of a new
+    :class:`SyntheticDiagram`."""
+
+    #: The type of the diagram. One of :attr:`kinds`
+    kind = 'area'
+
+    #: The fraction of pixels that are flipped randomly
+    noise = 0
+
+    #: The seed for the :attr:`noise`
+    seed = 0
+
+    #: Whether to draw y-axes at the column starts and an x-axis at the
+    #: bottom of the diagram
+    axes = False
+
+    #: The line width of the x-axis
+    xaxis_width = 3
+
+    #: The distance between two ticks at the y-axes in pixels. If 0, no ticks
+    #: are drawn
+    ticks = 0
+
+    #: The length of the ticks in pixels
+    tick_length = 4
+
+    #: The distance between two hatching lines. If 0, the areas are filled
+    hatching = 0
+
+    #: The factor for exaggerations that are drawn behind the data. If 0, no
+    #: exaggerations are drawn
+    exag_factor = 0
+
+    #: The line width for the ``'line'`` diagrams
+    linewidth = 2
+
+    #: The radius of the rounded bars
+    radius = 3
+
+    @docstrings.get_sectionsf('SyntheticDiagram')
+    def __init__(self, df, full_df, col_starts=None, col_ends=None,
+                 width=None, kind='area', **kwargs):
+        """
+        Parameters
+        ----------
+        df: pandas.DataFrame
+            The data at the samples
+        full_df: pandas.DataFrame
+            The data for every pixel row
+        col_starts: np.ndarray
+            The starts of the columns in pixels. If None, it is estimated from
+            the `full_df`
+        col_ends: np.ndarray
+            The ends of the columns in pixels
+        width: int
+            The width of the diagram in pixels. If None, it is estimated from
+            the `full_df`
+        kind: str
+            The type of the diagram. One of :attr:`kinds`
+
+        Other Parameters
+        ----------------
+        ``**kwargs``
+            Any other attribute of this class, i.e. :attr:`noise`,
+            :attr:`seed`, :attr:`axes`, :attr:`xaxis_width`, :attr:`ticks`,
+            :attr:`tick_length`, :attr:`hatching`, :attr:`exag_factor`,
+            :attr:`linewidth` and :attr:`radius`"""
+        if kind not in kinds:
+            raise ValueError("Unknown kind %r. Possible kinds are %s" % (
+                kind, ', '.join(kinds)))
+        self.df = df
+        self.full_df = full_df
+        self.width = width
+        self.kind = kind
+        for key, val in kwargs.items():
+            if not hasattr(self.__class__, key):
+                raise TypeError(
+                    "__init__() got an unexpected keyword argument %r" % key)
+            setattr(self, key, val)
+        if col_starts is None:
+            self.estimate_col_starts()
+        else:
+            self.col_starts = col_starts
+            self.col_ends = col_ends
+
+    @property
+    def height(self):
+        """The height of the diagram (including the x-axis) in pixels"""
+        return len(self.full_df) + (self.xaxis_width if self.axes else 0)
+
+    def estimate_col_starts(self):
+        """Estimate the column starts and ends from the :attr:`full_df`"""
+        if self.kind == 'stacked':
+            total = self.full_df.values.sum(axis=1).max()
+            ncols = self.full_df.shape[1]
+            self.col_starts = np.zeros(ncols, dtype=int)
+            self.col_ends = np.repeat(total + 5, ncols)
+            return
+        col_bounds = np.concatenate([[0], self.full_df.values.max(axis=0) + 5])
+        col_bounds = col_bounds.cumsum()
+        self.col_starts = col_bounds[:-1]
+        self.col_ends = col_bounds[1:]
+
+    def _get_width(self, width=None):
+        width = width or self.width
+        if not width:
+            values = self.full_df.values
+            if self.kind == 'stacked':
+                width = self.col_starts[0] + values.sum(axis=1).max() + 5
+            else:
+                width = self.col_starts[-1] + values[:, -1].max() + 5
+            self.width = width
+        return width
+
+    def _get_pixel_values(self, rows):
+        """Get the drawn extent of the columns in the given data rows
+
+        Returns
+        -------
+        np.ndarray
+            The first pixel of each column relative to the column start
+        np.ndarray
+            The last pixel (+1) of each column relative to the column start"""
+        values = self.full_df.values
+        if values.ndim == 1:
+            values = values[:, np.newaxis]
+        vals = values[rows].astype(int)
+        if self.kind == 'stacked':
+            vmax = vals.cumsum(axis=1)
+            return vmax - vals, vmax
+        if self.kind == 'line':
+            prev = values[np.maximum(rows - 1, 0)].astype(int)
+            vmin = np.maximum(np.minimum(vals, prev) - self.linewidth, 0)
+            vmax = np.maximum(vals, prev)
+            return vmin, np.where(vals > 0, vmax, 0)
+        if self.kind == 'rounded bars' and self.radius:
+            # reduce the bars close to their ends following a circle
+            r = self.radius
+            dist = self._bar_edge_distance()[rows]
+            reduction = np.where(
+                dist < r, r - np.sqrt(np.maximum(
+                    r ** 2 - (r - dist - 0.5) ** 2, 0)), 0)
+            vals = np.where(vals > 0, np.maximum(
+                vals - np.round(reduction[:, np.newaxis]).astype(int), 1), 0)
+        return np.zeros_like(vals), vals
+
+    def _bar_edge_distance(self):
+        """The distance of each row to the closest end of the bar"""
+        try:
+            return self._bar_dist
+        except AttributeError:
+            pass
+        empty = ~self.full_df.values.astype(bool).any(axis=1)
+        n = len(empty)
+        idx = np.arange(n)
+        # distance to the previous and next empty row (or image boundary)
+        prev = np.where(empty, idx, -1)
+        prev = np.maximum.accumulate(prev)
+        nxt = np.where(empty, idx, n)
+        nxt = np.minimum.accumulate(nxt[::-1])[::-1]
+        self._bar_dist = np.minimum(idx - prev, nxt - idx) - 1
+        return self._bar_dist
+
+    def get_codes(self, start=0, stop=None, border=0, width=None):
+        """Get the features in the diagram for a range of rows
+
+        Parameters
+        ----------
+        start: int
+            The first row of the image (including the `border`)
+        stop: int
+            The last row (+1) of the image. If None, the full image is used
+        border: int
+            The width of the empty border around the diagram
+        width: int
+            The width of the diagram (without border). If None, the
+            :attr:`width` is used or estimated
+
+        Returns
+        -------
+        np.ndarray of dtype uint8
+            An array of shape ``(stop - start, width + 2 * border)`` with 0
+            for background, 1 for axes and ticks, 2 for exaggerations, 3 for
+            noise and ``4 + i`` for the data of the ``i``-th column (or 4 for
+            all columns, if the :attr:`kind` is not ``'stacked'``)"""
+        width = self._get_width(width)
+        nrows = len(self.full_df)
+        total_height = self.height + 2 * border
+        if stop is None:
+            stop = total_height
+        stop = min(stop, total_height)
+        img_rows = np.arange(start, stop)
+        ret = np.zeros((len(img_rows), width + 2 * border), dtype=np.uint8)
+        data_rows = img_rows - border
+        in_data = slice(
+            min(max(border - start, 0), len(img_rows)),
+            max(min(border + nrows - start, len(img_rows)), 0))
+        rows = data_rows[in_data]
+        sub = ret[in_data]
+        col_starts = np.asarray(self.col_starts).astype(int) + border
+        stacked = self.kind == 'stacked'
+
+        if len(rows):
+            vmin, vmax = self._get_pixel_values(rows)
+            # exaggerations
+            if self.exag_factor and not stacked:
+                col_widths = np.asarray(self.col_ends) - self.col_starts
+                exag = np.minimum(np.round(
+                    self.exag_factor * vmax).astype(int), col_widths)
+                self._draw(sub, col_starts, np.zeros_like(exag), exag,
+                           _EXAGGERATIONS)
+            self._draw(sub, col_starts, vmin, vmax,
+                       _DATA + np.arange(vmax.shape[1]) if stacked else _DATA,
+                       rows if self.hatching else None)
+
+        if self.axes:
+            ncols = 1 if stacked else len(col_starts)
+            axes_cols = col_starts[:ncols]
+            axes_cols = axes_cols[axes_cols < ret.shape[1]]
+            sub[:, axes_cols] = _AXES
+            if self.ticks:
+                tick_rows = np.where(rows % self.ticks == 0)[0]
+                for col in axes_cols:
+                    sub[tick_rows, max(col - self.tick_length, 0):col] = \
+                        _AXES
+            xaxis = (data_rows >= nrows) & (data_rows < self.height)
+            ret[xaxis, col_starts[0]:width + border] = _AXES
+
+        if self.noise:
+            cols = np.arange(ret.shape[1])
+            flip = _pixel_hash(img_rows, cols, self.seed) < self.noise
+            ret[flip] = np.where(ret[flip] == _BACKGROUND, _NOISE,
+                                 _BACKGROUND)
+        return ret
+
+    def _draw(self, arr, col_starts, vmin, vmax, code, rows=None):
+        """Draw the columns into `arr` via broadcasting"""
+        codes = np.broadcast_to(code, (vmax.shape[1], ))
+        if self.kind == 'stacked':
+            col_starts = np.repeat(col_starts[0], vmax.shape[1])
+        for col, (start, c) in enumerate(zip(col_starts, codes)):
+            lo = vmin[:, col]
+            hi = vmax[:, col]
+            first = lo.min(initial=0)
+            extent = min(hi.max(initial=0), arr.shape[1] - start)
+            if extent <= first:
+                continue
+            offsets = np.arange(first, extent)[np.newaxis]
+            mask = (offsets >= lo[:, np.newaxis]) & (
+                offsets < hi[:, np.newaxis])
+            if rows is not None and self.kind != 'line':
+                # keep the outline and draw diagonal lines inside
+                outline = (offsets == hi[:, np.newaxis] - 1) | (offsets == 0)
+                diag = (rows[:, np.newaxis] + offsets) % self.hatching == 0
+                mask &= outline | diag
+            view = arr[:, start + first:start + extent]
+            view[mask] = c
+
+    def get_binary(self, border=0, width=None):
+        """Get the binary image of the diagram
+
+        Parameters
+        ----------
+        border: int
+            The width of the empty border around the diagram
+        width: int
+            The width of the diagram (without border). If None, the
+            :attr:`width` is used or estimated
+
+        Returns
+        -------
+        np.ndarray of ndim 2
+            The binary image of integer type"""
+        return (self.get_codes(border=border, width=width) > 0).astype(int)
+
+    def get_palette(self, color=[0, 0, 0], exag_color=[255, 0, 0],
+                    axes_color=[0, 0, 0]):
+        """Get the RGBA colors for the codes of the :meth:`get_codes` method
+
+        Parameters
+        ----------
+        color: list of int or list of lists
+            The RGB color of the data. For the ``'stacked'`` :attr:`kind`,
+            this can also be one color per column. By default, the colors
+            of the matplotlib ``'tab10'`` colormap are used for stacked
+            diagrams
+        exag_color: list of int
+            The RGB color of the exaggerations
+        axes_color: list of int
+            The RGB color of the axes, ticks and noise
+
+        Returns
+        -------
+        np.ndarray of dtype uint8
+            The palette with shape ``(N, 4)``"""
+        ncols = self.full_df.shape[1] if np.ndim(self.full_df) == 2 else 1
+        colors = np.asarray(color)
+        if self.kind == 'stacked' and colors.ndim == 1:
+            if np.all(colors == 0):
+                from matplotlib.cm import get_cmap
+                cmap = get_cmap('tab10')
+                colors = np.round(
+                    cmap(np.arange(ncols) % 10)[:, :3] * 255).astype(int)
+        colors = np.broadcast_to(colors, (max(ncols, 1), 3))
+        ret = np.zeros((_DATA + len(colors), 4), dtype=np.uint8)
+        ret[_AXES, :3] = axes_color
+        ret[_EXAGGERATIONS, :3] = exag_color
+        ret[_NOISE, :3] = axes_color
+        ret[_DATA:, :3] = colors
+        ret[1:, 3] = 255
+        return ret
+
+    def get_rgba(self, color=[0, 0, 0], border=0, width=None):
+        """Get the RGBA image of the diagram
+
+        Parameters
+        ----------
+        color: list of int
+            The RGB color of the data (see :meth:`get_palette`)
+        border: int
+            The width of the empty border around the diagram
+        width: int
+            The width of the diagram (without border). If None, the
+            :attr:`width` is used or estimated
+
+        Returns
+        -------
+        np.ndarray of dtype uint8
+            The RGBA image with shape ``(height, width, 4)``"""
+        return self.get_palette(color)[self.get_codes(border=border,
+                                                      width=width)]
+
+    def get_rgba_image(self, *args, **kwargs):
+        """Get the RGBA image as a :class:`PIL.Image.Image`
+
+        Parameters
+        ----------
+        ``*args,**kwargs``
+            Any parameter for the :meth:`get_rgba` method"""
+        from PIL import Image
+        arr = self.get_rgba(*args, **kwargs)
+        return Image.fromarray(arr, 'RGBA')
+
+    def iter_tiles(self, tile_height=1024, border=0, width=None, rgba=False,
+                   color=[0, 0, 0]):
+        """Generate the diagram tile by tile
+
+        This method can be used to create diagrams that are too large to
+        hold them (multiple times) in memory.
+
+        Parameters
+        ----------
+        tile_height: int
+            The number of rows in one tile
+        border: int
+            The width of the empty border around the diagram
+        width: int
+            The width of the diagram (without border). If None, the
+            :attr:`width` is used or estimated
+        rgba: bool
+            If True, yield RGBA tiles, otherwise binary tiles
+        color: list of int
+            The color of the data if `rgba` is True (see :meth:`get_palette`)
+
+        Yields
+        ------
+        int
+            The first row of the tile in the image
+        np.ndarray
+            The binary (or RGBA) tile"""
+        total_height = self.height + 2 * border
+        palette = self.get_palette(color) if rgba else None
+        for start in range(0, total_height, tile_height):
+            codes = self.get_codes(start, start + tile_height, border, width)
+            if rgba:
+                yield start, palette[codes]
+            else:
+                yield start, (codes > 0).astype(int)
+
+    @staticmethod
+    def interpolate(df, height, kind='area'):
+        """Interpolate the samples to every pixel row
+
+        Parameters
+        ----------
+        df: pandas.DataFrame
+            The data at the samples. The index must be the pixel rows of the
+            samples
+        height: int
+            The number of pixel rows
+        kind: str
+            The type of the diagram. For bar diagrams (``'bars'`` and
+            ``'rounded bars'``) every row gets the value of the closest
+            sample and the bars are separated by one empty row. Otherwise the
+            data is interpolated linearly
+
+        Returns
+        -------
+        pandas.DataFrame
+            The data for every pixel row"""
+        locs = df.index.values.astype(float)
+        vals = df.values.astype(float)
+        rows = np.arange(height)
+        if kind in ['bars', 'rounded bars']:
+            mids = ((locs[1:] + locs[:-1]) // 2).astype(int)
+            interpolated = vals[np.searchsorted(mids, rows, side='right')]
+            interpolated[mids] = 0
+        else:
+            i = np.clip(np.searchsorted(locs, rows, side='right') - 1,
+                        0, max(len(locs) - 2, 0))
+            j = np.minimum(i + 1, len(locs) - 1)
+            dx = np.where(locs[j] > locs[i], locs[j] - locs[i], 1)
+            t = np.clip((rows - locs[i]) / dx, 0, 1)[:, np.newaxis]
+            interpolated = vals[i] + t * (vals[j] - vals[i])
+        return pd.DataFrame(np.round(interpolated).astype(int),
+                            index=pd.Index(rows), columns=df.columns)
+
+    @classmethod
+    def from_random(cls, height, width, ncols, nsamples, kind='area',
+                    mindiff=3, seed=None, **kwargs):
+        """Create a new diagram by randomly generating values
+
+        Parameters
+        ----------
+        height: int
+            The height of the data part of the diagram
+        width: int
+            The width of the diagram
+        ncols: int
+            The number of columns (taxa)
+        nsamples: int
+            The number of samples
+        kind: str
+            The type of the diagram. One of :attr:`kinds`
+        mindiff: int
+            The minimal distance between two samples in pixels
+        seed: int
+            The seed for the random number generator
+        ``**kwargs``
+            Any other parameter for the :class:`SyntheticDiagram` (e.g.
+            `noise`, `axes`, `ticks`, `hatching` or `exag_factor`)
+
+        Returns
+        -------
+        SyntheticDiagram
+            The new diagram"""
+        rng = np.random.RandomState(seed)
+        nsamples = min(nsamples, height // mindiff + 1)
+        if kind == 'stacked':
+            # every row sums up to about 90% of the width
+            vals = rng.dirichlet(np.ones(ncols), nsamples) * 0.9 * (
+                width - 5)
+            vals = np.floor(vals).astype(int)
+            col_starts = np.zeros(ncols, dtype=int)
+            col_ends = np.repeat(width, ncols)
+        else:
+            # the maximum width of each column, separated by two pixels
+            weights = rng.uniform(0.5, 1.5, ncols)
+            maxvals = np.maximum(np.floor(
+                weights / weights.sum() * (width - ncols * 2)).astype(int), 1)
+            vals = np.round(rng.uniform(0, 1, (nsamples, ncols)) *
+                            maxvals).astype(int)
+            col_starts = np.r_[0, np.cumsum(maxvals[:-1] + 2)]
+            col_ends = col_starts + maxvals
+        # distribute the samples with a minimum distance of mindiff
+        free = height - 1 - (nsamples - 1) * mindiff
+        samples = np.sort(rng.randint(0, max(free, 0) + 1, nsamples))
+        samples = samples - samples[0] + np.arange(nsamples) * mindiff
+        if nsamples > 1:
+            samples[-1] = height - 1
+        df = pd.DataFrame(vals, index=pd.Index(samples, name='height'),
+                          columns=np.arange(ncols))
+        full_df = cls.interpolate(df, height, kind)
+        kwargs.setdefault('seed', 0 if seed is None else seed)
+        return cls(df, full_df, col_starts, col_ends, width, kind=kind,
+                   **kwargs)
+
+    def export(self, dirname='.', base=''):
+        """Export the dataframes and arrays associated with this sample
+
+        This saves the attributes of this sample into different files, namely
+
+        data.csv
+            containing the :attr:`df` DataFrame
+        full_data.csv
+            containing the :attr:`full_df` DataFrame
+        column_bounds.dat
+            containing the :attr:`column_starts` and :attr:`column_ends` arrays
+
+
+        Parameters
+        ----------
+        dirname: str
+            The path of the output directory
+        base: str
+            The base string for the files. It will then be prepended to the
+            filenames listed above
+
+        Returns
+        -------
+        str
+            The file name for the :attr:`df` attribute
+            (``dirname + '/' + base + 'data.csv'``)
+        str
+            The file name for the :attr:`full_df` attribute
+            (``dirname + '/' + base + 'full_data.csv'``)
+        str
+            The file name for the column bounds
+            (``dirname + '/' + base + 'column_bounds.dat'``)
+
+        See Also
+        --------
+        from_files: A constructor of the :class:`SyntheticDiagram` from the
+        files exported by this method"""
+        df_file = osp.join(dirname, base + 'data.csv')
+        full_df_file = osp.join(dirname, base + 'full_data.csv')
+        bounds_file = osp.join(dirname, base + 'column_bounds.dat')
+        self.df.to_csv(df_file)
+        self.full_df.to_csv(full_df_file)
+        np.savetxt(
+            bounds_file,
+            np.vstack([self.col_starts, self.col_ends]).T, fmt='%i')
+        return df_file, full_df_file, bounds_file
+
+    @classmethod
+    def from_files(cls, df_file, full_df_file, bounds_file=None, *args,
+                   **kwargs):
+        """Create a new diagram from the files of the :meth:`export` method
+
+        Parameters
+        ----------
+        df_file: str
+            The csv file with the data at the samples
+        full_df_file: str
+            The csv file with the data for every pixel row
+        bounds_file: str
+            The file with the column starts and ends
+        ``*args,**kwargs``
+            Any other parameter for the :class:`SyntheticDiagram`"""
+        df = pd.read_csv(df_file, index_col=0)
+        full_df = pd.read_csv(full_df_file, index_col=0)
+        if bounds_file is not None:
+            bounds = np.loadtxt(bounds_file, dtype=int)
+            col_starts = bounds[:, 0]
+            col_ends = bounds[:, 1]
+            args = (col_starts, col_ends) + args
+        return cls(df, full_df, *args, **kwargs)
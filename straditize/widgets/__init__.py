@@ -268,6 +268,7 @@ class StraditizerWidgets(QWidget, DockMixin):
         from straditize.widgets.image_correction import (
             ImageRotator, ImageRescaler)
         from straditize.widgets.colnames import ColumnNamesManager
+        from straditize.widgets.instrumentation import InstrumentationControl
         self._straditizers = []
         super(StraditizerWidgets, self).__init__(*args, **kwargs)
         self.tree = QTreeWidget(parent=self)
@@ -339,6 +340,10 @@ class StraditizerWidgets(QWidget, DockMixin):
         self.marker_control = MarkerControl(self, item)
         self.add_info_button(item, 'marker_control.rst')
 
+        self.instrumentation_item = item = QTreeWidgetItem(0)
+        item.setText(0, 'Performance')
+        self.instrumentation = InstrumentationControl(self, item)
+
         # ---------------------------------------------------------------------
         # ----------------------------- Toolbars ------------------------------
         # ---------------------------------------------------------------------
@@ -580,6 +585,7 @@ class StraditizerWidgets(QWidget, DockMixin):
         self.image_rotator.refresh()
         self.image_rescaler.refresh()
         self.colnames_manager.refresh()
+        self.instrumentation.refresh()
         self.btn_reload_autosaved.setEnabled(bool(self.autosaved))
 
     def get_attr(self, stradi, attr):
@@ -53,6 +53,9 @@ class ColumnNamesManager(StraditizerControlBase, DockMixin,
     #: :attr:`straditize.colnames.ColNamesReader.rotated_image`
     im_rotated = None
 
+    #: The preview of the rotated image that is shown in :attr:`im_rotated`
+    _plotted_preview = None
+
     #: The rectangle to highlight a column (see :meth:`highlight_selected_col`)
     rect = None
 
@@ -480,13 +483,13 @@ class ColumnNamesManager(StraditizerControlBase, DockMixin,
         ret = self.straditizer is not None and getattr(
             self.straditizer.data_reader, '_column_starts', None) is not None
         if ret and w is self.btn_find:
-            from straditize.colnames import tesserocr
-            ret = tesserocr is not None and (
+            from straditize.colnames import _load_tesserocr
+            ret = _load_tesserocr() is not None and (
                 self.cb_find_all_cols.isChecked() or
                 self.current_col is not None)
         elif ret and w is self.btn_recognize:
-            from straditize.colnames import tesserocr
-            ret = tesserocr is not None and self.colpic is not None
+            from straditize.colnames import _load_tesserocr
+            ret = _load_tesserocr() is not None and self.colpic is not None
         return ret
 
     def toggle_dialog(self):
@@ -574,6 +577,7 @@ class ColumnNamesManager(StraditizerControlBase, DockMixin,
         except (AttributeError, ValueError):
             pass
         self.im_rotated = self.colpic_im = self.xc = self.yc = None
+        self._plotted_preview = None
 
     def set_xc_yc(self):
         """Set the x- and y-center before rotating or flipping"""
@@ -621,18 +625,21 @@ class ColumnNamesManager(StraditizerControlBase, DockMixin,
         ax = self.main_ax
         if not self.is_shown:
             return
-        elif self.im_rotated:
-            rotated = self.straditizer.colnames_reader.rotated_image
-            if np.all(self.im_rotated.get_array() == np.asarray(rotated)):
+        rotated, factor = self.colnames_reader.rotated_preview()
+        if self.im_rotated:
+            if self._plotted_preview is rotated:
                 return
             else:
                 try:
                     self.im_rotated.remove()
                 except ValueError:
                     pass
-        else:
-            rotated = self.straditizer.colnames_reader.rotated_image
-        self.im_rotated = ax.imshow(rotated)
+        # the preview might be downsampled, so we plot it with the extent of
+        # the full rotated image
+        xs, ys = np.asarray(rotated.size) * factor
+        self.im_rotated = ax.imshow(
+            rotated, extent=[-0.5, xs - 0.5, ys - 0.5, -0.5])
+        self._plotted_preview = rotated
         if self.xc is not None:
             dx = np.diff(ax.get_xlim()) / 2.
             dy = np.diff(ax.get_ylim()) / 2.
@@ -647,7 +654,8 @@ class ColumnNamesManager(StraditizerControlBase, DockMixin,
     def adjust_lims(self):
         """Adjust the limits of the :attr:`main_ax` to fill the entire figure
         """
-        size = xs, ys = np.array(self.im_rotated.get_size())
+        x0, x1, y0, y1 = self.im_rotated.get_extent()
+        size = xs, ys = np.abs([x1 - x0, y0 - y1])
         ax = self.main_ax
         figw, figh = ax.figure.get_figwidth(), ax.figure.get_figheight()
         woh = figw / figh  # width over height
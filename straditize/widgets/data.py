@@ -1576,7 +1576,8 @@ class DigitizingControl(StraditizerControlBase):
         reader = self.reader
         fraction = float(self.txt_exag_percentage.text().strip() or 0) / 100.
         absolute = int(self.txt_exag_absolute.text().strip() or 0)
-        reader.digitize_exaggerated(fraction=fraction, absolute=absolute)
+        reader.digitize_exaggerated(fraction=fraction, absolute=absolute,
+                                    incremental=True)
 
     def remove_xaxes(self):
         """Remove x-axes in the plot
@@ -2313,6 +2314,7 @@ class BarSplitter(QTreeWidget, StraditizerControlBase):
         def reset_values(col, indices):
             reader._full_df.loc[indices, col] = reader._full_df_orig.loc[
                 indices, col].max()
+            reader._update_column_versions([col])
 
         reader = self.straditizer.data_reader
         for item in map(self.topLevelItem, range(self.topLevelItemCount())):
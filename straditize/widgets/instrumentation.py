@@ -0,0 +1,227 @@
+"""A panel to display the timings of the straditize operations and to
+configure the parallel processing
+
+**Disclaimer**
+
+Copyright (C) 2018-2019  Philipp S. Sommer
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+import os
+from straditize.widgets import StraditizerControlBase
+from straditize.common import docstrings
+from straditize.instrumentation import recorder
+from straditize.binary import DataReader
+from psyplot_gui.compat.qtcompat import (
+    QWidget, QPushButton, QHBoxLayout, QVBoxLayout, QFileDialog, QLabel,
+    with_qt5)
+from PyQt5 import QtWidgets
+
+
+class InstrumentationControl(StraditizerControlBase, QWidget):
+    """A widget to record and display the timings of the operations
+
+    This control enables the :attr:`straditize.instrumentation.recorder` and
+    displays a summary of the recorded operations in the
+    :attr:`summary_table`"""
+
+    #: A QCheckBox to enable or disable the recording
+    cb_record = None
+
+    #: A QCheckBox to enable or disable the tracing of the memory
+    cb_trace_memory = None
+
+    #: A QTableWidget to display the summary of the recorded operations
+    summary_table = None
+
+    #: A QPushButton to refresh the :attr:`summary_table`
+    btn_refresh = None
+
+    #: A QPushButton to clear the records
+    btn_clear = None
+
+    #: A QPushButton to export the records
+    btn_export = None
+
+    #: A QSpinBox to set the number of workers for the parallel processing
+    #: (see :attr:`straditize.binary.DataReader.max_workers`)
+    sp_max_workers = None
+
+    columns = ['calls', 'wall_time', 'cpu_time', 'peak_memory']
+
+    @docstrings.dedent
+    def __init__(self, straditizer_widgets, item=None, *args, **kwargs):
+        """
+        Parameters
+        ----------
+        %(StraditizerControlBase.init_straditizercontrol.parameters)s"""
+        super(InstrumentationControl, self).__init__(*args, **kwargs)
+        self.cb_record = QtWidgets.QCheckBox('Record operations')
+        self.cb_record.setToolTip(
+            'Record the wall time, CPU time and peak memory of the '
+            'straditize operations')
+        self.cb_trace_memory = QtWidgets.QCheckBox('Trace memory')
+        self.cb_trace_memory.setToolTip(
+            'Measure the peak memory of the operations. Note that this slows '
+            'down the operations')
+        self.cb_trace_memory.setChecked(recorder.trace_memory)
+
+        self.summary_table = QtWidgets.QTableWidget(0, len(self.columns))
+        self.summary_table.setHorizontalHeaderLabels(
+            ['Calls', 'Wall time [s]', 'CPU time [s]', 'Peak memory [MB]'])
+        self.summary_table.setEditTriggers(
+            QtWidgets.QAbstractItemView.NoEditTriggers)
+
+        self.btn_refresh = QPushButton('Refresh')
+        self.btn_clear = QPushButton('Clear')
+        self.btn_export = QPushButton('Export')
+        self.btn_export.setToolTip(
+            'Export the records as JSON or in the Chrome trace format')
+
+        self.sp_max_workers = QtWidgets.QSpinBox()
+        self.sp_max_workers.setRange(0, os.cpu_count() or 1)
+        self.sp_max_workers.setSpecialValueText('all')
+        self.sp_max_workers.setValue(DataReader.max_workers)
+        self.sp_max_workers.setToolTip(
+            'The number of workers to digitize the columns and to find the '
+            'samples in parallel. Set it to 1 to disable the parallel '
+            'processing')
+
+        self.init_straditizercontrol(straditizer_widgets, item)
+
+        # ---------------------------------------------------------------------
+        # --------------------------- Layouts ---------------------------------
+        # ---------------------------------------------------------------------
+        cb_box = QHBoxLayout()
+        cb_box.addWidget(self.cb_record)
+        cb_box.addWidget(self.cb_trace_memory)
+        cb_box.addStretch(0)
+
+        btn_box = QHBoxLayout()
+        btn_box.addWidget(self.btn_refresh)
+        btn_box.addWidget(self.btn_clear)
+        btn_box.addStretch(0)
+        btn_box.addWidget(self.btn_export)
+
+        workers_box = QHBoxLayout()
+        workers_box.addWidget(QLabel('Parallel workers:'))
+        workers_box.addWidget(self.sp_max_workers)
+        workers_box.addStretch(0)
+
+        layout = QVBoxLayout()
+        layout.addLayout(workers_box)
+        layout.addLayout(cb_box)
+        layout.addWidget(self.summary_table)
+        layout.addLayout(btn_box)
+        self.setLayout(layout)
+
+        # ---------------------------------------------------------------------
+        # --------------------------- Connections -----------------------------
+        # ---------------------------------------------------------------------
+        self.cb_record.stateChanged.connect(self.toggle_recording)
+        self.cb_trace_memory.stateChanged.connect(self.toggle_trace_memory)
+        self.btn_refresh.clicked.connect(self.fill_table)
+        self.btn_clear.clicked.connect(self.clear)
+        self.btn_export.clicked.connect(self.export)
+        self.sp_max_workers.valueChanged.connect(self.set_max_workers)
+
+        self.refresh()
+
+    def toggle_recording(self, state):
+        """Enable or disable the recording"""
+        if state:
+            recorder.enable(self.cb_trace_memory.isChecked())
+        else:
+            recorder.disable()
+        self.refresh()
+
+    def set_max_workers(self, value):
+        """Set the number of workers for the parallel processing
+
+        Parameters
+        ----------
+        value: int
+            The number of workers. 0 means to use all processors"""
+        DataReader.max_workers = value
+
+    def toggle_trace_memory(self, state):
+        """Enable or disable the memory tracing"""
+        if recorder.enabled:
+            recorder.disable()
+            recorder.enable(bool(state))
+        else:
+            recorder.trace_memory = bool(state)
+
+    def clear(self):
+        """Remove all records"""
+        recorder.clear()
+        self.fill_table()
+
+    def fill_table(self):
+        """Fill the :attr:`summary_table` with the recorded operations"""
+        table = self.summary_table
+        if not recorder.records:
+            table.setRowCount(0)
+            self.refresh()
+            return
+        summary = recorder.summary()
+        table.setRowCount(len(summary))
+        table.setVerticalHeaderLabels(list(summary.index))
+        for i, (name, row) in enumerate(summary.iterrows()):
+            for j, col in enumerate(self.columns):
+                val = row[col]
+                if col == 'calls':
+                    s = '%i' % val
+                elif col == 'peak_memory':
+                    s = '' if val != val else '%1.1f' % (val / 2 ** 20)
+                else:
+                    s = '%1.3f' % val
+                table.setItem(i, j, QtWidgets.QTableWidgetItem(s))
+        table.resizeColumnsToContents()
+        self.refresh()
+
+    def export(self, fname=None):
+        """Export the records
+
+        Parameters
+        ----------
+        fname: str
+            The path of the output file. Files ending with ``'.trace.json'``
+            are exported in the Chrome trace format, all other files as
+            plain JSON. If None, a QFileDialog is opened to request the file
+            from the user"""
+        if not fname:
+            fname = QFileDialog.getSaveFileName(
+                self.straditizer_widgets, 'Export the records', os.getcwd(),
+                'Chrome trace (*.trace.json);;'
+                'JSON files (*.json);;'
+                'All files (*)'
+                )
+            if with_qt5:  # the filter is passed as well
+                fname = fname[0]
+        if not fname:
+            return
+        if fname.endswith('.trace.json'):
+            recorder.to_chrome_trace(fname)
+        else:
+            recorder.to_json(fname)
+
+    def refresh(self):
+        """Reimplemented to update the check boxes and buttons"""
+        self.cb_record.blockSignals(True)
+        self.cb_record.setChecked(recorder.enabled)
+        self.cb_record.blockSignals(False)
+        has_records = bool(recorder.records)
+        self.btn_clear.setEnabled(has_records)
+        self.btn_export.setEnabled(has_records)
@@ -546,12 +546,11 @@ class StraditizerMenuActions(StraditizerControlBase):
             stradi.set_attr('loaded', str(dt.datetime.now()))
         else:
             from PIL import Image
-            with Image.open(fname) as _image:
-                image = Image.fromarray(np.array(_image.convert('RGBA')),
-                                        'RGBA')
-            w, h = image.size
+            from straditize.image_io import read_image, is_large
+            image = read_image(fname)
+            h, w = image.shape[:2]
             im_size = w * h
-            if im_size > 20e6:
+            if is_large(image.shape):
                 recom_frac = 17403188.0 / im_size
                 answer = (
                     QMessageBox.Yes
@@ -561,12 +560,15 @@ class StraditizerMenuActions(StraditizerControlBase):
                         "This is a rather large image with %1.0f pixels. "
                         "Shall I reduce it to %1.0f%% of it's size for a "
                         "better interactive experience?<br>"
-                        "If not, you can rescale it via<br><br>"
+                        "If not, the image is kept at full resolution in a "
+                        "temporary file and you can still rescale it via"
+                        "<br><br>"
                         "Transform source image &rarr; Rescale image" % (
                             im_size, 100. * recom_frac)))
                 if answer == QMessageBox.Yes:
-                    image = image.resize((int(round(w * recom_frac)),
-                                          int(round(h * recom_frac))))
+                    image = Image.fromarray(image, 'RGBA').resize(
+                        (int(round(w * recom_frac)),
+                         int(round(h * recom_frac))))
 
             stradi = Straditizer(image, *args, **kwargs)
             stradi.set_attr('image_file', fname)
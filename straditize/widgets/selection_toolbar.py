@@ -1114,8 +1114,8 @@ class SelectionToolbar(QToolBar, StraditizerControlBase):
             mask[np.all(np.abs(rgba - c.reshape((1, 1, -1))) <= max_dist,
                         axis=-1)] = True
         if not self.cb_whole_fig.isChecked():
-            import skimage.morphology as skim
-            all_labels = skim.label(mask, 8, return_num=False)
+            import straditize.labeling as labeling
+            all_labels = labeling.label(mask, return_num=False)
             selected_labels = np.unique(all_labels[sly, slx])
             mask[~np.isin(all_labels, selected_labels)] = False
         if self.remove_select_action.isChecked():
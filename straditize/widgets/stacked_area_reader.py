@@ -21,7 +21,7 @@ import numpy as np
 from functools import partial
 from straditize.binary import DataReader, readers
 from straditize.widgets import StraditizerControlBase, get_straditizer_widgets
-import skimage.morphology as skim
+import straditize.labeling as labeling
 from psyplot_gui.compat.qtcompat import (
     QTreeWidgetItem, QPushButton, QWidget, QHBoxLayout, QLabel, QVBoxLayout)
 import gc
@@ -60,12 +60,14 @@ class StackedReader(DataReader, StraditizerControlBase):
 
     _current_col = 0
 
-    def digitize(self):
+    def digitize(self, *args, **kwargs):
         """Digitize the data interactively
 
         This method creates a new child item for the digitize button in the
         straditizer control to manually distinguish the variables in the
-        stacked diagram."""
+        stacked diagram. Arguments are passed to the
+        :meth:`straditize.binary.DataReader.digitize` method if there is only
+        one column"""
         if getattr(self, 'straditizer_widgets', None) is None:
             self.init_straditizercontrol(get_straditizer_widgets())
         digitizer = self.straditizer_widgets.digitizer
@@ -76,7 +78,7 @@ class StackedReader(DataReader, StraditizerControlBase):
             if len(self.columns) == 1 or self._current_col not in self.columns:
                 self._current_col = self.columns[0]
             if len(self.columns) == 1:
-                super(StackedReader, self).digitize()
+                super(StackedReader, self).digitize(*args, **kwargs)
             # start digitization
             digitizer.btn_digitize.setCheckable(True)
             digitizer.btn_digitize.setChecked(True)
@@ -182,7 +184,7 @@ class StackedReader(DataReader, StraditizerControlBase):
             axis=1)
         x = np.meshgrid(*map(np.arange, image.shape[::-1]))[0]
         image[(x < start[:, np.newaxis]) | (x > all_end[:, np.newaxis])] = 0
-        labels = skim.label(image, 8)
+        labels = labeling.label(image)
         self.straditizer_widgets.selection_toolbar.data_obj = self
         self.apply_button.clicked.connect(
             self.add_col if add_on_apply else self.update_col)
@@ -235,6 +237,7 @@ class StackedReader(DataReader, StraditizerControlBase):
         self.parent._full_df.loc[:, current] = end
         if current != self.columns[-1]:
             self.parent._full_df.loc[:, current + 1] += diff_end
+        self._update_column_versions([current, current + 1])
 
     def get_binary_for_col(self, col):
         s, e = self.column_bounds[self.columns.index(col)]
@@ -267,6 +270,7 @@ class StackedReader(DataReader, StraditizerControlBase):
                 if col >= current:
                     reader.columns[i] += 1
         self.columns.insert(self.columns.index(current + 1), current)
+        self._reset_column_index()
         self.parent._column_starts = np.insert(
             self.parent._column_starts, current, self._column_starts[current])
         if self.parent._column_ends is not None:
@@ -288,6 +292,8 @@ class StackedReader(DataReader, StraditizerControlBase):
         full_df.loc[:, current + 1] -= end
         full_df[current] = end
         full_df.sort_index(axis=1, inplace=True)
+        # the column numbers changed
+        self._update_column_versions(full_df.columns)
         # update the current column in samples and add the new one
         if samples is not None:
             new_samples = full_df.loc[samples.index, current]
@@ -980,7 +980,8 @@ class ColumnNames(TutorialPage):
             super().hint()
 
     def hint_for_start_editing(self):
-        from straditize.colnames import tesserocr
+        from straditize.colnames import _load_tesserocr
+        tesserocr = _load_tesserocr()
         if tesserocr is not None:
             btn = self.straditizer_widgets.colnames_manager.btn_find
             ocr = ' or click the <i>%s</i> button' % btn.text()
@@ -1016,7 +1017,10 @@ class CleanImagePage(TutorialPage):
         stradi = self.straditizer_widgets.straditizer
         reader = stradi.data_reader
         reader.recognize_yaxes(remove=True)
-        reader.binary[:, 1797 - int(stradi.data_xlim[0]):] = 0
+        mask = np.zeros(reader.binary.shape, dtype=bool)
+        mask[:, 1797 - int(stradi.data_xlim[0]):] = True
+        reader.register_changes(mask)
+        reader.binary[mask] = 0
         reader.recognize_xaxes(remove=True)
         stradi.draw_figure()
         self.clicked_btn_remove_xaxes()
@@ -50,7 +50,8 @@ class HoyaDelCastilloTutorial(Tutorial):
     src_file = osp.join(src_dir, src_base)
 
     def setup_tutorial_pages(self):
-        from straditize.colnames import tesserocr
+        from straditize.colnames import _load_tesserocr
+        tesserocr = _load_tesserocr()
         self.pages = [
             self,
             LoadImage('hoya-del-castillo-tutorial-load-image', self),
@@ -74,7 +75,8 @@ class HoyaDelCastilloTutorial(Tutorial):
 
     def show(self):
         """Show the documentation of the tutorial"""
-        from straditize.colnames import tesserocr
+        from straditize.colnames import _load_tesserocr
+        tesserocr = _load_tesserocr()
         intro, files = self.get_doc_files()
         self.filename = osp.splitext(osp.basename(intro))[0]
         with open(intro) as f:
@@ -60,6 +60,26 @@ class DataReaderTest(unittest.TestCase, AlmostArrayEqualMixin):
         plt.close('all')
         del self.sample, self.reader
 
+    def test_found_extrema_per_row(self):
+        """Test the number of potential samples per row"""
+        reader = self.reader
+        reader.column_starts = self.sample.col_starts
+        reader.digitize()
+        reader.sample_locs, reader.rough_locs = reader.find_samples(max_len=6)
+        rough = reader.rough_locs
+        ref = np.zeros(len(reader.full_df))
+        for col in reader.sample_locs.columns:
+            for imin, imax in rough.loc[:, col].values:
+                ref[int(imin):int(imax) + 1] += 1
+        extrema = reader.found_extrema_per_row()
+        self.assertEqual(extrema.name, 'Extrema')
+        self.assertEqual(list(extrema.values), list(ref))
+        # test the cache
+        self.assertIs(reader.extrema_per_row, reader.extrema_per_row)
+        rough.iloc[0, 1] += 1
+        ref[int(rough.iloc[0, 1])] += 1
+        self.assertEqual(list(reader.extrema_per_row), list(ref))
+
     nsamples = 2
 
     def test_column_bounds(self):
@@ -284,5 +304,546 @@ class DataReaderTest(unittest.TestCase, AlmostArrayEqualMixin):
             test()
 
 
+class IncrementalDigitizeTest(unittest.TestCase):
+    """Test the incremental digitization of the :class:`DataReader`"""
+
+    def setUp(self):
+        np.random.seed(1234)
+        self.sample = ct.TestSample.from_random(400, 400, 10, 20)
+        self.reader = binary.DataReader(self.sample.get_binary())
+        self.reader.column_starts = self.sample.col_starts
+
+    def tearDown(self):
+        import matplotlib.pyplot as plt
+        self.reader.close()
+        plt.close('all')
+        del self.sample, self.reader
+
+    def assertIncrementalEqual(self, ncols):
+        """Compare the incremental with the full digitization
+
+        Returns
+        -------
+        list of int
+            The number of changes of each column by the incremental
+            digitization"""
+        reader = self.reader
+        versions = [reader.column_version(col) for col in reader.columns]
+        reader.digitize(incremental=True)
+        self.assertEqual(len(reader._changed_columns), ncols)
+        ret = [reader.column_version(col) - v
+               for col, v in zip(reader.columns, versions)]
+        incremental = reader.full_df.copy()
+        reader.digitize()
+        self.assertTrue(np.array_equal(incremental.values,
+                                       reader.full_df.values),
+                        msg='incremental:\n%s\nfull:\n%s' % (
+                            incremental, reader.full_df))
+        return ret
+
+    def test_show_parts2remove(self):
+        """Test removing features via the _show_parts2remove method"""
+        reader = self.reader
+        reader.digitize()
+        start, end = reader.column_bounds[2]
+        mask = np.zeros_like(reader.binary)
+        mask[100:150, start:end] = 1
+        reader._show_parts2remove(mask, remove=True)
+        self.assertIncrementalEqual(1)
+        self.assertTrue((reader.full_df.iloc[100:150, 2] == 0).all())
+
+    def test_column_versions(self):
+        """Test that readers without __init__ do not share the versions"""
+        reader = object.__new__(binary.DataReader)
+        reader.parent = reader
+        self.assertEqual(reader.column_version(0), 0)
+        reader._update_column_versions([0])
+        self.assertEqual(reader.column_version(0), 1)
+        self.assertIsNone(binary.DataReader._column_versions)
+        self.assertEqual(self.reader.column_version(0), 0)
+
+    def test_not_inplace(self):
+        """Test that a digitization without inplace keeps the changes"""
+        reader = self.reader
+        reader.digitize()
+        start, end = reader.column_bounds[2]
+        mask = np.zeros_like(reader.binary)
+        mask[100:150, start:end] = 1
+        reader._show_parts2remove(mask, remove=True)
+        df = reader.digitize(inplace=False)
+        self.assertTrue((df.iloc[100:150, 2] == 0).all())
+        self.assertIncrementalEqual(1)
+        self.assertTrue((reader.full_df.iloc[100:150, 2] == 0).all())
+
+    def test_remove_selected_labels(self):
+        """Test removing the selected labels"""
+        reader = self.reader
+        reader.digitize()
+        start, end = reader.column_bounds[3]
+        reader.enable_label_selection(reader.labels, reader.num_labels)
+        reader.select_labels(np.unique(reader.labels[:, start:end])[1:])
+        reader.remove_selected_labels(disable=True)
+        self.assertEqual(self.assertIncrementalEqual(1),
+                         [0, 0, 0, 1, 0, 0, 0, 0, 0, 0])
+
+    def test_hlines(self):
+        """Test that changing the horizontal lines updates all columns"""
+        reader = self.reader
+        reader.digitize()
+        reader.hline_locs = np.array([10, 11, 12])
+        self.assertIncrementalEqual(len(reader.columns))
+
+
+class ParallelTest(unittest.TestCase):
+    """Test the parallel processing of the columns"""
+
+    def setUp(self):
+        np.random.seed(1234)
+        self.sample = ct.TestSample.from_random(400, 400, 10, 20)
+
+    def tearDown(self):
+        import matplotlib.pyplot as plt
+        plt.close('all')
+        del self.sample
+
+    def _test_reader(self, cls, **kwargs):
+        results = []
+        for max_workers in [1, 2]:
+            reader = cls(self.sample.get_binary(), plot=False)
+            reader.column_starts = self.sample.col_starts
+            reader.digitize(max_workers=max_workers, **kwargs)
+            results.append((reader.full_df, ) + reader.find_samples(
+                max_len=6, max_workers=max_workers))
+            reader.close()
+        for serial, parallel in zip(*results):
+            self.assertTrue(serial.equals(parallel),
+                            msg='serial:\n%s\nparallel:\n%s' % (
+                                serial, parallel))
+
+    def test_area(self):
+        """Test the parallel processing for the area reader"""
+        self._test_reader(binary.DataReader)
+
+    def test_bars(self):
+        """Test the parallel processing for the bar reader"""
+        self._test_reader(binary.BarDataReader)
+
+
+class PotentialSamplesCacheTest(unittest.TestCase):
+    """Test the cache of :meth:`DataReader.find_potential_samples`"""
+
+    def setUp(self):
+        np.random.seed(1234)
+        self.sample = ct.TestSample.from_random(400, 400, 10, 20)
+        self.reader = binary.DataReader(self.sample.get_binary(), plot=False)
+        self.reader.column_starts = self.sample.col_starts
+        self.reader.digitize()
+
+    def tearDown(self):
+        import matplotlib.pyplot as plt
+        self.reader.close()
+        plt.close('all')
+        del self.sample, self.reader
+
+    def test_cache(self):
+        """Test that the results are cached and copied"""
+        reader = self.reader
+        col = reader.columns[0]
+        ref = reader.find_potential_samples(col, max_len=6)
+        self.assertIn((col, None, 6), reader._potential_samples_cache)
+        ref[0].append([0, 1])
+        cached = reader.find_potential_samples(col, max_len=6)
+        self.assertNotEqual(ref[0], cached[0])
+        ref[0].pop()
+        self.assertEqual(ref, cached)
+
+    def test_invalidation(self):
+        """Test the invalidation of the cache"""
+        reader = self.reader
+        col = reader.columns[0]
+        reader.find_potential_samples(col, max_len=6)
+        self.assertIsNotNone(reader._get_cached_potential_samples(col, None,
+                                                                  6))
+        reader._update_column_versions([col])
+        self.assertIsNone(reader._get_cached_potential_samples(col, None, 6))
+        reader.find_potential_samples(col, max_len=6)
+        reader.full_df = reader.full_df.copy()
+        self.assertIsNone(reader._get_cached_potential_samples(col, None, 6))
+
+    def test_filter_func(self):
+        """Test that the filter_func is applied to the cached results"""
+        reader = self.reader
+        col = reader.columns[0]
+        included, excluded = reader.find_potential_samples(col)
+
+        def filter_func(indices):
+            return indices[0] > 100
+
+        filtered = reader.find_potential_samples(col, filter_func=filter_func)
+        self.assertEqual(filtered[0], [l for l in included if l[0] > 100])
+        self.assertEqual(filtered[1], [l for l in excluded if l[0] > 100])
+
+
+class MergeSamplesTest(unittest.TestCase):
+    """Test the merging of samples in the :class:`DataReader`"""
+
+    def setUp(self):
+        self.reader = binary.DataReader(np.zeros((110, 20), dtype=int),
+                                        plot=False)
+        self.reader.column_starts = np.array([0, 10])
+        index = np.array([0, 2, 30, 50, 52, 80, 98, 100])
+        self.locs = pd.DataFrame(np.arange(16.).reshape((8, 2)), index=index)
+        rough = np.tile(index[:, np.newaxis], (1, 4))
+        rough[:, 1::2] += 1
+        rough[3] = [49, 52, 50, 51]
+        rough[4] = [51, 53, -1, -1]
+        self.rough = pd.DataFrame(
+            rough, index=index, columns=pd.MultiIndex.from_product(
+                [[0, 1], ['vmin', 'vmax']]))
+
+    def tearDown(self):
+        self.reader.close()
+        del self.reader
+
+    def test_merge_close_samples(self):
+        """Test the merging of close samples"""
+        with self.assertWarnsRegex(UserWarning,
+                                   r'\[49, 52, 51, 53\] in column 0'):
+            locs, rough = self.reader.merge_close_samples(
+                self.locs, self.rough, 5)
+        self.assertEqual(list(locs.index), [2, 30, 50, 80, 98])
+        self.assertEqual(list(rough.index), [2, 30, 50, 80, 98])
+        self.assertEqual(locs.values.tolist(),
+                         [[2., 3.], [4., 5.], [6., 7.], [10., 11.],
+                          [12., 13.]])
+        self.assertEqual(rough.loc[50].tolist(), [49, 53, 50, 51])
+
+    def test_merge_without_extrema(self):
+        """Test merging close samples without any extrema"""
+        self.rough.iloc[3:5] = -1
+        locs, rough = self.reader.merge_close_samples(
+            self.locs, self.rough, 5)
+        self.assertEqual(list(locs.index), [2, 30, 50, 80, 98])
+        self.assertEqual(locs.loc[50].tolist(), [6., 7.])
+
+    def test_merge_occurences(self):
+        """Test the insertion of the occurences"""
+        reader = self.reader
+        reader.occurences = {(2, 40), (12, 51), (12, 120)}
+        reader.merge_occurences(self.locs)
+        val = reader.occurences_value
+        self.assertEqual(self.locs.loc[30, 0], val)
+        self.assertEqual(self.locs.loc[50, 1], val)
+        self.assertEqual(self.locs.loc[100, 1], val)
+        self.assertEqual((self.locs.values == val).sum(), 3)
+
+
+class CrossColumnFeaturesTest(unittest.TestCase):
+    """Test the :meth:`DataReader.get_cross_column_features` method"""
+
+    def test_get_cross_column_features(self):
+        arr = np.zeros((20, 30), dtype=int)
+        arr[2:4, 5:25] = 1  # in all columns
+        arr[6:8, 8:12] = 1  # 4 pixels in the first and second column
+        arr[10:12, 12:18] = 1  # only in the second column
+        data = arr.astype(bool)
+        reader = binary.DataReader(arr, plot=False)
+        reader.column_starts = np.array([0, 10, 20])
+        try:
+            mask = (reader.get_cross_column_features(min_px=4) > 0) & data
+            self.assertEqual(mask.sum(), 48)
+            self.assertTrue(mask[2:4, 5:25].all())
+            self.assertTrue(mask[6:8, 8:12].all())
+            mask = (reader.get_cross_column_features(min_px=5) > 0) & data
+            self.assertEqual(mask.sum(), 40)
+            self.assertTrue(mask[2:4, 5:25].all())
+        finally:
+            reader.close()
+
+
+class MergedBinariesTest(unittest.TestCase):
+    """Test the cached merged binaries of the :class:`DataReader`"""
+
+    def setUp(self):
+        np.random.seed(1234)
+        self.sample = ct.TestSample.from_random(400, 400, 10, 20)
+        self.reader = binary.DataReader(self.sample.get_binary())
+        self.reader.column_starts = self.sample.col_starts
+        self.child = self.reader.new_child_for_cols(
+            self.reader.columns[5:], binary.BarDataReader)
+
+    def tearDown(self):
+        import matplotlib.pyplot as plt
+        self.reader.close()
+        plt.close('all')
+        del self.sample, self.reader, self.child
+
+    def assertMerged(self):
+        """Compare the cached with the full merging of the binaries"""
+        reader = self.reader
+        ref = reader.binary.copy()
+        for child in reader.children:
+            mask = child.binary.astype(bool)
+            ref[mask] = child.binary[mask]
+        merged = reader.merged_binaries()
+        self.assertTrue(np.array_equal(merged, ref))
+        self.assertIs(self.child.merged_binaries(), merged)
+        return merged
+
+    def test_remove(self):
+        """Test the update after removing data in a child"""
+        merged = self.assertMerged()
+        labels = self.reader.merged_labels()
+        self.assertIs(self.reader.merged_labels(), labels)
+        start, end = self.child.column_bounds[0]
+        mask = np.zeros_like(self.child.binary)
+        mask[100:150, start:end] = 1
+        self.child._show_parts2remove(mask, remove=True)
+        self.assertIs(self.assertMerged(), merged)
+        self.assertIsNot(self.reader.merged_labels(), labels)
+
+    def test_new_child(self):
+        """Test the update after adding a new reader"""
+        merged = self.assertMerged()
+        self.reader.new_child_for_cols(self.reader.columns[3:],
+                                       binary.DataReader)
+        self.assertIsNot(self.assertMerged(), merged)
+
+    def test_exaggerations(self):
+        """Test the update after marking exaggerations"""
+        self.assertMerged()
+        exag = self.reader.create_exaggerations_reader(2)
+        self.assertMerged()
+        mask = np.zeros_like(self.reader.binary, dtype=bool)
+        mask[200:220] = self.reader.binary[200:220].astype(bool)
+        exag.mark_as_exaggerations(mask)
+        self.assertMerged()
+
+    def test_shift_vertical(self):
+        """Test the update after shifting the columns vertically"""
+        self.assertMerged()
+        labels = self.reader.merged_labels()
+        self.reader.shift_vertical([0, 3, 0, 0, 0, 5], draw=False)
+        self.assertMerged()
+        self.assertIsNot(self.reader.merged_labels(), labels)
+
+
+class ProfilesTest(unittest.TestCase):
+    """Test the projection profiles of the :class:`DataReader`"""
+
+    def setUp(self):
+        np.random.seed(1234)
+        self.sample = ct.TestSample.from_random(400, 400, 10, 20)
+        self.reader = binary.DataReader(self.sample.get_binary())
+        self.reader.column_starts = self.sample.col_starts
+
+    def tearDown(self):
+        import matplotlib.pyplot as plt
+        self.reader.close()
+        plt.close('all')
+        del self.sample, self.reader
+
+    def assertProfiles(self):
+        """Compare the profiles with the sums of the binary data"""
+        reader = self.reader
+        arr = reader.binary
+        self.assertEqual(reader.row_profile.tolist(), arr.sum(axis=1).tolist())
+        self.assertEqual(reader.column_profile.tolist(),
+                         arr.sum(axis=0).tolist())
+        ref = np.array([arr[:, s:e].sum(axis=1)
+                        for s, e in reader.column_bounds]).T
+        self.assertEqual(reader.column_row_profiles.tolist(), ref.tolist())
+
+    def test_remove(self):
+        """Test the update after removing parts of the binary data"""
+        reader = self.reader
+        self.assertProfiles()
+        rows = reader.row_profile
+        mask = np.zeros_like(reader.binary)
+        mask[100:150, 30:120] = 1
+        reader._show_parts2remove(mask, remove=True)
+        self.assertProfiles()
+        self.assertIs(reader._profiles['rows'], rows.base)
+        mask[:] = 0
+        mask[10, :] = 1
+        reader._show_parts2remove(mask, remove=True)
+        self.assertProfiles()
+
+    def test_lines(self):
+        """Test the update after the removal of lines"""
+        reader = self.reader
+        reader.binary[200] = 1
+        reader.binary[:, 5] = 1
+        reader._profiles = None
+        self.assertProfiles()
+        reader.recognize_hlines(fraction=0.99, remove=True)
+        self.assertProfiles()
+        self.assertEqual(reader.hline_locs.tolist(), [200])
+        reader.recognize_vlines(fraction=0.99, remove=True)
+        self.assertProfiles()
+        self.assertIn(5, reader.vline_locs)
+
+    def test_digitize(self):
+        """Test digitizing with the sum of the binary data"""
+        reader = self.reader
+        ref = reader.digitize(use_sum=True, inplace=False)
+        reader._profiles = None
+        reader._digitize_cache = None
+        self.assertEqual(
+            ref.values.tolist(),
+            reader.column_row_profiles.astype(float).tolist())
+
+
+class ColumnIndexTest(unittest.TestCase):
+    """Test the column geometry index of the :class:`DataReader`"""
+
+    def setUp(self):
+        np.random.seed(1234)
+        self.sample = ct.TestSample.from_random(400, 400, 10, 20)
+        self.reader = binary.DataReader(self.sample.get_binary(), plot=False)
+        self.reader.column_starts = self.sample.col_starts
+
+    def tearDown(self):
+        self.reader.close()
+        del self.sample, self.reader
+
+    def assertIndex(self):
+        """Compare the index with a scan over the readers and columns"""
+        reader = self.reader
+        bounds = reader.all_column_bounds
+        self.assertEqual(
+            bounds.tolist(),
+            np.c_[reader.all_column_starts, reader.all_column_ends].tolist())
+        for x in range(reader.binary.shape[1]):
+            ref = next((col for col, (s, e) in enumerate(bounds)
+                        if s <= x < e), None)
+            self.assertEqual(reader.get_col_for_pixel(x), ref)
+        for col in range(len(bounds)):
+            ref = next(child for child in reader.iter_all_readers
+                       if not child.is_exaggerated and col in child.columns)
+            self.assertIs(reader.get_reader_for_col(col), ref)
+        for child in reader.iter_all_readers:
+            self.assertEqual(
+                child.column_bounds.tolist(),
+                np.c_[child.column_starts, child.column_ends].tolist())
+
+    def test_cache(self):
+        """Test whether the bounds are cached"""
+        reader = self.reader
+        self.assertIndex()
+        self.assertIs(reader.all_column_bounds, reader.all_column_bounds)
+        self.assertIs(reader.column_bounds, reader.column_bounds)
+        self.assertFalse(reader.column_bounds.flags.writeable)
+
+    def test_invalidation(self):
+        """Test the update after changing columns and readers"""
+        reader = self.reader
+        self.assertIndex()
+        reader.column_ends = np.r_[reader.all_column_starts[1:], 390]
+        self.assertIndex()
+        self.assertIsNone(reader.get_col_for_pixel(395))
+        child = reader.new_child_for_cols(reader.columns[5:],
+                                          binary.BarDataReader)
+        self.assertIndex()
+        self.assertIs(reader.get_reader_for_col(6), child)
+        reader.create_exaggerations_reader(2)
+        self.assertIndex()
+        child.column_starts = child.column_starts + 2
+        self.assertIndex()
+        reader.all_column_starts = reader.all_column_starts - 1
+        self.assertIndex()
+        reader.reset_column_starts()
+        self.assertIsNone(reader.all_column_bounds)
+        self.assertIsNone(reader.get_col_for_pixel(10))
+
+
+class BarDataReaderTest(unittest.TestCase):
+    """Test case for the :class:`straditize.binary.BarDataReader`"""
+
+    def setUp(self):
+        self.reader = binary.BarDataReader(np.zeros((10, 10), dtype=int),
+                                           plot=False)
+
+    def tearDown(self):
+        import matplotlib.pyplot as plt
+        self.reader.close()
+        plt.close('all')
+
+    def test_get_bars(self):
+        """Test the separation of the bars"""
+        arr = np.array([0, 3, 3, 3, 0, 0, 5, 5, 5, 5, 2, 2, 2, 0, 0, 4, 4, 4,
+                        0], dtype=float)
+        indices, heights, splitted = self.reader.get_bars(arr)
+        self.assertEqual(indices, [[1, 4], [6, 10], [10, 13], [15, 19]])
+        self.assertEqual(heights, [3, 5, 2, 4])
+        self.assertEqual(splitted, [])
+
+    def test_get_bars_split(self):
+        """Test the splitting of bars that are too long"""
+        arr = np.array([0] + [3] * 3 + [0] + [4] * 3 + [0] + [5] * 9 + [0, 0],
+                       dtype=float)
+        indices, heights, splitted = self.reader.get_bars(arr)
+        self.assertEqual(splitted, [[9, 18]])
+        self.assertEqual(indices, [[1, 4], [5, 8], [9, 18]])
+        indices, heights, splitted = self.reader.get_bars(arr, do_split=True)
+        self.assertEqual(splitted, [[9, 18]])
+        self.assertEqual(indices,
+                         [[1, 4], [5, 8], [9, 12], [12, 15], [15, 18]])
+        self.assertEqual(heights, [3, 4, 5, 5, 5])
+
+    def test_get_bars_split_end(self):
+        """Test splitting a bar at the end of the column"""
+        arr = np.array([0] + [3] * 3 + [0] + [4] * 3 + [0] + [2] * 3 + [0] +
+                       [1] * 4 + [0] + [6] * 4 + [0] + [5] * 8, dtype=float)
+        indices, heights, splitted = self.reader.get_bars(arr, do_split=True)
+        self.assertEqual(splitted, [[23, 31]])
+        self.assertEqual(indices[-3:], [[18, 22], [23, 27], [27, 31]])
+        self.assertEqual(heights[-3:], [6, 5, 5])
+
+    def test_hline_interpolation_dataset(self):
+        """Test saving the interpolation at horizontal lines"""
+        self.reader.hline_interpolation = 'previous'
+        ds = self.reader.to_dataset()
+        reader = binary.BarDataReader.from_dataset(ds.isel(reader=0),
+                                                   plot=False)
+        self.assertEqual(reader.hline_interpolation, 'previous')
+        reader.close()
+
+    def test_fill_bars(self):
+        """Test filling the bars where the end is included"""
+        ret = self.reader._fill_bars(10, [[1, 3], [3, 5], [8, 12]],
+                                     [1., 2., 3.])
+        np.testing.assert_array_equal(
+            ret, [np.nan, 1, 1, 2, 2, 2, np.nan, np.nan, 3, 3])
+
+
+class FillRowsTest(unittest.TestCase):
+    """Test case for the :func:`straditize.binary.fill_rows` function"""
+
+    def setUp(self):
+        self.vals = np.array([[1., 4., 2., 0., 8., 6., 6., 6.],
+                              [2., 2., 3., 4., 5., 6., 7., 8.]]).T
+        self.rows = [0, 2, 3, 7]
+
+    def test_linear(self):
+        from scipy.interpolate import interp1d
+        vals = binary.fill_rows(self.vals.copy(), self.rows)
+        x = np.array([1, 4, 5, 6])
+        for i in range(2):
+            ref = interp1d(x, self.vals[x, i], fill_value='extrapolate')(
+                np.arange(8))
+            np.testing.assert_allclose(vals[:, i], ref)
+
+    def test_nearest(self):
+        vals = binary.fill_rows(self.vals.copy(), self.rows, 'nearest')
+        np.testing.assert_array_equal(vals[:, 0],
+                                      [4, 4, 4, 8, 8, 6, 6, 6])
+
+    def test_previous(self):
+        vals = binary.fill_rows(self.vals.copy(), self.rows, 'previous')
+        np.testing.assert_array_equal(vals[:, 0],
+                                      [4, 4, 4, 4, 8, 6, 6, 6])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+Test module for the :mod:`straditize.colnames` module
+"""
+import tempfile
+import shutil
+import unittest
+import numpy as np
+from PIL import Image
+from straditize import colnames
+
+
+class OCRCacheTest(unittest.TestCase):
+    """Test the :class:`straditize.colnames.OCRCache`"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_key(self):
+        """Test the hash of the images"""
+        arr = np.zeros((10, 20, 3), dtype=np.uint8)
+        image = Image.fromarray(arr, 'RGB')
+        key = colnames.ocr_key(image)
+        self.assertEqual(colnames.ocr_key(image.copy()), key)
+        self.assertNotEqual(colnames.ocr_key(image, lang='deu'), key)
+        arr[5, 5] = 1
+        self.assertNotEqual(colnames.ocr_key(Image.fromarray(arr, 'RGB')),
+                            key)
+
+    def test_lru(self):
+        """Test removing the least recently used texts"""
+        cache = colnames.OCRCache(maxsize=2)
+        cache['a'] = 'A'
+        cache['b'] = 'B'
+        self.assertEqual(cache.get('a'), 'A')
+        cache['c'] = 'C'
+        self.assertEqual(len(cache), 2)
+        self.assertNotIn('b', cache)
+        self.assertEqual([key for key, text in cache.items()], ['a', 'c'])
+
+    def test_parent(self):
+        """Test looking up the texts in the parent cache"""
+        parent = colnames.OCRCache()
+        cache = colnames.OCRCache(parent=parent)
+        cache['a'] = 'A'
+        self.assertEqual(parent.get('a'), 'A')
+        parent['b'] = 'B'
+        self.assertEqual(cache.get('b'), 'B')
+        self.assertEqual(len(cache), 2)
+
+    def test_cache_dir(self):
+        """Test storing the texts on disk"""
+        cache = colnames.OCRCache(cache_dir=self.test_dir)
+        cache['a'] = 'Pinus'
+        cache = colnames.OCRCache(cache_dir=self.test_dir)
+        self.assertEqual(cache.get('a'), 'Pinus')
+        self.assertIsNone(cache.get('b'))
+
+    def test_dataset(self):
+        """Test saving the cache of a reader in the dataset"""
+        image = np.zeros((10, 20, 4), dtype=np.uint8)
+        reader = colnames.ColNamesReader(image, np.array([[0, 10]]))
+        reader.ocr_cache['a'] = 'Pinus'
+        reader.ocr_cache['b'] = ''
+        ds = reader.to_dataset()
+        reader = colnames.ColNamesReader.from_dataset(ds)
+        self.assertEqual(reader.ocr_cache.items(),
+                         [('a', 'Pinus'), ('b', '')])
+        colnames.ocr_cache.clear()
+
+
+class ImageCacheTest(unittest.TestCase):
+    """Test the cached images of the ColNamesReader"""
+
+    def setUp(self):
+        np.random.seed(1234)
+        arr = np.random.randint(0, 256, (600, 400, 4)).astype(np.uint8)
+        self.reader = colnames.ColNamesReader(
+            arr, np.array([[0, 200], [200, 400]]), rotate=30,
+            data_ylim=[300, 500])
+
+    def test_highres(self):
+        """Test the masked high resolution image"""
+        reader = self.reader
+        hr = reader.highres_image
+        self.assertIs(reader.highres_image, hr)
+        arr = np.asarray(hr)
+        self.assertTrue((arr[300:500, :, -1] == 0).all())
+        self.assertTrue(np.array_equal(arr[:300],
+                                       np.asarray(reader.image)[:300]))
+        reader.data_ylim = np.array([400, 500])
+        self.assertIsNot(reader.highres_image, hr)
+        reader.ignore_data_part = False
+        self.assertIs(reader.highres_image, reader.image)
+        reader.ignore_data_part = True
+        reader.highres_image = reader.image.resize((800, 1200))
+        self.assertEqual(reader.highres_image.size, (800, 1200))
+
+    def test_rotated(self):
+        """Test the cached rotated image"""
+        reader = self.reader
+        rotated = reader.rotated_image
+        self.assertIs(reader.rotated_image, rotated)
+        for attr, val in [('rotate', 45), ('mirror', True), ('flip', True)]:
+            setattr(reader, attr, val)
+            new = reader.rotated_image
+            self.assertIsNot(new, rotated)
+            ref = reader.rotate_image(reader.image)
+            self.assertTrue(np.array_equal(np.asarray(new), np.asarray(ref)))
+            rotated = new
+        hr_rotated = reader.rotated_highres_image
+        self.assertIs(reader.rotated_highres_image, hr_rotated)
+        reader.data_ylim = None
+        self.assertIsNot(reader.rotated_highres_image, hr_rotated)
+        self.assertIs(reader.rotated_image, rotated)
+
+    def test_preview(self):
+        """Test the downsampled preview of the rotated image"""
+        reader = self.reader
+        preview, factor = reader.rotated_preview()
+        self.assertIs(preview, reader.rotated_image)
+        self.assertEqual(factor, 1)
+        preview, factor = reader.rotated_preview(60000)
+        self.assertEqual(factor, 2)
+        self.assertIs(reader.rotated_preview(60000)[0], preview)
+        self.assertLessEqual(
+            np.abs(np.multiply(preview.size, factor) -
+                   reader.rotated_image.size).max(), factor)
+        reader.rotate = 0
+        self.assertIsNot(reader.rotated_preview(60000)[0], preview)
+
+
+class BoxMergeTest(unittest.TestCase):
+    """Test merging the text boxes of the column names"""
+
+    def setUp(self):
+        np.random.seed(1234)
+
+    def test_column_overlaps(self):
+        """Test the overlap of ranges with the columns"""
+        starts = np.sort(np.random.rand(10) * 100)
+        bounds = np.c_[starts[:-1], starts[1:]]
+        xranges = np.sort(np.random.rand(50, 2) * 120 - 10, axis=1)
+        ref = np.maximum(
+            np.minimum(bounds[:, 1], xranges[:, 1:]) -
+            np.maximum(bounds[:, 0], xranges[:, :1]), 0)
+        self.assertTrue(np.allclose(
+            colnames.column_overlaps(bounds, xranges), ref))
+
+    def test_close_box_pairs(self):
+        """Test finding the boxes that are vertically close"""
+        boxes = [colnames.Bbox(*box)
+                 for box in np.random.randint(0, 100, (40, 4)).tolist()]
+        ref = set()
+        for i, b1 in enumerate(boxes):
+            for j, b2 in enumerate(boxes):
+                if i == j or b1.left > b2.right or b1.right < b2.left:
+                    continue
+                if min(abs(b1.top - b2.bottom),
+                       abs(b2.top - b1.bottom)) <= 5:
+                    ref.add((i, j))
+        pairs = colnames.close_box_pairs(boxes, 5)
+        self.assertEqual(set(map(tuple, pairs.T.tolist())), ref)
+
+    def test_merge(self):
+        """Test merging the boxes of one column"""
+        Bbox = colnames.Bbox
+        boxes = [Bbox(10, 0, 30, 10), Bbox(60, 0, 30, 10),
+                 Bbox(12, 12, 20, 10), Bbox(12, 24, 20, 10),
+                 Bbox(62, 30, 20, 10)]
+        texts = ['Pinus syl-', 'Betula', 'vestris', 'type', 'nana']
+
+        def get_xranges(boxes):
+            return np.array([[b.left, b.right] for b in boxes])
+
+        boxes, texts, overlaps = colnames.merge_text_boxes(
+            boxes, texts, [[0, 50], [50, 100]], get_xranges, 5)
+        self.assertEqual(texts, ['Betula', 'nana', 'Pinus syl-vestris type'])
+        self.assertEqual(boxes[-1], Bbox(10, 0, 30, 34))
+        self.assertEqual(overlaps.argmax(axis=0).tolist(), [2, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
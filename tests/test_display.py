@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Test module for the :mod:`straditize.display` module
+"""
+import unittest
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from straditize import display, image_io
+
+
+class PyramidImageTest(unittest.TestCase):
+    """Test the :class:`straditize.display.PyramidImage`"""
+
+    def setUp(self):
+        np.random.seed(1234)
+        self.arr = np.random.randint(
+            0, 256, (1000, 800, 4)).astype(np.uint8)
+        self.fig = Figure(figsize=(4, 4), dpi=50)
+        FigureCanvasAgg(self.fig)
+        self.ax = self.fig.add_axes([0, 0, 1, 1])
+
+    def test_auto(self):
+        """Test whether the pyramid is only used for large images"""
+        im = display.imshow(self.ax, self.arr)
+        self.assertNotIsInstance(im, display.PyramidImage)
+        im = display.imshow(self.ax, self.arr, pyramid=True)
+        self.assertIsInstance(im, display.PyramidImage)
+        pyramid = image_io.ImagePyramid(self.arr)
+        im = display.imshow(self.ax, None, pyramid=pyramid)
+        self.assertIs(im.pyramid, pyramid)
+        self.assertIs(im.get_array(), self.arr)
+
+    def test_level(self):
+        """Test the choice of the pyramid level"""
+        im = display.imshow(self.ax, self.arr, pyramid=True, min_size=50)
+        self.fig.canvas.draw()
+        # 1000 rows on 200 screen pixels
+        self.assertEqual(im.level, 2)
+        self.ax.set_xlim(0, 100)
+        self.ax.set_ylim(100, 0)
+        self.fig.canvas.draw()
+        self.assertEqual(im.level, 0)
+
+    def test_zoomed_draw(self):
+        """Test whether the zoomed image equals the image without pyramid"""
+        def draw(**kwargs):
+            self.ax.cla()
+            display.imshow(self.ax, self.arr, interpolation='nearest',
+                           **kwargs)
+            self.ax.set_xlim(100.5, 140.5)
+            self.ax.set_ylim(300.5, 260.5)
+            self.ax.axis('off')
+            self.fig.canvas.draw()
+            return np.asarray(self.fig.canvas.buffer_rgba()).copy()
+
+        ref = draw(pyramid=False)
+        self.assertTrue(np.array_equal(draw(pyramid=True), ref))
+
+    def test_update(self):
+        """Test updating the pyramid with new data"""
+        im = display.imshow(self.ax, self.arr, pyramid=True, min_size=50)
+        pyramid = im.pyramid
+        arr = self.arr.copy()
+        arr[300:310, 600:620] = 0
+        arr[-1, -1] = 0
+        self.assertEqual(
+            display.changed_tiles(self.arr, arr).nonzero()[0].tolist(),
+            [1, 3])
+        im.set_data(arr)
+        self.assertIs(im.pyramid, pyramid)
+        ref = image_io.ImagePyramid(arr, min_size=50)
+        self.assertEqual(len(pyramid), len(ref))
+        for level, ref_level in zip(pyramid.levels, ref.levels):
+            self.assertTrue(np.array_equal(level, ref_level))
+
+    def test_labels(self):
+        """Test the pyramid of a labeled array"""
+        labels = np.zeros((1000, 800), dtype=int)
+        labels[100, 100] = 1
+        im = display.imshow(self.ax, labels, pyramid=True, min_size=50)
+        # single pixels must not vanish in the coarse levels
+        self.assertEqual(im.pyramid[-1].max(), 1)
+
+    def test_labels_draw(self):
+        """Test drawing a labeled array with the pyramid"""
+        labels = np.zeros((1000, 800), dtype=int)
+        labels[100:200, 100:300] = 1
+        labels[600:900, 400:500] = 2
+        im = display.imshow(self.ax, labels, pyramid=True, min_size=50)
+        self.fig.canvas.draw()
+        self.assertEqual(im.level, 2)
+
+    def test_zoomed_labels_draw(self):
+        """Test whether the zoomed 2D image equals the one without pyramid
+        """
+        labels = np.random.randint(0, 5, (1000, 800))
+
+        def draw(**kwargs):
+            self.ax.cla()
+            display.imshow(self.ax, labels, interpolation='nearest',
+                           vmin=0, vmax=4, **kwargs)
+            self.ax.set_xlim(100.5, 140.5)
+            self.ax.set_ylim(300.5, 260.5)
+            self.ax.axis('off')
+            self.fig.canvas.draw()
+            return np.asarray(self.fig.canvas.buffer_rgba()).copy()
+
+        ref = draw(pyramid=False)
+        self.assertTrue(np.array_equal(draw(pyramid=True), ref))
+
+
+if __name__ == '__main__':
+    unittest.main()
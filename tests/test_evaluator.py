@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""
+Test module for the :mod:`straditize.evaluator` module
+"""
+import unittest
+import pandas as pd
+
+try:
+    from straditize.evaluator import SharedFrame
+except ImportError:
+    SharedFrame = None
+
+
+@unittest.skipIf(SharedFrame is None, "Evaluator requirements not installed")
+class SharedFrameTest(unittest.TestCase):
+    """Test the :class:`straditize.evaluator.SharedFrame`"""
+
+    def test_to_frame(self):
+        """Test the reconstruction of numeric and non-numeric columns"""
+        df = pd.DataFrame({'a': [1., 2., 3., 4.],
+                           'b': ['x', None, 'y', 'x'],
+                           'c': [3, 2, 1, 0]})
+        shared = SharedFrame(df)
+        try:
+            ret = shared.to_frame()
+            self.assertEqual(list(ret.columns), ['a', 'b', 'c'])
+            self.assertEqual(ret['a'].tolist(), df['a'].tolist())
+            self.assertEqual(ret['c'].tolist(), df['c'].tolist())
+            self.assertEqual(ret['b'][[0, 2, 3]].tolist(), ['x', 'y', 'x'])
+            # missing values must not be mapped to a category
+            self.assertTrue(pd.isnull(ret['b'][1]))
+            self.assertEqual(ret['b'].isnull().sum(), 1)
+            self.assertFalse(ret['a'].values.flags.writeable)
+            del ret
+        finally:
+            shared.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
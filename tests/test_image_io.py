@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+Test module for the :mod:`straditize.image_io` module
+"""
+import os.path as osp
+import tempfile
+import shutil
+import unittest
+import numpy as np
+from PIL import Image
+from straditize import image_io
+
+
+class ReadImageTest(unittest.TestCase):
+    """Test the :func:`straditize.image_io.read_image` function"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        np.random.seed(1234)
+        self.arr = np.random.randint(0, 256, (101, 67, 4)).astype(np.uint8)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def _test_image(self, image, ext, **kwargs):
+        fname = osp.join(self.test_dir, 'test' + ext)
+        image.save(fname, **kwargs)
+        ref = np.array(image.convert('RGBA'))
+        for memmap in [False, True]:
+            arr = image_io.read_image(fname, memmap=memmap, strip_height=10)
+            self.assertEqual(isinstance(arr, np.memmap), memmap)
+            self.assertEqual(arr.dtype, np.uint8)
+            self.assertTrue(np.array_equal(arr, ref))
+
+    def test_png(self):
+        """Test reading a PNG file"""
+        self._test_image(Image.fromarray(self.arr, 'RGBA'), '.png')
+
+    def test_png_grey(self):
+        """Test reading a grey scale PNG file"""
+        self._test_image(Image.fromarray(self.arr[..., 0], 'L'), '.png')
+
+    def test_tiff(self):
+        """Test reading a tiled TIFF file"""
+        image = Image.fromarray(self.arr, 'RGBA')
+        self._test_image(image, '.tif', compression='tiff_lzw')
+        try:
+            import tifffile
+        except ImportError:
+            return
+        fname = osp.join(self.test_dir, 'tiled.tif')
+        tifffile.imwrite(fname, self.arr[..., :3], tile=(32, 32),
+                         photometric='rgb')
+        arr = image_io.read_image(fname, memmap=True, strip_height=10)
+        self.assertTrue(np.array_equal(arr[..., :3], self.arr[..., :3]))
+        self.assertTrue((arr[..., -1] == 255).all())
+
+    def test_tiff_layouts(self):
+        """Test reading TIFF files with different layouts and bands"""
+        try:
+            import tifffile
+        except ImportError:
+            self.skipTest('tifffile is not installed')
+        fname = osp.join(self.test_dir, 'test.tif')
+        for nbands in range(1, 5):
+            data = self.arr[..., 0] if nbands == 1 else self.arr[..., :nbands]
+            kwargs = {'photometric': 'minisblack' if nbands < 3 else 'rgb'}
+            if nbands in [2, 4]:
+                kwargs['extrasamples'] = ['unassalpha']
+            ref = image_io.to_rgba(data)
+            for layout in [{'tile': (32, 32)}, {'compression': 'zlib'},
+                           {}]:
+                tifffile.imwrite(fname, data, **layout, **kwargs)
+                arr = image_io.read_image(fname, strip_height=10)
+                self.assertTrue(np.array_equal(arr, ref),
+                                msg='%i bands, %s' % (nbands, layout))
+
+    def test_tiff_memory(self):
+        """Test that a TIFF file is not decoded into a second array"""
+        try:
+            import tifffile
+        except ImportError:
+            self.skipTest('tifffile is not installed')
+        import tracemalloc
+        fname = osp.join(self.test_dir, 'test.tif')
+        # a diagram-like image with horizontal lines
+        data = np.zeros((3000, 2000, 3), dtype=np.uint8)
+        data[::7] = self.arr[0, 0, :3]
+        for layout in [{'tile': (256, 256), 'compression': 'zlib'},
+                       {'compression': 'zlib'}, {}]:
+            tifffile.imwrite(fname, data, photometric='rgb', **layout)
+            tracemalloc.start()
+            try:
+                arr = image_io.read_image(fname, memmap=False)
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+            self.assertLess(peak, 1.2 * arr.nbytes, msg=str(layout))
+            self.assertTrue(np.array_equal(arr[..., :3], data))
+
+    def test_straditizer(self):
+        """Test opening a straditizer from a file"""
+        from straditize.straditizer import Straditizer
+        fname = osp.join(self.test_dir, 'test.png')
+        Image.fromarray(self.arr, 'RGBA').save(fname)
+        stradi = Straditizer(fname, plot=False)
+        self.assertEqual(stradi.get_attr('image_file'), fname)
+        self.assertTrue(np.array_equal(np.asarray(stradi.image), self.arr))
+
+
+class ImagePyramidTest(unittest.TestCase):
+    """Test the :class:`straditize.image_io.ImagePyramid`"""
+
+    def test_downsample(self):
+        arr = np.arange(5 * 3, dtype=np.uint8).reshape((5, 3))
+        ret = image_io.downsample(arr, strip_height=2)
+        ref = np.array([[(0 + 1 + 3 + 4 + 2) // 4, (2 + 2 + 5 + 5 + 2) // 4],
+                        [(6 + 7 + 9 + 10 + 2) // 4,
+                         (8 + 8 + 11 + 11 + 2) // 4],
+                        [(12 + 13 + 12 + 13 + 2) // 4,
+                         (14 + 14 + 14 + 14 + 2) // 4]])
+        self.assertEqual(ret.tolist(), ref.tolist())
+
+    def test_levels(self):
+        arr = np.zeros((1000, 300, 4), dtype=np.uint8)
+        pyramid = image_io.ImagePyramid(arr, min_size=100)
+        self.assertEqual([level.shape for level in pyramid.levels],
+                         [(1000, 300, 4), (500, 150, 4), (250, 75, 4),
+                          (125, 38, 4), (63, 19, 4)])
+        self.assertIs(pyramid[0], arr)
+        self.assertEqual(pyramid.level_for_size(40000), 2)
+        self.assertEqual(pyramid.level_for_size(1e6), 0)
+        self.assertEqual(pyramid.level_for_size(1), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
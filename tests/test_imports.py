@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Test module for the lazy imports of the :mod:`straditize` modules
+"""
+import sys
+import json
+import subprocess as spr
+import unittest
+
+
+#: Modules that must only be imported on first use
+LAZY_MODULES = ['skimage', 'matplotlib.pyplot', 'matplotlib.widgets',
+                'straditize.display', 'tesserocr']
+
+#: The third-party modules that :mod:`straditize.straditizer` needs anyway
+EAGER_MODULES = ['numpy', 'pandas', 'xarray', 'matplotlib.colors',
+                 'psyplot.data', 'psyplot.utils', 'PIL.Image', 'PIL.ImageOps',
+                 'docrep', 'six']
+
+#: The maximum number of modules that :mod:`straditize.straditizer` may
+#: import in addition to the :attr:`EAGER_MODULES` and the straditize
+#: modules. This is a deterministic replacement for a time budget: importing
+#: one of the :attr:`LAZY_MODULES` alone pulls in far more modules
+MAX_EXTRA_MODULES = 25
+
+
+def import_in_subprocess(*modules):
+    """Import the given modules in a new interpreter
+
+    Returns
+    -------
+    list of str
+        The names of all imported modules"""
+    code = '; '.join([
+        'import sys, json',
+        ] + ['import ' + mod for mod in modules] + [
+        'print(json.dumps(sorted(sys.modules)))'])
+    out = spr.check_output([sys.executable, '-c', code])
+    return json.loads(out.decode('utf-8').splitlines()[-1])
+
+
+class ImportTest(unittest.TestCase):
+    """Test that the heavy dependencies are imported lazily"""
+
+    def test_straditizer(self):
+        modules = import_in_subprocess('straditize.straditizer')
+        for mod in LAZY_MODULES:
+            self.assertNotIn(mod, modules)
+
+    def test_straditizer_budget(self):
+        """Test the number of modules imported by the straditizer module"""
+        modules = import_in_subprocess('straditize.straditizer')
+        ref = import_in_subprocess(*EAGER_MODULES)
+        extra = [mod for mod in set(modules).difference(ref)
+                 if mod.split('.')[0] != 'straditize']
+        self.assertLessEqual(len(extra), MAX_EXTRA_MODULES, msg=sorted(extra))
+
+    def test_colnames(self):
+        """Test that tesserocr is not imported with the colnames module"""
+        modules = import_in_subprocess('straditize.colnames')
+        self.assertNotIn('tesserocr', modules)
+
+
+if __name__ == '__main__':
+    unittest.main()
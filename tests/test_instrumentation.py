@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Test module for the :mod:`straditize.instrumentation` module
+"""
+import os.path as osp
+import json
+import tempfile
+import shutil
+import unittest
+import numpy as np
+from straditize import binary
+from straditize.instrumentation import recorder
+import create_test_sample as ct
+
+
+class RecorderTest(unittest.TestCase):
+    """Test the :attr:`straditize.instrumentation.recorder`"""
+
+    def setUp(self):
+        np.random.seed(1234)
+        self.sample = ct.TestSample.from_random(400, 400, 10, 20)
+        self.reader = binary.DataReader(self.sample.get_binary(), plot=False)
+        self.reader.column_starts = self.sample.col_starts
+        recorder.clear()
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        recorder.disable()
+        recorder.clear()
+        shutil.rmtree(self.test_dir)
+
+    def test_disabled(self):
+        """Test that nothing is recorded by default"""
+        self.reader.digitize()
+        self.assertEqual(recorder.records, [])
+
+    def test_records(self):
+        """Test the recording of the operations"""
+        with recorder.recording():
+            self.reader.digitize()
+            self.reader.find_samples()
+        self.assertFalse(recorder.enabled)
+        df = recorder.to_dataframe()
+        self.assertEqual(df.name.iloc[0], 'DataReader.digitize')
+        self.assertEqual(df.input.iloc[0]['shape'], (400, 400))
+        self.assertTrue((df.wall_time > 0).all())
+        self.assertTrue((df.peak_memory >= 0).all())
+        # nested operations
+        self.assertIn('DataReader.find_potential_samples', df.name.values)
+        self.assertTrue((df[df.name == 'DataReader.find_samples'].depth ==
+                         0).all())
+        self.assertTrue((df[df.name == 'DataReader.unique_bars'].depth >
+                         0).all())
+        summary = recorder.summary()
+        self.assertEqual(
+            summary.loc['DataReader.find_potential_samples', 'calls'],
+            len(self.reader.columns))
+
+    def test_no_memory(self):
+        """Test the recording without memory tracing"""
+        with recorder.recording(trace_memory=False):
+            self.reader.digitize()
+        recorder.trace_memory = True
+        self.assertIsNone(recorder.records[0]['peak_memory'])
+
+    def test_export(self):
+        """Test the export to JSON and the chrome trace format"""
+        with recorder.recording():
+            self.reader.digitize()
+        fname = osp.join(self.test_dir, 'test.json')
+        recorder.to_json(fname)
+        with open(fname) as f:
+            records = json.load(f)
+        self.assertEqual(records[0]['name'], 'DataReader.digitize')
+        fname = osp.join(self.test_dir, 'test.trace.json')
+        recorder.to_chrome_trace(fname)
+        with open(fname) as f:
+            trace = json.load(f)
+        event = trace['traceEvents'][0]
+        self.assertEqual(event['name'], 'DataReader.digitize')
+        self.assertEqual(event['ph'], 'X')
+        self.assertGreater(event['dur'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
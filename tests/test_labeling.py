@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+Test module for the :mod:`straditize.labeling` module
+"""
+import unittest
+import numpy as np
+import skimage.morphology as skim
+from straditize import labeling
+
+
+class LabelTest(unittest.TestCase):
+    """Test the :func:`straditize.labeling.label` function"""
+
+    def setUp(self):
+        np.random.seed(1234)
+
+    def _test_label(self, arr, connectivity=2):
+        ref, num = skim.label(arr, connectivity=connectivity, background=0,
+                              return_num=True)
+        for tile_height in [1, 3, 10]:
+            ret, n = labeling.label(arr, connectivity, return_num=True,
+                                    tile_height=tile_height, workers=2)
+            self.assertEqual(n, num)
+            self.assertTrue(np.array_equal(ret, ref))
+
+    def test_binary(self):
+        """Test labeling a binary image in tiles"""
+        arr = np.random.rand(50, 40) < 0.4
+        self._test_label(arr, 1)
+        self._test_label(arr, 2)
+
+    def test_values(self):
+        """Test labeling an image with multiple values"""
+        self._test_label(np.random.randint(0, 3, (50, 40)))
+
+    def test_seams(self):
+        """Test features that span multiple tiles"""
+        arr = np.zeros((30, 20), dtype=bool)
+        arr[:, 5] = True  # vertical line through all tiles
+        arr[np.arange(20), np.arange(20)] = True  # diagonal line
+        arr[10:, 15] = True
+        arr[10, 12:15] = True
+        self._test_label(arr, 2)
+        self._test_label(arr, 1)
+
+    def test_union_find(self):
+        roots = labeling.union_find(6, np.array([[5, 3, 4], [3, 1, 5]]))
+        self.assertEqual(roots.tolist(), [0, 1, 2, 1, 1, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
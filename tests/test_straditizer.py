@@ -43,6 +43,123 @@ class StraditizerTest(unittest.TestCase):
         self.assertEqual(list(xlim), [10, 27])
         self.assertEqual(list(ylim), [10, 30])
 
+    def test_headless(self):
+        """Test cleaning and digitizing without a plot"""
+        import matplotlib.pyplot as plt
+        nfigs = len(plt.get_fignums())
+        stradi = Straditizer(osp.join(test_dir, 'test_figures',
+                                      'basic_diagram.png'), plot=False)
+        self.assertTrue(stradi.headless)
+        stradi.data_xlim = stradi.data_ylim = np.array([10, 30])
+        stradi.init_reader()
+        reader = stradi.data_reader
+        self.assertTrue(reader.headless)
+        mask = np.zeros(reader.binary.shape, dtype=bool)
+        mask[5] = True
+        reader.register_changes(mask)
+        reader.binary[mask] = 1
+        reader.recognize_hlines(fraction=0.99, remove=True)
+        self.assertEqual(list(reader.hline_locs), [5])
+        self.assertFalse(reader.binary[5].any())
+        stradi.digitize_diagram()
+        self.assertIsNotNone(reader.full_df)
+        reader.shift_vertical([1])
+        with self.assertRaises(ValueError):
+            reader.recognize_hlines(fraction=0.99)
+        stradi.close()
+        self.assertEqual(len(plt.get_fignums()), nfigs)
+
+
+class FinalDfTest(unittest.TestCase):
+    """Test the :attr:`straditize.straditizer.Straditizer.final_df`"""
+
+    def setUp(self):
+        self.stradi = stradi = Straditizer(
+            osp.join(test_dir, 'test_figures', 'basic_diagram.png'),
+            plot=False)
+        stradi.data_xlim = np.array([10, 27])
+        stradi.data_ylim = np.array([10, 30])
+        stradi.init_reader()
+        stradi.digitize_diagram()
+        self.reader = reader = stradi.data_reader
+        reader.sample_locs, reader.rough_locs = reader.find_samples()
+        reader.xaxis_px = [0, 4]
+        reader.xaxis_data = [0, 8]
+        stradi.yaxis_px = [0, 19]
+        stradi.yaxis_data = [100, 200]
+
+    def tearDown(self):
+        self.stradi.close()
+
+    def test_vectorized(self):
+        """Test the transformation of all columns at once"""
+        from straditize.binary import DataReader
+        stradi = self.stradi
+        reader = self.reader
+        child = reader.new_child_for_cols([2], DataReader, plot=False)
+        child.xaxis_px = [0, 2]
+        child.xaxis_data = [1, 5]
+        reader.sample_locs.iloc[1, 1] = reader.occurences_value
+        locs = reader.sample_locs
+        df = stradi.final_df
+        self.assertEqual(df.index.tolist(),
+                         stradi.px2data_y(locs.index.values).tolist())
+        for i, col in enumerate(locs.columns):
+            ref = reader.get_reader_for_col(col).px2data_x(locs[col].values)
+            self.assertEqual(df.iloc[:, i].tolist(), ref.tolist())
+        self.assertEqual(df.iloc[1, 1], reader.occurences_value)
+        self.assertEqual(df.iloc[-1, 0], 2. * locs.iloc[-1, 0])
+        self.assertEqual(df.iloc[-1, 2], 1 + 2. * locs.iloc[-1, 2])
+
+    def test_log(self):
+        """Test logarithmic axes"""
+        from straditize.binary import DataReader
+        stradi = self.stradi
+        reader = self.reader
+        child = reader.new_child_for_cols([2], DataReader, plot=False)
+        child.xaxis_px = [0, 2]
+        child.xaxis_data = [1, 100]
+        child.xaxis_scale = 'log'
+        stradi.yaxis_data = [1, 1000]
+        stradi.yaxis_scale = 'log'
+        locs = reader.sample_locs
+        df = stradi.final_df
+        self.assertTrue(np.allclose(df.iloc[:, 2], 10. ** locs.iloc[:, 2]))
+        self.assertTrue(np.allclose(df.iloc[:, 0], 2. * locs.iloc[:, 0]))
+        self.assertAlmostEqual(df.index[0], 1.)
+        self.assertAlmostEqual(df.index[-1], 1000.)
+        self.assertTrue(np.allclose(stradi.data2px_y(df.index.values),
+                                    locs.index.values))
+        # the scales are saved
+        ds = stradi.to_dataset()
+        stradi2 = Straditizer.from_dataset(ds, plot=False)
+        self.assertEqual(stradi2.yaxis_scale, 'log')
+        self.assertEqual(
+            [r.xaxis_scale for r in stradi2.data_reader.iter_all_readers],
+            ['linear', 'log'])
+        self.assertTrue(np.allclose(stradi2.final_df.values, df.values))
+        stradi2.close()
+
+    def test_cache(self):
+        """Test the invalidation of the cached final_df"""
+        stradi = self.stradi
+        reader = self.reader
+        df = stradi.final_df
+        cached = stradi._final_df_cache[1]
+        self.assertIsNot(df, cached)
+        df.iloc[0, 0] = -1
+        self.assertIs(stradi._final_df_cache[1], cached)
+        self.assertEqual(stradi.final_df.iloc[0, 0],
+                         2. * reader.sample_locs.iloc[0, 0])
+        # change the samples inplace
+        reader.sample_locs.iloc[0, 0] = 5
+        self.assertEqual(stradi.final_df.iloc[0, 0], 10.)
+        # change the axis translations
+        reader.xaxis_data = [0, 4]
+        self.assertEqual(stradi.final_df.iloc[0, 0], 5.)
+        stradi.yaxis_data = [100, 119]
+        self.assertEqual(stradi.final_df.index[-1], 119.)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+Test module for the :mod:`straditize.testing` module
+"""
+import unittest
+import numpy as np
+import pandas as pd
+from straditize import testing
+
+
+class SyntheticDiagramTest(unittest.TestCase):
+    """Test the :class:`straditize.testing.SyntheticDiagram` class"""
+
+    def test_area(self):
+        """Test whether each row of an area diagram matches the data"""
+        vals = np.array([[3, 0], [5, 2], [1, 4]])
+        df = pd.DataFrame(vals)
+        sample = testing.SyntheticDiagram(df, df, np.array([0, 10]),
+                                          np.array([8, 16]), 20)
+        binary = sample.get_binary(border=1)
+        self.assertEqual(binary.shape, (5, 22))
+        for row, (v0, v1) in enumerate(vals, 1):
+            ref = np.zeros(22, int)
+            ref[1:1 + v0] = 1
+            ref[11:11 + v1] = 1
+            self.assertEqual(binary[row].tolist(), ref.tolist(),
+                             msg='Row %i' % row)
+        self.assertFalse(binary[[0, -1]].any())
+
+    def test_kinds(self):
+        """Test the generation of the different diagram types"""
+        for kind in testing.kinds:
+            sample = testing.SyntheticDiagram.from_random(
+                100, 200, 5, 10, kind=kind, seed=1, axes=True, ticks=10,
+                hatching=5, exag_factor=2)
+            rgba = sample.get_rgba()
+            self.assertEqual(rgba.shape, (sample.height, 200, 4), msg=kind)
+            self.assertTrue(sample.get_binary().any(), msg=kind)
+            # the x-axis
+            self.assertTrue(
+                sample.get_binary()[-1, sample.col_starts[0]:].all(),
+                msg=kind)
+
+    def test_bars(self):
+        """Test whether the bars are separated by empty rows"""
+        sample = testing.SyntheticDiagram.from_random(
+            100, 200, 5, 10, kind='bars', seed=1)
+        locs = sample.df.index.values
+        mids = (locs[1:] + locs[:-1]) // 2
+        binary = sample.get_binary()
+        self.assertFalse(binary[mids].any())
+        self.assertEqual(binary[locs].sum(), sample.df.values.sum())
+
+    def test_tiles(self):
+        """Test whether the tiles match the full image"""
+        sample = testing.SyntheticDiagram.from_random(
+            100, 200, 5, 10, kind='line', seed=1, axes=True, noise=0.01)
+        ref = sample.get_rgba(border=3)
+        self.assertTrue((sample.get_rgba([0, 0, 0], 3) == ref).all())
+        tiles = list(sample.iter_tiles(30, border=3, rgba=True))
+        self.assertEqual([start for start, tile in tiles],
+                         list(range(0, len(ref), 30)))
+        self.assertTrue(
+            (np.concatenate([tile for start, tile in tiles]) == ref).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
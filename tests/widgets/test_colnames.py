@@ -4,9 +4,11 @@ import _base_testing as bt
 import numpy as np
 import unittest
 from psyplot_gui.compat.qtcompat import QTest, Qt
-from straditize.colnames import tesserocr
+from straditize.colnames import _load_tesserocr
 from PIL import Image
 
+tesserocr = _load_tesserocr()
+
 
 class ColNamesTest(bt.StraditizeWidgetsTestCase):
     """Test for managing column names"""
@@ -107,6 +109,26 @@ class ColNamesTest(bt.StraditizeWidgetsTestCase):
             list(self.colnames_reader.column_names),
             ['0', 'Pinus'] + list('23456'))
 
+    @unittest.skipIf(tesserocr is None, "requires tesserocr")
+    def test_recognize_texts(self):
+        from straditize.colnames import OCRPool
+        reader = self.init_colnames_reader()
+        colpic = Image.open(self.get_fig_path('colnames_diagram-Pinus.png'))
+        images = [colpic, colpic.rotate(180), colpic]
+        ref = list(map(reader.recognize_text, images))
+        self.assertEqual(ref[0], 'Pinus')
+        with OCRPool(workers=2) as pool:
+            self.assertEqual(reader.recognize_texts(images, pool), ref)
+            # the APIs are reused for the next batch
+            self.assertEqual(reader.recognize_texts(images[::-1], pool),
+                             ref[::-1])
+            self.assertEqual(len(pool._apis), 2)
+        # concurrent requests must not create more APIs than workers
+        with OCRPool(workers=2) as pool:
+            self.assertEqual(reader.recognize_texts(images * 4, pool),
+                             ref * 4)
+            self.assertLessEqual(len(pool._apis), 2)
+
     def test_flip(self):
         reader = self.init_colnames_reader()
         self.colnames_manager.rotate(0)
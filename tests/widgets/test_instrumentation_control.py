@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""Test module for straditize.widgets.instrumentation"""
+import json
+import unittest
+import _base_testing as bt
+from straditize.instrumentation import recorder
+from straditize.binary import DataReader
+
+
+class InstrumentationControlTest(bt.StraditizeWidgetsTestCase):
+    """Test class for the
+    :class:`straditize.widgets.instrumentation.InstrumentationControl`"""
+
+    @property
+    def control(self):
+        return self.straditizer_widgets.instrumentation
+
+    def tearDown(self):
+        recorder.disable()
+        recorder.clear()
+        super().tearDown()
+
+    def test_record(self):
+        """Test the recording and the export"""
+        self.init_reader()
+        self.control.cb_record.setChecked(True)
+        self.assertTrue(recorder.enabled)
+        self.reader.digitize()
+        self.control.cb_record.setChecked(False)
+        self.assertFalse(recorder.enabled)
+        self.control.fill_table()
+        table = self.control.summary_table
+        self.assertGreaterEqual(table.rowCount(), 1)
+        names = [table.verticalHeaderItem(i).text()
+                 for i in range(table.rowCount())]
+        self.assertIn('DataReader.digitize', names)
+        self.assertTrue(self.control.btn_export.isEnabled())
+
+        fname = self.get_random_filename(suffix='.trace.json')
+        self.control.export(fname)
+        with open(fname) as f:
+            trace = json.load(f)
+        self.assertIn('DataReader.digitize',
+                      [event['name'] for event in trace['traceEvents']])
+
+        self.control.clear()
+        self.assertEqual(table.rowCount(), 0)
+        self.assertFalse(self.control.btn_export.isEnabled())
+
+    def test_max_workers(self):
+        """Test setting the number of parallel workers"""
+        self.control.sp_max_workers.setValue(0)
+        try:
+            self.assertEqual(DataReader.max_workers, 0)
+        finally:
+            self.control.sp_max_workers.setValue(1)
+        self.assertEqual(DataReader.max_workers, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
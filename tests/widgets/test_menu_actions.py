@@ -5,7 +5,9 @@ import os.path as osp
 import _base_testing as bt
 import unittest
 from psyplot_gui.compat.qtcompat import QTest, Qt
-from straditize.colnames import tesserocr
+from straditize.colnames import _load_tesserocr
+
+tesserocr = _load_tesserocr()
 
 
 class MenuActionsTest(bt.StraditizeWidgetsTestCase):